@@ -0,0 +1,126 @@
+"""
+DISHA Beta — Constellation API Routes
+POST /constellation/load, GET /constellation, GET /constellation/{norad_id}/state,
+GET /constellation/{norad_id}/passes, DELETE /constellation/{norad_id},
+WS /ws/constellation/{norad_id}
+"""
+
+import math
+from fastapi import APIRouter, Request, Response, WebSocket, WebSocketDisconnect
+from backend.models.schemas import ConstellationLoadRequest
+from backend.core.compute_pool import get_compute_pool, SatelliteSnapshot, pass_table_job, power_projection_job
+from backend.core.ground_stations import get_station_network, passes_to_dicts
+from backend.api.flight import MAX_PASS_HOURS
+from backend.api.http_cache import cached_json, state_key
+
+router = APIRouter(tags=["Constellation"])
+
+
+def get_deps():
+    from backend.main import constellation, pass_predictor
+    return constellation, pass_predictor
+
+
+def _not_found(norad_id: int) -> dict:
+    return {"status": "ERROR", "message": f"Satellite {norad_id} not in constellation"}
+
+
+@router.post("/constellation/load")
+async def load_constellation(payload: ConstellationLoadRequest):
+    constellation, _ = get_deps()
+    result = {"loaded": [], "failed": []}
+    for entry in payload.tles:
+        try:
+            result["loaded"].append(constellation.add_tle(entry.name, entry.line1, entry.line2))
+        except Exception as e:
+            result["failed"].append({"tle": entry.line1, "error": str(e)})
+    if payload.norad_ids:
+        fetched = await constellation.load(payload.norad_ids)
+        result["loaded"] += fetched["loaded"]
+        result["failed"] += fetched["failed"]
+    result["status"] = "SUCCESS" if result["loaded"] else "ERROR"
+    result["count"] = len(constellation.members)
+    return result
+
+
+@router.get("/constellation")
+def get_constellation():
+    constellation, _ = get_deps()
+    return {
+        "count": len(constellation.members),
+        "timestamp": constellation.current_time.isoformat(),
+        "satellites": constellation.list_members(),
+    }
+
+
+@router.post("/constellation/clear")
+def clear_constellation():
+    constellation, _ = get_deps()
+    constellation.clear()
+    return {"status": "CLEARED"}
+
+
+@router.get("/constellation/{norad_id}/state")
+def get_member_state(norad_id: int):
+    constellation, _ = get_deps()
+    sat = constellation.get(norad_id)
+    if sat is None:
+        return _not_found(norad_id)
+    return sat.get_state()
+
+
+@router.get("/constellation/{norad_id}/passes")
+async def get_member_passes(request: Request, response: Response, norad_id: int,
+                            duration_hours: float = 24.0):
+    constellation, pass_predictor = get_deps()
+    sat = constellation.get(norad_id)
+    if sat is None:
+        return _not_found(norad_id)
+    if not (math.isfinite(duration_hours) and duration_hours > 0):
+        return {"passes": [], "error": "duration_hours must be finite and positive"}
+    duration_hours = min(duration_hours, MAX_PASS_HOURS)
+
+    async def compute():
+        table = await get_compute_pool().run(
+            pass_table_job, pass_predictor, SatelliteSnapshot(sat), get_station_network(), duration_hours
+        )
+        return {"passes": passes_to_dicts(table)}
+
+    try:
+        key = state_key("member_passes", sat, norad_id, duration_hours)
+        return await cached_json(request, response, key, compute)
+    except Exception as e:
+        return {"passes": [], "error": str(e)}
+
+
+@router.get("/constellation/{norad_id}/power-projection")
+async def get_member_power_projection(request: Request, response: Response, norad_id: int):
+    constellation, _ = get_deps()
+    sat = constellation.get(norad_id)
+    if sat is None:
+        return _not_found(norad_id)
+
+    async def compute():
+        return await get_compute_pool().run(power_projection_job, SatelliteSnapshot(sat))
+
+    return await cached_json(request, response, state_key("member_power_projection", sat, norad_id), compute)
+
+
+@router.delete("/constellation/{norad_id}")
+def remove_member(norad_id: int):
+    constellation, _ = get_deps()
+    if not constellation.remove(norad_id):
+        return _not_found(norad_id)
+    return {"status": "REMOVED", "norad_id": norad_id}
+
+
+@router.websocket("/ws/constellation/{norad_id}")
+async def websocket_member_telemetry(ws: WebSocket, norad_id: int):
+    constellation, _ = get_deps()
+    manager = constellation.stream(norad_id)
+    await manager.connect(ws)
+    try:
+        while True:
+            await ws.receive_text()
+    except WebSocketDisconnect:
+        manager.disconnect(ws)
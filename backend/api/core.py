@@ -1,6 +1,6 @@
 """
 DISHA Beta — Core API Routes
-GET /, GET /satellite-status, POST /reset
+GET /, GET /satellite-status, POST /reset, GET /loop-stats, POST /time-warp
 """
 
 from datetime import datetime, timezone
@@ -26,6 +26,7 @@ def read_root():
         "uptime_seconds": round(uptime, 1),
         "ws_clients": ws_manager.client_count,
         "tle_loaded": tle_manager.satrec is not None,
+        "noise_seed": satellite.noise.seed,
     }
 
 
@@ -36,8 +37,44 @@ def get_satellite_status():
 
 
 @router.post("/reset")
-def reset_satellite():
-    satellite, tle_manager, _, fdir_engine, command_engine, autonomy_manager = get_deps()
+def reset_satellite(payload: dict = None):
+    """Reset the twin. {"seed": n} replays the noise of a run started with that seed."""
     from backend.main import reset_state
-    reset_state()
-    return {"status": "RESET", "satellite_health": satellite.get_state()}
+    seed = (payload or {}).get("seed")
+    try:
+        reset_state(int(seed) if seed is not None else None)
+    except (TypeError, ValueError) as e:
+        return {"status": "ERROR", "message": str(e)}
+    satellite, _, _, _, _, _ = get_deps()
+    return {"status": "RESET", "noise_seed": satellite.noise.seed, "satellite_health": satellite.get_state()}
+
+
+@router.get("/loop-stats")
+def get_loop_stats():
+    """Simulation loop pacing (overruns, skipped ticks) and per-stage latency histograms."""
+    from backend.main import loop_scheduler
+    return loop_scheduler.stats()
+
+
+@router.post("/time-warp")
+def set_time_warp(payload: dict):
+    """
+    Simulation rate: {"time_warp": simulated seconds per wall second} and/or
+    {"headless": true} to run unpaced, as fast as the host allows.
+    """
+    from backend.main import loop_scheduler
+    time_warp = payload.get("time_warp")
+    headless = payload.get("headless")
+    try:
+        loop_scheduler.set_mode(
+            time_warp=float(time_warp) if time_warp is not None else None,
+            headless=bool(headless) if headless is not None else None,
+        )
+    except (TypeError, ValueError) as e:
+        return {"status": "ERROR", "message": str(e)}
+    return {
+        "status": "OK",
+        "time_warp": loop_scheduler.time_warp,
+        "headless": loop_scheduler.headless,
+        "sim_step_sec": loop_scheduler.sim_step_sec,
+    }
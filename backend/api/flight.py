@@ -1,78 +1,187 @@
 """
 DISHA Beta — Flight Dynamics API Routes
-GET /orbit/prediction, GET /flight/orbital-elements, GET /flight/passes, GET /flight/ground-stations
+GET /orbit/prediction, GET /flight/orbital-elements, GET /flight/passes, GET /flight/passes/track,
+GET /flight/next-contact, GET /flight/eclipses, GET /flight/ground-stations
 """
 
-from datetime import timedelta
-from fastapi import APIRouter
-from backend.core.flight_dynamics import propagate_orbit, eci_to_ecef, ecef_to_lla, state_to_keplerian
-from backend.core.ground_stations import get_ground_stations, set_ground_stations, get_available_networks, get_active_network, add_custom_station, remove_station
+import asyncio
+import math
+import numpy as np
+from fastapi import APIRouter, Request, Response
+from datetime import datetime, timedelta
+from backend.core.ephemeris import get_ephemeris
+from backend.core.eclipse import get_eclipse_timeline
+from backend.core.flight_dynamics import eci_to_ecef_batch, ecef_to_lla_batch, get_julian_dates, state_to_keplerian
+from backend.core.ground_stations import get_ground_stations, get_station_network, set_ground_stations, get_available_networks, get_active_network, add_custom_station, remove_station, passes_to_dicts, track_to_columns
+from backend.core.compute_pool import get_compute_pool, SatelliteSnapshot, pass_table_job, pass_track_job
+from backend.core.time_services import epoch_seconds
+from backend.api.http_cache import cached_json, state_key
 
 router = APIRouter(tags=["Flight"])
 
 
 def get_deps():
-    from backend.main import satellite, tle_manager, pass_predictor
-    return satellite, tle_manager, pass_predictor
+    from backend.main import satellite, tle_manager, pass_predictor, pass_scheduler
+    return satellite, tle_manager, pass_predictor, pass_scheduler
+
+
+def _mask_is_path(station) -> bool:
+    # Mask files are for server-side config only; API clients send mask points
+    return isinstance(station, dict) and isinstance(station.get("horizon_mask"), str)
+
+
+_MASK_PATH_ERROR = {"status": "ERROR", "message": "horizon_mask must be given as [azimuth_deg, elevation_deg] points"}
+
+# Bounds on a single /orbit/prediction request (one day, at most this many points)
+MAX_PREDICTION_SEC = 86400.0
+MAX_PREDICTION_POINTS = 10000
+
+# Pass window of /flight/passes, and the cap on per-member pass requests
+MAX_PASS_HOURS = 24.0
+
+# Longest eclipse listing per /flight/eclipses request
+MAX_ECLIPSE_HOURS = 72.0
 
 
 @router.get("/orbit/prediction")
-def get_orbit_prediction():
-    satellite, tle_manager, _ = get_deps()
-    points = []
+def get_orbit_prediction(step_sec: float = 60.0, duration_sec: float = 5400.0):
+    satellite, tle_manager, _, _ = get_deps()
+    # max()/min() pass NaN through, so reject non-finite values before clamping
+    if not (math.isfinite(step_sec) and math.isfinite(duration_sec)):
+        return {"points": [], "error": "step_sec and duration_sec must be finite"}
+    step_sec = max(step_sec, 1.0)
+    duration_sec = min(max(duration_sec, 0.0), MAX_PREDICTION_SEC)
+    if duration_sec / step_sec > MAX_PREDICTION_POINTS:
+        return {"points": [], "error": f"At most {MAX_PREDICTION_POINTS} points per request; increase step_sec"}
+    now = satellite.current_time
 
     if tle_manager.satrec:
-        now = satellite.current_time
-        for i in range(0, 5400, 60):
-            dt = now + timedelta(seconds=i)
-            try:
-                pos, vel = tle_manager.propagate_at(dt)
-                r_ecef = eci_to_ecef(pos, dt)
-                lla = ecef_to_lla(r_ecef)
-                points.append({
-                    "lat": round(lla["lat"], 4),
-                    "lon": round(lla["lon"], 4),
-                    "alt_km": round(lla["alt_km"], 1),
-                })
-            except Exception:
-                break
+        time_offsets = np.arange(0, duration_sec, step_sec, dtype=float)
+        positions, _, errors = tle_manager.propagate_many(get_julian_dates(now, time_offsets))
+        # Stop at the first SGP4 failure (e.g. decay), as the per-point loop did
+        bad = np.flatnonzero(errors)
+        if len(bad):
+            time_offsets, positions = time_offsets[:bad[0]], positions[:bad[0]]
     else:
-        initial_state = {
-            "position": satellite.position.tolist() if hasattr(satellite.position, 'tolist') else list(satellite.position),
-            "velocity": satellite.velocity.tolist() if hasattr(satellite.velocity, 'tolist') else list(satellite.velocity),
-            "epoch": satellite.current_time,
-        }
-        trajectory = propagate_orbit(initial_state, 5400, step_size=60)
-        for step in trajectory:
-            r_eci = step["eci_state"][:3]
-            dt = satellite.current_time + timedelta(seconds=int(step["time_offset"]))
-            r_ecef = eci_to_ecef(r_eci, dt)
-            lla = ecef_to_lla(r_ecef)
-            points.append({
-                "lat": round(lla["lat"], 4),
-                "lon": round(lla["lon"], 4),
-                "alt_km": round(lla["alt_km"], 1),
-            })
+        offsets, states = get_ephemeris(satellite, duration_sec).sample(step_sec, duration_sec)
+        time_offsets = offsets.tolist()
+        positions = states[:, :3]
+
+    r_ecef = eci_to_ecef_batch(np.array(positions, dtype=float), get_julian_dates(now, time_offsets))
+    lla = ecef_to_lla_batch(r_ecef)
+    points = [
+        {"lat": round(float(lat), 4), "lon": round(float(lon), 4), "alt_km": round(float(alt), 1)}
+        for lat, lon, alt in lla
+    ]
 
     return {"points": points}
 
 
 @router.get("/flight/orbital-elements")
 def get_orbital_elements():
-    satellite, _, _ = get_deps()
+    satellite, _, _, _ = get_deps()
     return state_to_keplerian(satellite.position.tolist(), satellite.velocity.tolist())
 
 
 @router.get("/flight/passes")
-def get_passes():
-    satellite, _, pass_predictor = get_deps()
+async def get_passes(request: Request, response: Response):
+    satellite, _, pass_predictor, pass_scheduler = get_deps()
+
+    # Served from the rolling schedule when it is current for this orbit and station set
+    scheduled = pass_scheduler.lookup(satellite, MAX_PASS_HOURS)
+    if scheduled is not None:
+        table, key = scheduled
+
+        async def from_schedule():
+            return {"passes": passes_to_dicts(table)}
+
+        return await cached_json(request, response, key, from_schedule)
+
+    async def compute():
+        table = await get_compute_pool().run(
+            pass_table_job, pass_predictor, SatelliteSnapshot(satellite), get_station_network(), MAX_PASS_HOURS
+        )
+        return {"passes": passes_to_dicts(table)}
+
     try:
-        passes = pass_predictor.compute_passes(satellite, duration_hours=24.0)
-        return {"passes": passes}
+        return await cached_json(request, response, state_key("passes", satellite), compute)
     except Exception as e:
         return {"passes": [], "error": str(e)}
 
 
+@router.get("/flight/passes/track")
+async def get_pass_track(request: Request, response: Response, station: str, aos_time: str,
+                         step_sec: float = 1.0):
+    """Az/el/range/range-rate columns for the pass with this station and aos_time (from /flight/passes)."""
+    satellite, _, pass_predictor, pass_scheduler = get_deps()
+    try:
+        # An unescaped "+00:00" offset arrives as " 00:00"
+        aos_sec = epoch_seconds(datetime.fromisoformat(aos_time.replace(" ", "+")))
+    except ValueError:
+        return {"status": "ERROR", "message": f"Invalid aos_time: {aos_time}"}
+    step_sec = min(max(step_sec, 0.1), 60.0)
+    not_found = {"status": "ERROR", "message": f"No pass over {station} at {aos_time}"}
+
+    try:
+        scheduled = pass_scheduler.pass_track(satellite, station, aos_sec, step_sec)
+        if scheduled is not None:
+            compute_track, key = scheduled
+            if compute_track is None:
+                return not_found
+
+            # Sampled off the event loop, and only after the ETag check
+            async def from_schedule():
+                columns = await asyncio.to_thread(lambda: track_to_columns(compute_track()))
+                return {"status": "SUCCESS", **columns}
+
+            return await cached_json(request, response, key, from_schedule)
+
+        async def compute():
+            track = await get_compute_pool().run(
+                pass_track_job, pass_predictor, SatelliteSnapshot(satellite), get_station_network(),
+                station, aos_sec, step_sec,
+            )
+            return not_found if track is None else {"status": "SUCCESS", **track_to_columns(track)}
+
+        key = state_key("pass_track", satellite, station, aos_sec, step_sec)
+        return await cached_json(request, response, key, compute)
+    except Exception as e:
+        return {"status": "ERROR", "message": str(e)}
+
+
+@router.get("/flight/next-contact")
+def get_next_contact():
+    satellite, _, _, pass_scheduler = get_deps()
+    return pass_scheduler.next_contact(satellite)
+
+
+@router.get("/flight/eclipses")
+def get_eclipses(duration_hours: float = 24.0):
+    satellite, _, _, _ = get_deps()
+    if not (math.isfinite(duration_hours) and duration_hours > 0):
+        return {"eclipses": [], "error": "duration_hours must be finite and positive"}
+    duration_hours = min(duration_hours, MAX_ECLIPSE_HOURS)
+    timeline = get_eclipse_timeline(satellite, duration_hours * 3600.0)
+    t_now = timeline.offset(satellite.current_time)
+    t_end = t_now + duration_hours * 3600.0
+
+    def iso(offset):
+        return None if offset is None else (timeline.epoch + timedelta(seconds=offset)).isoformat()
+
+    eclipses = [
+        {
+            "entry_time": iso(iv["start_sec"]),
+            "exit_time": iso(iv["end_sec"]),
+            "umbra_entry_time": iso(iv["umbra_start_sec"]),
+            "umbra_exit_time": iso(iv["umbra_end_sec"]),
+            "duration_sec": iv["duration_sec"],
+        }
+        for iv in timeline.intervals()
+        if iv["end_sec"] > t_now and iv["start_sec"] < t_end
+    ]
+    return {"eclipses": eclipses, "shadow_state": timeline.shadow_state(t_now)}
+
+
 @router.get("/flight/ground-stations")
 def get_ground_stations_endpoint():
     stations = get_ground_stations()
@@ -88,6 +197,8 @@ def get_ground_networks():
 def set_ground_stations_endpoint(payload: dict):
     network = payload.get("network")
     stations = payload.get("stations")
+    if stations and any(_mask_is_path(s) for s in stations):
+        return _MASK_PATH_ERROR
     result = set_ground_stations(network=network, stations=stations)
     if result["status"] == "SUCCESS":
         result["stations"] = get_ground_stations()
@@ -103,7 +214,10 @@ def add_ground_station_endpoint(payload: dict):
         return {"status": "ERROR", "message": "lat and lon are required"}
     alt_m = payload.get("alt_m", 0)
     min_elev = payload.get("min_elevation_deg", 5)
-    result = add_custom_station(name, float(lat), float(lon), float(alt_m), float(min_elev))
+    if _mask_is_path(payload):
+        return _MASK_PATH_ERROR
+    result = add_custom_station(name, float(lat), float(lon), float(alt_m), float(min_elev),
+                                horizon_mask=payload.get("horizon_mask"))
     result["stations"] = get_ground_stations()
     return result
 
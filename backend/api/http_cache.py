@@ -0,0 +1,38 @@
+"""
+DISHA Beta — HTTP Result Caching
+ETag / If-None-Match handling on top of the shared single-flight ResultCache.
+"""
+
+from fastapi import Request, Response
+from backend.core.ephemeris import get_ephemeris_cache
+from backend.core.ground_stations import get_stations_version
+from backend.core.result_cache import get_result_cache
+
+
+def state_key(endpoint: str, mission_state, *extra) -> tuple:
+    """Cache key: endpoint, satellite state version, ephemeris generation, station-set version."""
+    return (endpoint, mission_state.state_version, get_ephemeris_cache().generation,
+            get_stations_version()) + extra
+
+
+async def cached_json(request: Request, response: Response, key: tuple, compute):
+    """
+    Serve await compute() through the result cache with an ETag derived from
+    key. A client already holding that ETag gets 304 without any work.
+    """
+    cache = get_result_cache()
+    etag = cache.etag(key)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        cache.not_modified += 1
+        return Response(status_code=304, headers={"ETag": etag})
+
+    result = await cache.get_or_compute(key, compute)
+    response.headers["ETag"] = etag
+    return result
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if not header:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return "*" in tags or etag in tags
@@ -1,10 +1,15 @@
 """
 DISHA Beta — Intelligence Layer API Routes
 GET /intelligence/autonomy, /constraints, /power-projection, /decisions
+POST /intelligence/monte-carlo, GET /intelligence/monte-carlo
 """
 
-from fastapi import APIRouter
-from backend.core.power_module import project_power
+from fastapi import APIRouter, Request, Response
+from backend.core.compute_pool import (
+    get_compute_pool, SatelliteSnapshot, power_projection_job, monte_carlo_job,
+)
+from backend.core.ground_stations import get_station_network
+from backend.api.http_cache import cached_json, state_key
 
 router = APIRouter(prefix="/intelligence", tags=["Intelligence"])
 
@@ -27,10 +32,14 @@ def get_constraints():
 
 
 @router.get("/power-projection")
-def get_power_projection():
+async def get_power_projection(request: Request, response: Response):
     satellite, _, _ = get_deps()
+
+    async def compute():
+        return await get_compute_pool().run(power_projection_job, SatelliteSnapshot(satellite))
+
     try:
-        return project_power(satellite)
+        return await cached_json(request, response, state_key("power_projection", satellite), compute)
     except Exception as e:
         return {
             "current_battery": 0,
@@ -47,3 +56,36 @@ def get_power_projection():
 def get_autonomy_decisions():
     _, autonomy_manager, _ = get_deps()
     return {"decisions": autonomy_manager.get_decisions_log()}
+
+
+@router.post("/monte-carlo")
+async def run_monte_carlo_ensemble(payload: dict = None):
+    """
+    Monte Carlo ensemble from the current state. Optional fields:
+    realizations, horizon_sec, step_sec, sample_sec, percentiles, seed,
+    dispersions (defaults: "monte_carlo" config section). Returns percentile
+    envelopes of battery SOC, temperatures and storage, and the probability
+    of each FDIR rule firing within the horizon.
+    """
+    satellite, _, cache = get_deps()
+    params = {k: v for k, v in (payload or {}).items()
+              if k in ("realizations", "horizon_sec", "step_sec", "sample_sec",
+                       "percentiles", "seed", "dispersions")}
+    try:
+        result = await get_compute_pool().run(
+            monte_carlo_job, SatelliteSnapshot(satellite), get_station_network(), params
+        )
+    except (TypeError, ValueError) as e:
+        return {"status": "ERROR", "message": str(e)}
+    cache["monte_carlo"] = result
+    return {"status": "SUCCESS", **result}
+
+
+@router.get("/monte-carlo")
+def get_monte_carlo_ensemble():
+    """Latest ensemble result (POST /intelligence/monte-carlo to run one)."""
+    _, _, cache = get_deps()
+    result = cache.get("monte_carlo")
+    if result is None:
+        return {"status": "EMPTY", "message": "No Monte Carlo run yet"}
+    return {"status": "SUCCESS", **result}
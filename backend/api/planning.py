@@ -4,23 +4,24 @@ POST /generate-plan, GET /power/prediction, GET /commands, POST /commands/{id}/a
 """
 
 from datetime import datetime, timedelta, timezone
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from backend.models.schemas import ScheduleRequest, UserRequest
-from backend.core.flight_dynamics import check_feasibility
-from backend.core.mission_planner import generate_mission_plan, compute_feasibility, detect_conflicts
-from backend.core.power_module import predict_power
+from backend.core.compute_pool import get_compute_pool, SatelliteSnapshot, plan_job, power_prediction_job
+from backend.core.ground_stations import get_station_network
+from backend.core.time_services import isoformat
+from backend.api.http_cache import cached_json, state_key
 
 router = APIRouter(tags=["Planning"])
 
 
 def get_deps():
-    from backend.main import satellite, command_engine, pass_predictor
-    return satellite, command_engine, pass_predictor
+    from backend.main import satellite, command_engine, pass_predictor, pass_scheduler
+    return satellite, command_engine, pass_predictor, pass_scheduler
 
 
 @router.post("/generate-plan")
-def api_generate_plan(payload: ScheduleRequest):
-    satellite, command_engine, pass_predictor = get_deps()
+async def api_generate_plan(payload: ScheduleRequest):
+    satellite, command_engine, pass_predictor, pass_scheduler = get_deps()
 
     mission_requests = []
     base_time = datetime.now(timezone.utc)
@@ -37,71 +38,46 @@ def api_generate_plan(payload: ScheduleRequest):
         )
         mission_requests.append(req)
 
-    valid_requests = []
-    for req in mission_requests:
-        fd_result = check_feasibility(req, satellite)
-        if fd_result["is_feasible"]:
-            req.feasible_windows = fd_result["windows"]
-            valid_requests.append(req)
-
-    mission_plan = generate_mission_plan(valid_requests, satellite)
+    # Screening, scheduling and scoring run in the compute pool on a snapshot;
+    # contact scoring reuses the rolling pass schedule when it is current
+    scheduled = pass_scheduler.lookup(satellite, 24.0)
+    result = await get_compute_pool().run(
+        plan_job, pass_predictor, SatelliteSnapshot(satellite), mission_requests, get_station_network(),
+        scheduled[0] if scheduled is not None else None,
+    )
+    mission_plan = result["mission_plan"]
 
     for task in mission_plan.schedule:
         satellite.update_state(task.power_cost_wh, task.data_cost_gb)
 
-    # Generate telecommand sequence
-    command_sequence_id = None
-    if mission_plan.schedule:
-        seq = command_engine.generate_sequence(
-            [{"task_id": t.task_id, "action": t.action,
-              "start_time": t.start_time.isoformat(),
-              "end_time": t.end_time.isoformat(),
-              "power_cost_wh": round(t.power_cost_wh, 2),
-              "data_cost_gb": round(t.data_cost_gb, 2)}
-             for t in mission_plan.schedule]
-        )
-        command_sequence_id = seq["sequence_id"]
-
+    # ISO strings are only produced for the response and the command sequence
     plan_details = [
-        {
-            "task_id": t.task_id,
-            "action": t.action,
-            "start_time": t.start_time.isoformat(),
-            "end_time": t.end_time.isoformat(),
-            "power_cost_wh": round(t.power_cost_wh, 2),
-            "data_cost_gb": round(t.data_cost_gb, 2),
-        }
-        for t in mission_plan.schedule
+        {**rec, "start_time": isoformat(rec["start_time"]), "end_time": isoformat(rec["end_time"])}
+        for rec in result["task_records"]
     ]
 
-    try:
-        passes = pass_predictor.compute_passes(satellite, duration_hours=24.0)
-    except Exception:
-        passes = []
-
-    feasibility_scores = []
-    for task_detail in plan_details:
-        score = compute_feasibility(task_detail, satellite, passes)
-        feasibility_scores.append(score)
-
-    conflicts = detect_conflicts(plan_details, satellite)
+    # Generate telecommand sequence
+    command_sequence_id = None
+    if plan_details:
+        seq = command_engine.generate_sequence(plan_details)
+        command_sequence_id = seq["sequence_id"]
 
     return {
         "status": "SUCCESS",
         "scheduled_tasks": len(mission_plan.schedule),
         "total_requests": len(payload.requests),
-        "feasible_requests": len(valid_requests),
+        "feasible_requests": result["feasible_requests"],
         "satellite_health": satellite.get_state(),
         "command_sequence_id": command_sequence_id,
         "plan_details": plan_details,
-        "feasibility_scores": feasibility_scores,
-        "conflicts": conflicts,
+        "feasibility_scores": result["feasibility_scores"],
+        "conflicts": result["conflicts"],
     }
 
 
 @router.get("/power/prediction")
-def get_power_prediction():
-    satellite, command_engine, _ = get_deps()
+async def get_power_prediction(request: Request, response: Response):
+    satellite, command_engine, _, _ = get_deps()
     try:
         scheduled_tasks = []
         sequences = command_engine.get_all_sequences()
@@ -124,28 +100,33 @@ def get_power_prediction():
                         "duration_min": 5 if action == "IMAGING" else 8,
                     })
 
-        prediction = predict_power(satellite, duration_minutes=90, step_minutes=1,
-                                   scheduled_tasks=scheduled_tasks if scheduled_tasks else None)
-        return prediction
+        async def compute():
+            return await get_compute_pool().run(
+                power_prediction_job, SatelliteSnapshot(satellite), 90, 1,
+                scheduled_tasks if scheduled_tasks else None,
+            )
+
+        task_key = tuple((t["action"], t["start_min"], t["duration_min"]) for t in scheduled_tasks)
+        return await cached_json(request, response, state_key("power_prediction", satellite, task_key), compute)
     except Exception as e:
         return {"error": str(e), "prediction_points": [], "min_soc_pct": 0, "power_margin_wh": 0}
 
 
 @router.get("/commands")
 def get_commands():
-    _, command_engine, _ = get_deps()
+    _, command_engine, _, _ = get_deps()
     return {"sequences": command_engine.get_all_sequences()}
 
 
 @router.get("/commands/log")
 def get_command_log():
-    _, command_engine, _ = get_deps()
+    _, command_engine, _, _ = get_deps()
     return {"log": command_engine.get_log()}
 
 
 @router.get("/commands/{sequence_id}")
 def get_command_sequence(sequence_id: str):
-    _, command_engine, _ = get_deps()
+    _, command_engine, _, _ = get_deps()
     seq = command_engine.get_sequence(sequence_id)
     if seq is None:
         return {"status": "ERROR", "message": "Sequence not found"}
@@ -154,14 +135,14 @@ def get_command_sequence(sequence_id: str):
 
 @router.post("/commands/{sequence_id}/approve")
 def approve_commands(sequence_id: str):
-    _, command_engine, _ = get_deps()
+    _, command_engine, _, _ = get_deps()
     return command_engine.approve_sequence(sequence_id)
 
 
 @router.post("/commands/send")
 def send_adhoc_command(payload: dict):
     """Execute an ad-hoc operator command against the satellite state."""
-    satellite, command_engine, _ = get_deps()
+    satellite, command_engine, _, _ = get_deps()
     cmd = payload.get("command", "").strip().upper()
     if not cmd:
         return {"status": "ERROR", "message": "Empty command"}
@@ -7,6 +7,7 @@ import numpy as np
 from datetime import datetime, timezone
 from fastapi import APIRouter
 from backend.models.schemas import TLELoadRequest
+from backend.core.ephemeris import invalidate_ephemeris
 
 router = APIRouter(prefix="/tle", tags=["TLE"])
 
@@ -27,6 +28,7 @@ async def load_tle(payload: TLELoadRequest):
         pos, vel = tle_manager.propagate_at(satellite.current_time)
         satellite.position = np.array(pos)
         satellite.velocity = np.array(vel)
+        invalidate_ephemeris()
         fdir_engine.reset()
         # Notify frontend to clear old satellite state
         await ws_manager.broadcast({
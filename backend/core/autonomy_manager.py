@@ -5,6 +5,8 @@ Deterministic, rule-based only. No ML.
 """
 
 from datetime import datetime, timezone
+import numpy as np
+from backend.core.time_services import isoformat
 
 
 class AutonomyManager:
@@ -16,6 +18,7 @@ class AutonomyManager:
         self.risk_score = 0.0
         self.confidence = 1.0
         self.decisions_log = []
+        self.last_decisions = []   # decisions made by the latest evaluate_batch()
         self.override_active = False
         self._override_mode = None
 
@@ -75,6 +78,61 @@ class AutonomyManager:
 
         return self.get_status()
 
+    def evaluate_batch(self, columns: dict, risk_scores, times) -> dict:
+        """
+        evaluate() over n consecutive steps at once (no upcoming tasks).
+        columns maps telemetry field names to (n,) arrays, risk_scores are
+        the per-step constraint risks, times the steps' epoch seconds.
+        Objective and mode are pure functions of each step, so they are
+        selected as arrays; every objective change in the window is logged
+        at its simulated time. last_decisions holds this window's decisions.
+        """
+        risk = np.asarray(risk_scores, dtype=float)
+        n = len(risk)
+        battery_soc = np.asarray(columns["battery_pct"], dtype=float)
+        solar_current = np.asarray(columns["solar_panel_current_a"], dtype=float)
+        link_status = np.asarray(columns["link_status"])
+        storage_pct = np.asarray(columns["storage_pct"], dtype=float)
+
+        # Same priority cascade as _determine_objective
+        objective = np.select(
+            [battery_soc < 30, link_status != "NOMINAL", storage_pct > 90, solar_current < 0.2],
+            ["Power Recovery Mode", "Communication Recovery", "Data Offload Priority",
+             "Eclipse Power Conservation"],
+            "Nominal Orbit Maintenance",
+        ).astype(object)
+        if self.override_active:
+            mode = np.full(n, self.mode, dtype=object)
+        else:
+            mode = np.select([risk > 0.6, risk > 0.3], ["SAFE", "GUARDED"], "AUTONOMOUS").astype(object)
+
+        previous = np.concatenate(([self.current_objective], objective[:-1]))
+        decisions = []
+        for k in np.flatnonzero(objective != previous):
+            prev_objective = previous[k]
+            self.current_objective = objective[k]
+            decision = self._generate_decision(prev_objective, battery_soc[k], solar_current[k],
+                                               link_status[k], storage_pct[k])
+            decisions.append({
+                "time": isoformat(times[k]),
+                "decision": decision,
+                "from": prev_objective,
+                "to": objective[k],
+                "risk": float(risk[k]),
+                "mode": mode[k],
+            })
+
+        self.current_objective = objective[-1]
+        self.mode = mode[-1]
+        self.risk_score = float(risk[-1])
+        self.confidence = round(1.0 - self.risk_score, 3)
+        if decisions:
+            self.last_decision = decisions[-1]["decision"]
+            self.last_decision_time = decisions[-1]["time"]
+            self.decisions_log = (self.decisions_log + decisions)[-50:]
+        self.last_decisions = decisions
+        return self.get_status()
+
     def set_mode(self, mode: str, operator: str = "OPERATOR") -> dict:
         """Operator override: force specific mode, bypass risk-based logic."""
         if mode not in ("AUTONOMOUS", "GUARDED", "SAFE"):
@@ -0,0 +1,258 @@
+"""
+DISHA Beta — Compute Pool
+Process-pool backend for CPU-heavy flight-dynamics work: pass prediction,
+plan feasibility, power prediction and projection, Monte Carlo ensembles. Jobs run in worker
+processes on picklable snapshots of the satellite, so API handlers await
+them without holding the GIL and the 1 Hz telemetry loop keeps its cadence.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+import numpy as np
+
+from backend.core.ephemeris import get_ephemeris_cache
+from backend.core.flight_dynamics import check_feasibility
+from backend.core.mission_planner import generate_mission_plan, compute_feasibility, detect_conflicts
+from backend.core.mission_state import MissionState
+from backend.core.monte_carlo import run_monte_carlo
+from backend.core.power_module import predict_power, project_power
+from backend.core.time_services import epoch_seconds
+from backend.core.tle_manager import TLEManager
+from backend.models.config import get_config, set_config
+
+
+# Analytic J2 secular positions are within ~25 km of HPOP (README), i.e. well
+# under 2° of elevation at LEO ranges, so screen 2° below the 5° mask.
+PRESCREEN_MIN_ELEVATION_DEG = 3.0
+
+
+# ====================================================
+# SATELLITE SNAPSHOT
+# ====================================================
+
+class SatelliteSnapshot:
+    """
+    Picklable copy of the MissionState fields prediction code reads: clock,
+    orbit state, power/thermal/storage levels and the TLE (as lines — Satrec does
+    not pickle, so it is rebuilt on first use in the worker).
+
+    cache_key identifies the source satellite and ephemeris generation, so
+    worker-side eclipse timelines are shared between snapshots of the same
+    orbit and dropped after a reset or TLE load in the parent.
+    """
+
+    FIELDS = ("current_time", "position", "velocity", "current_battery_wh", "battery_capacity_wh",
+              "storage_used_mb", "storage_capacity_mb", "current_storage_used_gb", "in_eclipse",
+              "base_load_w", "solar_array_output_w", "component_temp", "battery_temp", "heater_active")
+
+    def __init__(self, mission_state):
+        for name in self.FIELDS:
+            value = getattr(mission_state, name)
+            setattr(self, name, np.array(value, dtype=float) if name in ("position", "velocity") else value)
+
+        tle = getattr(mission_state, "tle_manager", None)
+        self.tle = None
+        if tle is not None and tle.satrec is not None:
+            self.tle = (tle.satellite_name, tle.tle_line1, tle.tle_line2, tle.norad_id)
+        self.cache_key = ("snapshot", mission_state.cache_key, get_ephemeris_cache().generation)
+        self._tle_manager = None
+
+    @property
+    def tle_manager(self):
+        if self._tle_manager is None and self.tle is not None:
+            self._tle_manager = TLEManager()
+            self._tle_manager.load_lines(*self.tle)
+        return self._tle_manager
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_tle_manager"] = None
+        return state
+
+    # Planning debits resources on the copy exactly as on the live state
+    update_state = MissionState.update_state
+
+
+# ====================================================
+# JOBS (module-level so they pickle by reference)
+# ====================================================
+
+def pass_table_job(pass_predictor, snapshot, stations, duration_hours: float = 24.0,
+                   refine: bool = None) -> dict:
+    return pass_predictor.compute_pass_table(snapshot, duration_hours, refine, stations=stations)
+
+
+def pass_track_job(pass_predictor, snapshot, stations, station_name: str, aos_sec: float,
+                   step_sec: float = 1.0) -> dict:
+    return pass_predictor.pass_track(snapshot, station_name, aos_sec, step_sec, stations=stations)
+
+
+def power_prediction_job(snapshot, duration_minutes: int = 90, step_minutes: int = 1,
+                         scheduled_tasks: list = None) -> dict:
+    return predict_power(snapshot, duration_minutes, step_minutes, scheduled_tasks)
+
+
+def power_projection_job(snapshot) -> dict:
+    return project_power(snapshot)
+
+
+def monte_carlo_job(snapshot, stations, params: dict = None) -> dict:
+    return run_monte_carlo(snapshot, stations, params)
+
+
+def plan_job(pass_predictor, snapshot, mission_requests: list, stations,
+             pass_table: dict = None) -> dict:
+    """
+    Feasibility screening, greedy scheduling and plan scoring on a snapshot.
+    pass_table (e.g. from the PassScheduler) is computed here when not given.
+    Task times in the returned records are epoch seconds; the caller applies
+    the schedule to the live state and serializes.
+    """
+    # Cheap analytic pre-screen with a relaxed mask; only targets that could
+    # plausibly be seen go through the refined high-fidelity check.
+    screened = [
+        req for req in mission_requests
+        if check_feasibility(req, snapshot, method="j2_secular",
+                             min_elevation_deg=PRESCREEN_MIN_ELEVATION_DEG)["is_feasible"]
+    ]
+
+    valid_requests = []
+    for req in screened:
+        fd_result = check_feasibility(req, snapshot, refine=True)
+        if fd_result["is_feasible"]:
+            req.feasible_windows = fd_result["windows"]
+            valid_requests.append(req)
+
+    mission_plan = generate_mission_plan(valid_requests, snapshot)
+
+    for task in mission_plan.schedule:
+        snapshot.update_state(task.power_cost_wh, task.data_cost_gb)
+
+    task_records = [
+        {
+            "task_id": t.task_id,
+            "action": t.action,
+            "start_time": epoch_seconds(t.start_time),
+            "end_time": epoch_seconds(t.end_time),
+            "power_cost_wh": round(t.power_cost_wh, 2),
+            "data_cost_gb": round(t.data_cost_gb, 2),
+        }
+        for t in mission_plan.schedule
+    ]
+
+    if pass_table is None:
+        try:
+            pass_table = pass_predictor.compute_pass_table(snapshot, duration_hours=24.0, stations=stations)
+        except Exception:
+            pass_table = None
+
+    return {
+        "mission_plan": mission_plan,
+        "feasible_requests": len(valid_requests),
+        "task_records": task_records,
+        "feasibility_scores": [compute_feasibility(rec, snapshot, pass_table) for rec in task_records],
+        "conflicts": detect_conflicts(task_records, snapshot),
+    }
+
+
+def _init_worker(config: dict):
+    set_config(config)
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+# ====================================================
+# POOL
+# ====================================================
+
+class ComputePool:
+    """
+    Lazily started ProcessPoolExecutor. workers=0 runs jobs on the event
+    loop's default thread pool instead (same await interface, no isolation).
+    A worker crash breaks the executor; it is replaced on the next call.
+    """
+
+    def __init__(self, workers: int = None, start_method: str = "spawn"):
+        self.workers = max(1, (os.cpu_count() or 2) - 1) if workers is None else max(0, int(workers))
+        self.start_method = start_method
+        self._executor = None
+        self._lock = Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _get_executor(self):
+        if self.workers == 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker,
+                    initargs=(get_config(),),
+                )
+            return self._executor
+
+    def start(self):
+        """Spawn the workers up front so the first request doesn't pay for imports."""
+        executor = self._get_executor()
+        if executor is not None:
+            for _ in range(self.workers):
+                executor.submit(_warm_up)
+
+    async def run(self, fn, *args):
+        """Run fn(*args) in the pool and await its result."""
+        executor = self._get_executor()
+        self.submitted += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            self.failed += 1
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "mode": "process" if self.workers else "thread",
+            "running": self._executor is not None,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+def _build_pool() -> ComputePool:
+    compute_cfg = get_config().get("compute", {})
+    return ComputePool(
+        workers=compute_cfg.get("workers"),
+        start_method=compute_cfg.get("start_method", "spawn"),
+    )
+
+
+# Shared process-wide pool
+_pool = _build_pool()
+
+
+def get_compute_pool() -> ComputePool:
+    return _pool
@@ -0,0 +1,180 @@
+"""
+DISHA Beta — Constellation Registry
+Many TLE-backed satellites propagated together. One SatrecArray call per tick
+covers every member; ECEF/LLA, conical eclipse, ground contact and the subsystem
+updates are evaluated for the whole fleet in batch on a FleetState.
+"""
+
+import asyncio
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from sgp4.api import SatrecArray, jday
+
+from backend.core.fleet_state import FleetState
+from backend.core.tle_manager import TLEManager
+from backend.core.flight_dynamics import (
+    eci_to_ecef_batch, ecef_to_lla_batch, get_julian_date, get_sun_positions
+)
+from backend.core.eclipse import in_shadow_batch
+from backend.core.ground_stations import check_contact_many
+from backend.core.telemetry_manager import ConnectionManager, build_telemetry_frame
+from backend.models.constants import EARTH_RADIUS_KM
+
+
+class Constellation:
+    """
+    Registry of satellites keyed by NORAD ID. State lives in a FleetState;
+    get() returns a SatelliteView that behaves like a MissionState, so
+    single-satellite services (passes, power, ephemeris) work unchanged on
+    any member. Members share the constellation clock.
+
+    Members do not keep a blackout telemetry buffer; per-satellite streams
+    carry LIVE/PREDICTED frames only.
+    """
+
+    def __init__(self):
+        self.fleet = FleetState(datetime.now(timezone.utc))
+        self.errors = {}               # norad_id -> last SGP4 error code
+        self.streams = {}              # norad_id -> ConnectionManager
+        self._satrecs = None           # SatrecArray, rebuilt on membership change
+        self._lock = Lock()
+
+    @property
+    def current_time(self) -> datetime:
+        return self.fleet.current_time
+
+    @property
+    def members(self) -> list:
+        return list(self.fleet.ids)
+
+    # ====================================================
+    # MEMBERSHIP
+    # ====================================================
+
+    def add_tle(self, name: str, line1: str, line2: str, norad_id: int = None) -> dict:
+        """Register a satellite from TLE lines. Replaces an existing member with the same ID."""
+        tle = TLEManager()
+        tle.load_lines(name, line1, line2, norad_id)
+        return self._add(tle)
+
+    async def load(self, norad_ids: list) -> dict:
+        """Fetch TLEs from CelesTrak concurrently and register them."""
+        managers = [TLEManager() for _ in norad_ids]
+        results = await asyncio.gather(
+            *(tle.fetch_tle(nid) for tle, nid in zip(managers, norad_ids)),
+            return_exceptions=True,
+        )
+        loaded, failed = [], []
+        for nid, tle, result in zip(norad_ids, managers, results):
+            if isinstance(result, Exception):
+                failed.append({"norad_id": nid, "error": str(result)})
+            else:
+                loaded.append(self._add(tle))
+        return {"loaded": loaded, "failed": failed}
+
+    def _add(self, tle: TLEManager) -> dict:
+        with self._lock:
+            pos, vel = tle.propagate_at(self.fleet.current_time)
+            view = self.fleet.add(tle.norad_id, pos, vel, tle)
+            r_ecef = eci_to_ecef_batch(view.position, [get_julian_date(self.fleet.current_time)])
+            lat, lon, _ = ecef_to_lla_batch(r_ecef)[0]
+            view.latitude, view.longitude = float(lat), float(lon)
+            view.altitude_km = float(np.linalg.norm(pos)) - EARTH_RADIUS_KM
+            self.errors.pop(tle.norad_id, None)
+            self._satrecs = None
+        return self._summary(view)
+
+    def remove(self, norad_id: int) -> bool:
+        with self._lock:
+            if not self.fleet.remove(norad_id):
+                return False
+            self.errors.pop(norad_id, None)
+            self._satrecs = None
+            return True
+
+    def clear(self):
+        with self._lock:
+            self.fleet.clear()
+            self.errors.clear()
+            self._satrecs = None
+
+    def get(self, norad_id: int):
+        return self.fleet.view(norad_id)
+
+    def list_members(self) -> list:
+        return [self._summary(self.fleet.view(nid)) for nid in self.members]
+
+    def _summary(self, sat) -> dict:
+        norad_id = sat.key
+        return {
+            "norad_id": norad_id,
+            "satellite_name": sat.tle_manager.satellite_name,
+            "latitude": round(sat.latitude, 4),
+            "longitude": round(sat.longitude, 4),
+            "altitude_km": round(sat.altitude_km, 2),
+            "in_eclipse": sat.in_eclipse,
+            "in_contact": sat.in_contact,
+            "battery_pct": round((sat.current_battery_wh / sat.battery_capacity_wh) * 100, 2),
+            "sgp4_error": self.errors.get(norad_id, 0),
+            "subscribers": self.streams[norad_id].client_count if norad_id in self.streams else 0,
+        }
+
+    # ====================================================
+    # SIMULATION
+    # ====================================================
+
+    def tick(self, dt_seconds: float = 1.0):
+        """Advance every member by dt_seconds with one batched SGP4 call."""
+        with self._lock:
+            fleet = self.fleet
+            if not len(fleet):
+                fleet.current_time += timedelta(seconds=dt_seconds)
+                return
+            if self._satrecs is None:
+                self._satrecs = SatrecArray([tle.satrec for tle in fleet.tle_managers])
+
+            t = fleet.current_time + timedelta(seconds=dt_seconds)
+            jd, fr = jday(t.year, t.month, t.day, t.hour, t.minute, t.second + t.microsecond / 1e6)
+            errors, r, v = self._satrecs.sgp4(np.array([jd]), np.array([fr]))
+            errors, r, v = errors[:, 0], r[:, 0], v[:, 0]
+
+            # Decayed / invalid element sets hold their last good state
+            ok = errors == 0
+            rows = np.flatnonzero(ok)
+            self.errors = {fleet.ids[k]: int(errors[k]) for k in np.flatnonzero(~ok)}
+            r, v = r[ok], v[ok]
+
+            r_ecef = eci_to_ecef_batch(r, np.full(len(r), jd + fr))
+            lla = ecef_to_lla_batch(r_ecef)
+            eclipse = in_shadow_batch(r, get_sun_positions(jd + fr))
+            fleet.apply_orbit_states(r, v, lla[:, 0], lla[:, 1], eclipse, dt_seconds, rows=rows)
+
+            contacts = check_contact_many(r_ecef)
+            fleet.update_contacts([c["in_contact"] for c in contacts],
+                                  [c["station"] for c in contacts],
+                                  [c["elevation_deg"] for c in contacts], rows=rows,
+                                  dt_seconds=dt_seconds)
+
+    # ====================================================
+    # PER-SATELLITE TELEMETRY STREAMS
+    # ====================================================
+
+    def stream(self, norad_id: int) -> ConnectionManager:
+        if norad_id not in self.streams:
+            self.streams[norad_id] = ConnectionManager()
+        return self.streams[norad_id]
+
+    async def broadcast_telemetry(self):
+        """Push one frame to each member's subscribers. Frames are only built for watched satellites."""
+        for nid, manager in list(self.streams.items()):
+            sat = self.fleet.view(nid)
+            if sat is None or manager.client_count == 0:
+                continue
+            source = "LIVE" if sat.in_contact else "PREDICTED"
+            await manager.broadcast({
+                "type": "telemetry",
+                "norad_id": nid,
+                "telemetry": build_telemetry_frame(sat.get_state(), source=source),
+                "alerts": [],
+            })
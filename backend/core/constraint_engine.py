@@ -4,6 +4,8 @@ Weighted constraint evaluation with risk score computation.
 Category deduplication: highest weight per category.
 """
 
+import numpy as np
+from backend.core.time_services import isoformat
 from backend.models.config import get_config
 
 
@@ -46,6 +48,18 @@ def _get_value(telemetry: dict, param: str):
     return None
 
 
+def fires_batch(value: np.ndarray, op: str, threshold) -> np.ndarray:
+    """Per-step rule condition over a column of any shape; < and > only apply to numeric columns."""
+    if op in ("<", ">"):
+        if value.dtype.kind not in "biuf":
+            return np.zeros(value.shape, dtype=bool)
+        return value < threshold if op == "<" else value > threshold
+    if op in ("!=", "=="):
+        equal = np.broadcast_to(np.asarray(value == threshold, dtype=bool), value.shape)
+        return ~equal if op == "!=" else equal.copy()
+    return np.zeros(value.shape, dtype=bool)
+
+
 def evaluate_constraints(telemetry_snapshot: dict) -> dict:
     """
     Evaluate all constraint rules against a telemetry snapshot.
@@ -114,3 +128,48 @@ def evaluate_constraints(telemetry_snapshot: dict) -> dict:
         "risk_score": risk_score,
         "active_constraints": active,
     }
+
+
+def constraint_risk_batch(columns: dict, n: int) -> tuple:
+    """
+    Risk score at each of n consecutive steps (columns: telemetry field
+    name -> (n,) array), with the same per-category deduplication as
+    evaluate_constraints(). Returns (risk (n,), categories that fired at
+    any step).
+    """
+    config = get_config()
+    rules = config.get("constraint_rules", DEFAULT_CONSTRAINTS)
+
+    category_weight = {}
+    for rule in rules:
+        value = _get_value(columns, rule.get("parameter", ""))
+        if value is None:
+            continue
+        fired = fires_batch(np.asarray(value), rule.get("operator", "<"), rule.get("threshold"))
+        weight = np.where(fired, rule.get("weight", 0.1), 0.0)
+        category = rule.get("category", "UNKNOWN")
+        category_weight[category] = np.maximum(category_weight.get(category, 0.0), weight)
+
+    risk = np.zeros(n)
+    for weight in category_weight.values():
+        risk += weight
+    risk = np.round(np.clip(risk, 0.0, 1.0), 3)
+    return risk, sorted(c for c, w in category_weight.items() if (w > 0).any())
+
+
+def evaluate_constraint_window(columns: dict, times, risk_batch: tuple = None) -> dict:
+    """
+    Summary of constraint_risk_batch() over a window of steps (times: epoch
+    seconds), so violations between broadcast frames stay visible: peak
+    risk, when it occurred and every category that fired at any step.
+    risk_batch may pass an already computed constraint_risk_batch() result.
+    """
+    n = len(times)
+    risk, categories = risk_batch or constraint_risk_batch(columns, n)
+    peak = int(np.argmax(risk)) if n else 0
+    return {
+        "steps": n,
+        "peak_risk_score": float(risk[peak]) if n else 0.0,
+        "peak_time": isoformat(times[peak]) if n else None,
+        "categories": categories,
+    }
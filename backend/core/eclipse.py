@@ -0,0 +1,313 @@
+"""
+DISHA Beta — Eclipse Service
+Conical umbra/penumbra shadow model and precomputed shadow intervals.
+The ephemeris is scanned in one vectorized pass, every entry/exit is refined
+with Brent's method, and the sorted interval list answers "in eclipse at t?"
+with a binary search. The live tick, power prediction and the planner all
+read the same timeline, so their eclipse timing agrees.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Lock
+from types import SimpleNamespace
+import numpy as np
+from backend.core.flight_dynamics import (
+    get_julian_date, get_julian_dates, get_sun_positions, visibility_edges, brent_root
+)
+from backend.core.ephemeris import get_ephemeris, get_ephemeris_cache
+from backend.core.time_services import epoch_seconds
+from backend.models.constants import EARTH_RADIUS_KM
+
+SUN_RADIUS_KM = 695700.0
+
+SHADOW_SUNLIT = "SUNLIT"
+SHADOW_PENUMBRA = "PENUMBRA"
+SHADOW_UMBRA = "UMBRA"
+
+
+# ====================================================
+# CONICAL SHADOW MODEL
+# ====================================================
+
+def shadow_function(r_sat, r_sun) -> tuple:
+    """
+    Conical shadow margins (rad) for (N,3) satellite and sun ECI positions.
+    Angular separation of the Sun and Earth discs seen from the satellite,
+    minus the sum (penumbra) or difference (umbra) of their apparent radii.
+    Negative f_penumbra: Sun at least partly hidden. Negative f_umbra: fully hidden.
+    Both are continuous in time, so their zeros are the shadow boundaries.
+    """
+    r_sat = np.asarray(r_sat, dtype=float).reshape(-1, 3)
+    to_sun = np.asarray(r_sun, dtype=float).reshape(-1, 3) - r_sat
+
+    dist_sun = np.linalg.norm(to_sun, axis=1)
+    dist_earth = np.linalg.norm(r_sat, axis=1)
+    theta_sun = np.arcsin(SUN_RADIUS_KM / dist_sun)
+    theta_earth = np.arcsin(np.clip(EARTH_RADIUS_KM / dist_earth, -1.0, 1.0))
+
+    cos_sep = -np.einsum("ij,ij->i", r_sat, to_sun) / (dist_sun * dist_earth)
+    separation = np.arccos(np.clip(cos_sep, -1.0, 1.0))
+    return separation - (theta_earth + theta_sun), separation - (theta_earth - theta_sun)
+
+
+def in_shadow_batch(r_sat, r_sun) -> np.ndarray:
+    """(N,) bool — umbra or penumbra — for instantaneous checks (constellation tick)."""
+    f_penumbra, _ = shadow_function(r_sat, r_sun)
+    return f_penumbra < 0
+
+
+# ====================================================
+# INTERVAL TIMELINE
+# ====================================================
+
+class EclipseTimeline:
+    """
+    Sorted eclipse intervals over [0, horizon_sec] from epoch. An interval
+    runs from penumbra entry to penumbra exit; umbra_start/umbra_end are the
+    full-shadow part inside it (NaN when the Sun is never fully hidden).
+    Offsets are seconds from the timeline epoch; use offset() to convert a
+    datetime or float64 epoch seconds.
+    """
+
+    def __init__(self, epoch, horizon_sec: float, starts, ends, umbra_starts, umbra_ends,
+                 generation: int = 0):
+        self.epoch = epoch
+        self.epoch_sec = epoch_seconds(epoch)
+        self.horizon_sec = float(horizon_sec)
+        self.starts = np.asarray(starts, dtype=float)
+        self.ends = np.asarray(ends, dtype=float)
+        self.umbra_starts = np.asarray(umbra_starts, dtype=float)
+        self.umbra_ends = np.asarray(umbra_ends, dtype=float)
+        self.generation = generation
+
+    def offset(self, t):
+        """Offset from the timeline epoch for a datetime or epoch seconds (scalar or array)."""
+        if isinstance(t, datetime):
+            return (t - self.epoch).total_seconds()
+        return np.asarray(t, dtype=float) - self.epoch_sec
+
+    def covers(self, t0: float, t1: float) -> bool:
+        return 0.0 <= t0 and t1 <= self.horizon_sec
+
+    def _interval_index(self, t) -> np.ndarray:
+        t = np.asarray(t, dtype=float)
+        if not len(self.starts):
+            return np.full(t.shape, -1)
+        idx = np.searchsorted(self.starts, t, side="right") - 1
+        inside = (idx >= 0) & (t < self.ends[np.maximum(idx, 0)])
+        return np.where(inside, idx, -1)
+
+    def in_eclipse(self, t):
+        """Bool (or bool array) for offsets t — binary search on the interval starts."""
+        result = self._interval_index(t) >= 0
+        return bool(result) if np.ndim(result) == 0 else result
+
+    def in_eclipse_at(self, dt) -> bool:
+        return self.in_eclipse(self.offset(dt))
+
+    def shadow_state(self, t) -> str:
+        """SUNLIT / PENUMBRA / UMBRA at a single offset."""
+        idx = int(self._interval_index(t))
+        if idx < 0:
+            return SHADOW_SUNLIT
+        if self.umbra_starts[idx] <= t < self.umbra_ends[idx]:
+            return SHADOW_UMBRA
+        return SHADOW_PENUMBRA
+
+    def next_eclipse(self, t: float) -> tuple:
+        """(start, end) of the first interval starting after t, or None."""
+        idx = np.searchsorted(self.starts, t, side="right")
+        if idx >= len(self.starts):
+            return None
+        return float(self.starts[idx]), float(self.ends[idx])
+
+    def intervals(self) -> list:
+        """Interval list as dicts (offsets in seconds from epoch)."""
+        return [
+            {
+                "start_sec": round(float(s), 3), "end_sec": round(float(e), 3),
+                "umbra_start_sec": None if np.isnan(us) else round(float(us), 3),
+                "umbra_end_sec": None if np.isnan(ue) else round(float(ue), 3),
+                "duration_sec": round(float(e - s), 3),
+            }
+            for s, e, us, ue in zip(self.starts, self.ends, self.umbra_starts, self.umbra_ends)
+        ]
+
+
+def find_eclipse_intervals(ephemeris, epoch, duration_sec: float, step_sec: float = 30.0,
+                           xtol: float = 1e-2) -> EclipseTimeline:
+    """
+    Scan an ephemeris for shadow boundaries. The coarse scan evaluates the
+    shadow function on the whole sample grid at once; each sign change is
+    then root-found. step_sec must stay below the shortest umbra pass
+    (tens of minutes in LEO); penumbra is found through its continuous margin.
+    """
+    offsets, states = ephemeris.sample(step_sec, duration_sec)
+    jd0 = get_julian_date(epoch)
+    f_pen, f_umb = shadow_function(states[:, :3], get_sun_positions(get_julian_dates(epoch, offsets)))
+    horizon = float(offsets[-1])
+
+    def margin_fn(which):
+        def f(t):
+            r = ephemeris.state_at(t)[:3]
+            return shadow_function(r, get_sun_positions(jd0 + t / 86400.0))[which][0]
+        return f
+
+    def edges(f, which):
+        _, starts, ends = visibility_edges(f < 0)
+        fn = margin_fn(which)
+        out_s, out_e = [], []
+        for i0, i1 in zip(starts, ends):
+            t0 = offsets[0] if i0 == 0 else brent_root(fn, offsets[i0 - 1], offsets[i0],
+                                                       f[i0 - 1], f[i0], xtol=xtol)
+            t1 = horizon if i1 == len(offsets) else brent_root(fn, offsets[i1 - 1], offsets[i1],
+                                                               f[i1 - 1], f[i1], xtol=xtol)
+            out_s.append(t0)
+            out_e.append(t1)
+        return np.array(out_s), np.array(out_e)
+
+    starts, ends = edges(f_pen, 0)
+    u_starts, u_ends = edges(f_umb, 1)
+
+    # Attach each umbra run to the penumbra interval that contains it
+    umbra_starts = np.full(len(starts), np.nan)
+    umbra_ends = np.full(len(starts), np.nan)
+    if len(starts) and len(u_starts):
+        owner = np.clip(np.searchsorted(starts, u_starts, side="right") - 1, 0, len(starts) - 1)
+        umbra_starts[owner] = u_starts
+        umbra_ends[owner] = u_ends
+
+    return EclipseTimeline(epoch, horizon, starts, ends, umbra_starts, umbra_ends)
+
+
+# ====================================================
+# SHARED SERVICE
+# ====================================================
+
+class EclipseService:
+    """
+    Caches one timeline per orbit source (TLE lines, or the MissionState or
+    snapshot cache_key for the simulated orbit) and extends it only when a
+    caller needs more horizon than is left. Timelines built before the last
+    ephemeris invalidation (reset, TLE load) are discarded.
+
+    Once less than refresh_margin_sec of a cached timeline is left, its
+    successor is built from a copy of the current orbit state on a
+    background thread and swapped in when the old one runs out, so the tick
+    does not stall on propagation and root finding. A successor still being
+    built at that point is waited for rather than built twice, which keeps
+    the swap point (and headless runs) deterministic.
+    """
+
+    def __init__(self, horizon_sec: float = 10800.0, scan_step_sec: float = 30.0,
+                 max_entries: int = 8, refresh_margin_sec: float = 1800.0):
+        self.horizon_sec = horizon_sec
+        self.scan_step_sec = scan_step_sec
+        self.max_entries = max_entries
+        self.refresh_margin_sec = refresh_margin_sec
+        self._entries = OrderedDict()
+        self._pending = {}        # key -> Future of the successor timeline
+        self._executor = None
+        self._lock = Lock()
+        self.refreshes = 0
+
+    @staticmethod
+    def _key(mission_state, method):
+        tle = getattr(mission_state, "tle_manager", None)
+        if tle is not None and tle.satrec is not None:
+            return ("tle", tle.tle_line1, tle.tle_line2, method)
+        cache_key = getattr(mission_state, "cache_key", None)
+        if cache_key is not None:
+            return ("state", cache_key, method)
+        # No stable identity: key by the orbit state itself
+        return ("state", np.asarray(mission_state.position, dtype=float).tobytes(),
+                np.asarray(mission_state.velocity, dtype=float).tobytes(),
+                mission_state.current_time.timestamp(), method)
+
+    def get(self, mission_state, min_horizon_sec: float = 0.0, method: str = None) -> EclipseTimeline:
+        """Timeline covering [now, now + min_horizon_sec] for the mission state."""
+        key = self._key(mission_state, method)
+        generation = get_ephemeris_cache().generation
+        now = mission_state.current_time
+
+        with self._lock:
+            timeline = self._entries.get(key)
+            pending = self._pending.get(key)
+        if timeline is not None and timeline.generation == generation:
+            t_now = timeline.offset(now)
+            if timeline.covers(t_now, t_now + min_horizon_sec):
+                if pending is None and timeline.horizon_sec - (t_now + min_horizon_sec) < self.refresh_margin_sec:
+                    self._schedule_refresh(key, mission_state, min_horizon_sec, method, generation)
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                return timeline
+
+        if pending is not None:
+            with self._lock:
+                if self._pending.get(key) is pending:
+                    del self._pending[key]
+            try:
+                successor = pending.result()
+            except Exception:
+                successor = None  # rebuilt below
+            if successor is not None and successor.generation == generation:
+                t_now = successor.offset(now)
+                if successor.covers(t_now, t_now + min_horizon_sec):
+                    self._store(key, successor)
+                    return successor
+
+        timeline = self._build(mission_state, min_horizon_sec, method, generation)
+        self._store(key, timeline)
+        return timeline
+
+    def _build(self, mission_state, min_horizon_sec: float, method: str, generation: int) -> EclipseTimeline:
+        duration = max(self.horizon_sec, min_horizon_sec + self.scan_step_sec)
+        ephemeris = get_ephemeris(mission_state, duration, method=method)
+        timeline = find_eclipse_intervals(ephemeris, mission_state.current_time, duration,
+                                          self.scan_step_sec)
+        timeline.generation = generation
+        return timeline
+
+    def _schedule_refresh(self, key, mission_state, min_horizon_sec: float, method: str, generation: int):
+        # The tick keeps mutating the state, so the worker gets a copy of the orbit source
+        source = SimpleNamespace(
+            current_time=mission_state.current_time,
+            position=np.array(mission_state.position, dtype=float),
+            velocity=np.array(mission_state.velocity, dtype=float),
+            tle_manager=getattr(mission_state, "tle_manager", None),
+        )
+        with self._lock:
+            if key in self._pending:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="eclipse")
+            self._pending[key] = self._executor.submit(self._build, source, min_horizon_sec, method, generation)
+            self.refreshes += 1
+
+    def _store(self, key, timeline: EclipseTimeline):
+        with self._lock:
+            self._entries[key] = timeline
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._pending.pop(evicted, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+
+
+_service = EclipseService()
+
+
+def get_eclipse_timeline(mission_state, min_horizon_sec: float = 0.0, method: str = None) -> EclipseTimeline:
+    """Shared eclipse timeline for a mission state (see EclipseService)."""
+    return _service.get(mission_state, min_horizon_sec, method)
+
+
+def get_eclipse_service() -> EclipseService:
+    return _service
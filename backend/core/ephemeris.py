@@ -0,0 +1,331 @@
+"""
+DISHA Beta — Ephemeris Service
+Propagates once per (orbit state, epoch) and shares the result between
+pass prediction, feasibility, power prediction and ground-track endpoints.
+Bounded LRU cache; invalidated on MissionState reset and TLE load.
+Consumers that only need approximate geometry can ask for the analytic
+J2 secular model instead, which is evaluated on demand and never cached.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+import numpy as np
+from backend.core.flight_dynamics import (
+    rk4_step, propagate_adaptive, propagate_j2_secular, get_j2_acceleration
+)
+from backend.models.config import get_config
+
+
+class Ephemeris:
+    """
+    Compact piecewise-cubic Hermite ephemeris.
+
+    The trajectory is split into fixed segments of step_sec; each segment holds
+    monomial coefficients of its (6,) ECI state in normalized time s ∈ [0, 1],
+    all stored in one contiguous (n_segments, 4, 6) array. Evaluation at any
+    epoch is O(1): pick segment floor(t / step_sec) and run Horner's scheme.
+    Position uses velocity as its derivative; velocity uses J2 acceleration.
+    """
+
+    def __init__(self, epoch, step_sec: float, coeffs: np.ndarray, propagator=None):
+        self.epoch = epoch
+        self.step_sec = float(step_sec)
+        self.coeffs = coeffs
+        # propagator(state_vec, n_samples, step_sec, t_start) -> (n_samples, 6), used by extend()
+        self.propagator = propagator or _propagate_states
+
+    @classmethod
+    def from_states(cls, epoch, step_sec: float, states: np.ndarray, propagator=None) -> "Ephemeris":
+        """Build from (N,6) node states sampled every step_sec (N >= 2)."""
+        return cls(epoch, step_sec, _hermite_coeffs(np.asarray(states, dtype=float), float(step_sec)),
+                   propagator)
+
+    @property
+    def n_segments(self) -> int:
+        return len(self.coeffs)
+
+    @property
+    def duration_sec(self) -> float:
+        return self.n_segments * self.step_sec
+
+    @property
+    def states(self) -> np.ndarray:
+        """(N,6) node states — the segment start values plus the final node."""
+        coeffs = self.coeffs
+        return np.concatenate((coeffs[:, 0], coeffs[-1:].sum(axis=1)))
+
+    @property
+    def time_offsets(self) -> np.ndarray:
+        return np.arange(self.n_segments + 1, dtype=float) * self.step_sec
+
+    def sample(self, step_sec: float, duration_sec: float) -> tuple:
+        """
+        Return (time_offsets, states) on np.arange(0, duration_sec, step_sec),
+        matching the grid propagate_orbit would produce. Multiples of the
+        base step read node values directly; other steps are interpolated.
+        """
+        offsets = np.arange(0, duration_sec, step_sec, dtype=float)
+        stride = step_sec / self.step_sec
+        if abs(stride - round(stride)) < 1e-9 and stride >= 1:
+            idx = np.arange(len(offsets)) * int(round(stride))
+            return offsets, self.coeffs[idx, 0]
+        return offsets, self.states_at(offsets)
+
+    def state_at(self, time_offset: float) -> np.ndarray:
+        """(6,) state at a single offset from the epoch."""
+        return self.states_at(time_offset)[0]
+
+    def states_at(self, time_offsets) -> np.ndarray:
+        """Vectorized (M,6) evaluation at arbitrary offsets from the epoch."""
+        t = np.atleast_1d(np.asarray(time_offsets, dtype=float))
+        coeffs = self.coeffs  # snapshot — extend() swaps the array, never mutates it
+        h = self.step_sec
+
+        k = np.clip((t // h).astype(int), 0, len(coeffs) - 1)
+        s = (t / h - k)[:, None]
+        c = coeffs[k]
+        return ((c[:, 3] * s + c[:, 2]) * s + c[:, 1]) * s + c[:, 0]
+
+    def snapshot(self) -> "Ephemeris":
+        """Ephemeris over the current segments only; later extend() calls do not reach it."""
+        return Ephemeris(self.epoch, self.step_sec, self.coeffs, self.propagator)
+
+    def extend(self, duration_sec: float):
+        """Continue propagation from the last node out to duration_sec."""
+        n_needed = int(np.floor(duration_sec / self.step_sec)) + 1
+        if n_needed <= self.n_segments:
+            return
+        last_state = self.coeffs[-1].sum(axis=0)
+        extra = self.propagator(last_state, n_needed - self.n_segments + 1, self.step_sec,
+                                self.duration_sec)
+        self.coeffs = np.concatenate((self.coeffs, _hermite_coeffs(extra, self.step_sec)))
+
+
+class AnalyticEphemeris:
+    """
+    Ephemeris-compatible view of the analytic J2 secular model.
+    Same sample/state_at/states_at interface as Ephemeris, but every call is
+    a closed-form evaluation — no integration, no storage, unbounded horizon.
+    """
+
+    def __init__(self, epoch, position, velocity):
+        self.epoch = epoch
+        self.initial_state = {
+            "position": np.asarray(position, dtype=float),
+            "velocity": np.asarray(velocity, dtype=float),
+        }
+
+    def sample(self, step_sec: float, duration_sec: float) -> tuple:
+        offsets = np.arange(0, duration_sec, step_sec, dtype=float)
+        return offsets, self.states_at(offsets)
+
+    def state_at(self, time_offset: float) -> np.ndarray:
+        return self.states_at(time_offset)[0]
+
+    def states_at(self, time_offsets) -> np.ndarray:
+        return propagate_j2_secular(self.initial_state, time_offsets)
+
+
+def _hermite_coeffs(states: np.ndarray, h: float) -> np.ndarray:
+    """Monomial cubic coefficients (n-1, 4, 6) for consecutive node pairs."""
+    acc = get_j2_acceleration(states[:, :3])
+    deriv = np.concatenate((states[:, 3:], acc), axis=1) * h
+
+    y0, y1 = states[:-1], states[1:]
+    d0, d1 = deriv[:-1], deriv[1:]
+
+    coeffs = np.empty((len(y0), 4, 6))
+    coeffs[:, 0] = y0
+    coeffs[:, 1] = d0
+    coeffs[:, 2] = -3.0 * y0 - 2.0 * d0 + 3.0 * y1 - d1
+    coeffs[:, 3] = 2.0 * y0 + d0 - 2.0 * y1 + d1
+    return coeffs
+
+
+def _propagate_states(state_vec: np.ndarray, n_samples: int, step_sec: float,
+                      t_start: float = 0.0) -> np.ndarray:
+    """RK4 (J2) propagation into a contiguous (n_samples, 6) array."""
+    states = np.empty((n_samples, 6))
+    state = np.asarray(state_vec, dtype=float)
+    for i in range(n_samples):
+        states[i] = state
+        state = rk4_step(state, step_sec)
+    return states
+
+
+# Integrators make_propagator() accepts
+PROPAGATION_METHODS = ("rk4", "dopri5", "j2_secular")
+
+
+def make_propagator(method: str = "rk4", rtol: float = 1e-9, atol: float = 1e-9):
+    """
+    Node propagator for the given integrator. "rk4" steps exactly at the node
+    spacing; "dopri5" steps adaptively to rtol/atol and fills the nodes from
+    dense output; "j2_secular" evaluates the analytic model at the nodes.
+    """
+    if method == "rk4":
+        return _propagate_states
+    if method == "j2_secular":
+        def propagate(state_vec, n_samples, step_sec, t_start=0.0):
+            initial_state = {"position": state_vec[:3], "velocity": state_vec[3:]}
+            return propagate_j2_secular(initial_state, np.arange(n_samples) * step_sec)
+        return propagate
+    if method != "dopri5":
+        raise ValueError(f"Unknown propagation method: {method}")
+
+    def propagate(state_vec, n_samples, step_sec, t_start=0.0):
+        initial_state = {"position": state_vec[:3], "velocity": state_vec[3:]}
+        t_eval = np.arange(n_samples) * step_sec
+        _, states = propagate_adaptive(initial_state, t_eval[-1], t_eval=t_eval, rtol=rtol, atol=atol)
+        return states
+
+    return propagate
+
+
+def make_sgp4_propagator(tle_manager, epoch):
+    """
+    Node propagator reading SGP4 directly (batched) instead of integrating.
+    Nodes are absolute epochs, so t_start is used and state_vec ignored.
+    Rows where SGP4 reports an error are NaN.
+    """
+    def propagate(state_vec, n_samples, step_sec, t_start=0.0):
+        r, v, _ = tle_manager.propagate_offsets(epoch, t_start + np.arange(n_samples) * step_sec)
+        return np.concatenate((r, v), axis=1)
+
+    return propagate
+
+
+class EphemerisCache:
+    """
+    LRU cache of Ephemeris objects keyed by (method, position, velocity,
+    epoch), or by (TLE lines, epoch) for SGP4-backed entries. Entries are propagated at
+    base_step_sec and lengthened in place when a consumer asks for a longer
+    horizon than is cached.
+    """
+
+    def __init__(self, max_entries: int = 8, base_step_sec: float = 10.0,
+                 method: str = "rk4", rtol: float = 1e-9, atol: float = 1e-9):
+        self.max_entries = max_entries
+        self.base_step_sec = base_step_sec
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+        self._propagators = {method: make_propagator(method, rtol, atol)}
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.generation = 0  # bumped on clear() so derived products (eclipse timelines) can tell they are stale
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, position, velocity, epoch, duration_sec: float, method: str = None) -> Ephemeris:
+        """
+        Return an ephemeris covering at least duration_sec from epoch, built
+        with the given integrator (see make_propagator; default the
+        configured one). Each method is cached under its own key.
+        """
+        method = method or self.method
+        r = np.asarray(position, dtype=float)
+        v = np.asarray(velocity, dtype=float)
+        key = (method, r.tobytes(), v.tobytes(), epoch.timestamp() if epoch else None)
+        return self._get(key, np.concatenate((r, v)), epoch, duration_sec, self._propagator(method))
+
+    def _propagator(self, method: str):
+        propagate = self._propagators.get(method)
+        if propagate is None:
+            propagate = self._propagators[method] = make_propagator(method, self.rtol, self.atol)
+        return propagate
+
+    def get_tle(self, tle_manager, epoch, duration_sec: float) -> Ephemeris:
+        """SGP4-backed ephemeris for the loaded TLE, starting at epoch."""
+        key = ("sgp4", tle_manager.tle_line1, tle_manager.tle_line2, epoch.timestamp())
+        return self._get(key, None, epoch, duration_sec, make_sgp4_propagator(tle_manager, epoch))
+
+    def _get(self, key, state_vec, epoch, duration_sec: float, propagate) -> Ephemeris:
+        with self._lock:
+            eph = self._entries.get(key)
+            if eph is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                eph.extend(duration_sec)
+                return eph
+            self.misses += 1
+
+        # A new trajectory is propagated outside the lock, so a background
+        # build (eclipse refresh, pass schedule) does not stall other readers
+        n_samples = int(np.floor(duration_sec / self.base_step_sec)) + 2
+        states = propagate(state_vec, n_samples, self.base_step_sec)
+        built = Ephemeris.from_states(epoch, self.base_step_sec, states, propagate)
+
+        with self._lock:
+            eph = self._entries.setdefault(key, built)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            eph.extend(duration_sec)
+            return eph
+
+    def extend(self, ephemeris: Ephemeris, duration_sec: float):
+        """Lengthen an ephemeris handed out by this cache (serialized with get())."""
+        with self._lock:
+            ephemeris.extend(duration_sec)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "method": self.method,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _build_cache() -> EphemerisCache:
+    prop_cfg = get_config().get("propagation", {})
+    return EphemerisCache(
+        max_entries=prop_cfg.get("ephemeris_cache_entries", 8),
+        base_step_sec=prop_cfg.get("ephemeris_step_sec", 10.0),
+        method=prop_cfg.get("method", "rk4"),
+        rtol=prop_cfg.get("rtol", 1e-9),
+        atol=prop_cfg.get("atol", 1e-9),
+    )
+
+
+# Shared process-wide cache
+_cache = _build_cache()
+
+
+def get_ephemeris(mission_state, duration_sec: float, method: str = None):
+    """
+    Ephemeris for the mission state's current position/velocity and clock.
+    method=None uses the configured high-fidelity cache — SGP4 when a TLE is
+    loaded; method="j2_secular" returns the analytic fast-prediction model;
+    "rk4" or "dopri5" integrate from the current state with that integrator
+    (cached like the default, whatever the configured method).
+    """
+    if method == "j2_secular":
+        return AnalyticEphemeris(mission_state.current_time, mission_state.position,
+                                 mission_state.velocity)
+    if method is not None:
+        if method not in PROPAGATION_METHODS:
+            raise ValueError(f"Unknown propagation method: {method}")
+        return _cache.get(mission_state.position, mission_state.velocity,
+                          mission_state.current_time, duration_sec, method)
+    tle_manager = getattr(mission_state, "tle_manager", None)
+    if tle_manager is not None and tle_manager.satrec is not None:
+        return _cache.get_tle(tle_manager, mission_state.current_time, duration_sec)
+    return _cache.get(mission_state.position, mission_state.velocity,
+                      mission_state.current_time, duration_sec)
+
+
+def invalidate_ephemeris():
+    """Drop all cached trajectories (state reset, new TLE)."""
+    _cache.clear()
+
+
+def get_ephemeris_cache() -> EphemerisCache:
+    return _cache
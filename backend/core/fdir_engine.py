@@ -7,19 +7,23 @@ Deterministic, rule-based only. No ML.
 import uuid
 from collections import deque
 from datetime import datetime, timezone
+import numpy as np
+from backend.core.constraint_engine import fires_batch
+from backend.core.time_services import isoformat
 from backend.models.config import get_config
 
 
 class FDIRAlert:
     """Single FDIR alert with all metadata."""
     def __init__(self, rule_id: str, severity: str, parameter: str,
-                 current_value: float, threshold: float, corrective_action: str):
+                 current_value: float, threshold: float, corrective_action: str,
+                 timestamp: str = None):
         self.rule_id = rule_id
         self.severity = severity
         self.parameter = parameter
         self.current_value = current_value
         self.threshold = threshold
-        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.timestamp = timestamp or datetime.now(timezone.utc).isoformat()
         self.corrective_action = corrective_action
 
     def to_dict(self) -> dict:
@@ -62,6 +66,7 @@ class FDIREngine:
         self.active_alerts = {}  # keyed by rule_id — self-clearing
         self.alert_history = deque(maxlen=200)
         self.last_evaluation_time = None
+        self.last_raised = []    # alerts raised by the latest evaluation
         self.auto_actions_today = 0
         self._today_date = None
 
@@ -125,6 +130,78 @@ class FDIREngine:
         for rid in cleared:
             del self.active_alerts[rid]
 
+        self._record_evaluation(new_alerts)
+        return [a.to_dict() for a in self.active_alerts.values()]
+
+    def evaluate_batch(self, columns: dict, times) -> list:
+        """
+        evaluate() over n consecutive steps at once. columns maps telemetry
+        field names to (n,) arrays (see time_warp.advance), times are the
+        steps' epoch seconds. Every rising edge of a rule raises an alert
+        stamped with its simulated time, even if it clears again before the
+        last step; the active set afterwards is that of the last step.
+        Returns the active alert dicts; last_raised holds the window's new alerts.
+        """
+        times = np.asarray(times, dtype=float)
+        conditions = self.conditions_batch(columns)
+
+        raised = []   # (step, rule order, alert)
+        active = {}
+        for order, rule in enumerate(self.rules):
+            rule_id = rule["rule_id"]
+            param = rule["parameter"]
+            triggered = conditions.get(rule_id)
+            if triggered is None or not triggered.any():
+                continue
+            value = np.asarray(self._get_value(columns, param))
+
+            previous = np.concatenate(([rule_id in self.active_alerts], triggered[:-1]))
+            threshold = rule["threshold"]
+            alert = self.active_alerts.get(rule_id)
+            for k in np.flatnonzero(triggered & ~previous):
+                alert = FDIRAlert(
+                    rule_id=rule_id,
+                    severity=rule["severity"],
+                    parameter=param,
+                    current_value=float(value[k]) if value.dtype.kind in "biuf" else 0,
+                    threshold=float(threshold) if isinstance(threshold, (int, float)) else 0,
+                    corrective_action=rule["corrective_action"],
+                    timestamp=isoformat(times[k]),
+                )
+                raised.append((k, order, alert))
+            # Still triggered at the last step: the alert that opened the final run stays active
+            if triggered[-1]:
+                active[rule_id] = alert
+
+        raised.sort(key=lambda item: (item[0], item[1]))
+        new_alerts = [alert.to_dict() for _, _, alert in raised]
+        self.alert_history.extend(new_alerts)
+        self.active_alerts = active
+
+        self._record_evaluation(new_alerts)
+        return [a.to_dict() for a in self.active_alerts.values()]
+
+    def conditions_batch(self, columns: dict) -> dict:
+        """
+        Per-step condition of every rule over columns whose last axis is
+        time — (n,) for one track, (R, n) for Monte Carlo realizations.
+        Returns rule_id → bool array; comms rules are masked outside
+        contact as in evaluate(), rules with no matching column are left out.
+        """
+        in_contact = columns.get("in_contact")
+        conditions = {}
+        for rule in self.rules:
+            value = self._get_value(columns, rule["parameter"])
+            if value is None:
+                continue
+            triggered = fires_batch(np.asarray(value), rule["operator"], rule["threshold"])
+            if rule["parameter"] == "snr" and in_contact is not None:
+                triggered = triggered & np.asarray(in_contact, dtype=bool)
+            conditions[rule["rule_id"]] = triggered
+        return conditions
+
+    def _record_evaluation(self, new_alerts: list):
+        self.last_raised = new_alerts
         self.last_evaluation_time = datetime.now(timezone.utc)
 
         # Track daily auto actions
@@ -135,8 +212,6 @@ class FDIREngine:
         if new_alerts:
             self.auto_actions_today += len(new_alerts)
 
-        return [a.to_dict() for a in self.active_alerts.values()]
-
     # Legacy compatibility
     def check(self, frame: dict) -> list:
         return self.evaluate(frame)
@@ -213,3 +288,4 @@ class FDIREngine:
         self.alert_history.clear()
         self.auto_actions_today = 0
         self.last_evaluation_time = None
+        self.last_raised = []
@@ -0,0 +1,353 @@
+"""
+DISHA Beta — Fleet State
+Structure-of-arrays digital twin for N satellites. Every MissionState field
+lives in one NumPy column indexed by row; subsystem updates are batched
+array operations over the whole fleet. SatelliteView exposes one row with
+the MissionState attribute interface, so get_state() and every
+single-satellite service work on fleet members unchanged.
+"""
+
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from backend.core.mission_state import MissionState, next_state_version
+from backend.core.noise import NOISE_WIDTH, FleetNoise, scale_uniform
+from backend.models.constants import EARTH_RADIUS_KM
+from backend.models.config import get_config
+
+
+LINK_STATUS = np.array(["NOMINAL", "DEGRADED", "NO_CONTACT"], dtype=object)
+LINK_NOMINAL, LINK_DEGRADED, LINK_NO_CONTACT = 0, 1, 2
+
+
+def _row_defaults() -> dict:
+    """Initial per-satellite values, matching MissionState.__init__."""
+    config = get_config()
+    power_cfg = config.get("power", {})
+    thermal_cfg = config.get("thermal", {})
+    storage_cfg = config.get("storage", {})
+    comms_cfg = config.get("comms", {})
+
+    capacity_wh = power_cfg.get("battery_capacity_wh", 500.0)
+    bus_voltage = power_cfg.get("bus_voltage_nominal_v", 12.0)
+    base_load_w = power_cfg.get("base_load_w", 3.0)
+    return {
+        "latitude": 0.0, "longitude": 0.0, "altitude_km": 0.0,
+        "battery_capacity_wh": capacity_wh,
+        "current_battery_wh": capacity_wh,
+        "bus_voltage": bus_voltage,
+        "solar_panel_current": power_cfg.get("solar_panel_current_nominal_a", 1.5),
+        "solar_array_output_w": power_cfg.get("solar_array_output_w", 18.0),
+        "base_load_w": base_load_w,
+        "current_draw": base_load_w / bus_voltage,
+        "component_temp": thermal_cfg.get("panel_temp_nominal_c", 25.0),
+        "battery_temp": thermal_cfg.get("battery_temp_nominal_c", 22.0),
+        "heater_active": False,
+        "snr_db": comms_cfg.get("snr_nominal_db", 15.0),
+        "link_code": LINK_NOMINAL,
+        "data_rate_kbps": 256.0,
+        "nearest_station": "ISTRAC Bangalore",
+        "attitude_mode": "NADIR",
+        "pointing_error": 0.1,
+        "angular_rate": 0.01,
+        "storage_capacity_mb": storage_cfg.get("capacity_mb", 1048576.0),
+        "storage_used_mb": 0.0,
+        "in_eclipse": False,
+        "payload_status": "IDLE",
+        "in_contact": False,
+        "contact_station": None,
+        "contact_elevation_deg": 0.0,
+        "last_contact_time": None,
+        "blackout_duration_sec": 0.0,
+    }
+
+
+# Column dtypes; anything not listed is float64
+_BOOL_FIELDS = {"heater_active", "in_eclipse", "in_contact"}
+_INT_FIELDS = {"link_code"}
+_OBJECT_FIELDS = {"nearest_station", "attitude_mode", "payload_status",
+                  "contact_station", "last_contact_time"}
+
+
+def _column_dtype(name: str):
+    if name in _BOOL_FIELDS:
+        return bool
+    if name in _INT_FIELDS:
+        return np.int64
+    if name in _OBJECT_FIELDS:
+        return object
+    return np.float64
+
+
+class FleetState:
+    """
+    N satellites as parallel arrays. Rows are keyed by an external ID
+    (NORAD ID for the constellation); removal compacts the arrays.
+    All members share one simulation clock and one state version, bumped on
+    every tick and membership change.
+    """
+
+    def __init__(self, current_time: datetime = None, seed: int = None):
+        self.current_time = current_time or datetime.now(timezone.utc)
+        self.noise = FleetNoise(seed)   # per-satellite, per-subsystem streams keyed by row ID
+        self.version = next_state_version()
+        self.ids = []
+        self.index = {}
+        self.tle_managers = []
+        self.position = np.empty((0, 3))
+        self.velocity = np.empty((0, 3))
+        self.columns = {name: np.empty(0, dtype=_column_dtype(name)) for name in _row_defaults()}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ====================================================
+    # MEMBERSHIP
+    # ====================================================
+
+    def add(self, key, position, velocity, tle_manager=None) -> "SatelliteView":
+        """Append a satellite (or reset the existing row for key) with config defaults."""
+        if key in self.index:
+            self.remove(key)
+        defaults = _row_defaults()
+        self.position = np.vstack((self.position, np.asarray(position, dtype=float)))
+        self.velocity = np.vstack((self.velocity, np.asarray(velocity, dtype=float)))
+        for name, value in defaults.items():
+            column = self.columns[name]
+            self.columns[name] = np.append(column, np.array([value], dtype=column.dtype))
+        self.index[key] = len(self.ids)
+        self.ids.append(key)
+        self.noise.add(key)
+        self.tle_managers.append(tle_manager)
+        self.version = next_state_version()
+        return SatelliteView(self, key)
+
+    def remove(self, key) -> bool:
+        row = self.index.pop(key, None)
+        if row is None:
+            return False
+        self.position = np.delete(self.position, row, axis=0)
+        self.velocity = np.delete(self.velocity, row, axis=0)
+        for name, column in self.columns.items():
+            self.columns[name] = np.delete(column, row)
+        del self.ids[row]
+        del self.tle_managers[row]
+        self.noise.remove(row)
+        self.index = {k: i for i, k in enumerate(self.ids)}
+        self.version = next_state_version()
+        return True
+
+    def clear(self):
+        self.__init__(self.current_time, self.noise.seed)
+
+    def view(self, key):
+        return SatelliteView(self, key) if key in self.index else None
+
+    # ====================================================
+    # BATCHED TICK
+    # ====================================================
+
+    def apply_orbit_states(self, position, velocity, lat, lon, in_eclipse,
+                           dt_seconds: float = 1.0, rows=None):
+        """
+        Vectorized MissionState.apply_orbit_state: advance the shared clock and
+        write externally propagated states (optionally only for `rows`), then
+        run the batched subsystem updates on the same rows.
+        """
+        self.current_time += timedelta(seconds=dt_seconds)
+        self.version = next_state_version()
+        rows = slice(None) if rows is None else rows
+        c = self.columns
+        self.position[rows] = position
+        self.velocity[rows] = velocity
+        c["latitude"][rows] = lat
+        c["longitude"][rows] = lon
+        c["altitude_km"][rows] = np.linalg.norm(self.position[rows], axis=1) - EARTH_RADIUS_KM
+        c["in_eclipse"][rows] = in_eclipse
+
+        self._update_power(dt_seconds, rows)
+        self._update_thermal(dt_seconds, rows)
+        self._update_comms(rows, self.noise.comms.take(rows, 1)[:, 0])
+        self._update_attitude(rows)
+
+    def _update_power(self, dt: float, rows):
+        c = self.columns
+        eclipse = c["in_eclipse"][rows]
+        base_load = c["base_load_w"][rows]
+        u = self.noise.power.take(rows, NOISE_WIDTH["power"])
+
+        c["solar_panel_current"][rows] = np.where(eclipse, 0.0, 1.5 + 0.2 * scale_uniform(u[:, 0], -1, 1))
+        net_power = np.where(eclipse, -base_load, c["solar_array_output_w"][rows] - base_load)
+        c["current_battery_wh"][rows] = np.clip(c["current_battery_wh"][rows] + net_power * (dt / 3600.0),
+                                                0, c["battery_capacity_wh"][rows])
+        bus_voltage = 12.0 + scale_uniform(u[:, 1], -0.3, 0.3)
+        c["bus_voltage"][rows] = bus_voltage
+        c["current_draw"][rows] = base_load / np.maximum(bus_voltage, 1.0)
+
+    def _update_thermal(self, dt: float, rows):
+        c = self.columns
+        eclipse = c["in_eclipse"][rows]
+        scale = dt / 60.0
+        u = self.noise.thermal.take(rows, NOISE_WIDTH["thermal"])
+
+        drift = np.where(eclipse, scale_uniform(u[:, 0], -0.5, 0.0), scale_uniform(u[:, 0], -0.2, 0.5))
+        temp = c["component_temp"][rows] + drift * scale
+        heater = c["heater_active"][rows]
+        heater = np.where(eclipse, heater | (temp < -20), heater & ~(temp > 10))
+        c["heater_active"][rows] = heater
+        c["component_temp"][rows] = np.clip(temp, -50, 100)
+        c["battery_temp"][rows] = np.clip(c["battery_temp"][rows] + scale_uniform(u[:, 1], -0.1, 0.1) * scale,
+                                          -10, 55)
+
+    def _update_comms(self, rows, u):
+        """u: the step's SNR samples (drawn by the tick, reused by update_contacts)."""
+        c = self.columns
+        contact = c["in_contact"][rows]
+
+        snr = 8.0 + (c["contact_elevation_deg"][rows] / 90.0) * 12.0 + scale_uniform(u, -0.5, 0.5)
+        nominal = snr >= 12
+        c["snr_db"][rows] = np.where(contact, snr, 0.0)
+        c["link_code"][rows] = np.where(contact, np.where(nominal, LINK_NOMINAL, LINK_DEGRADED),
+                                        LINK_NO_CONTACT)
+        c["data_rate_kbps"][rows] = np.where(contact, np.where(nominal, 256.0, 64.0), 0.0)
+
+    def _update_attitude(self, rows):
+        c = self.columns
+        u = self.noise.attitude.take(rows, NOISE_WIDTH["attitude"])
+        c["pointing_error"][rows] = np.maximum(0.0, 0.1 + 0.05 * scale_uniform(u[:, 0], -1, 1))
+        c["angular_rate"][rows] = np.maximum(0.0, 0.01 + 0.005 * scale_uniform(u[:, 1], -1, 1))
+
+    def update_contacts(self, in_contact, stations, elevations, rows=None,
+                        dt_seconds: float = 1.0) -> np.ndarray:
+        """
+        Vectorized MissionState.update_contact. stations is a sequence of
+        names (None when out of contact); dt_seconds is the step just taken,
+        added to the blackout of rows out of contact. Returns the mask of
+        rows that just acquired contact.
+        """
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        c = self.columns
+        in_contact = np.asarray(in_contact, dtype=bool)
+        stations = np.asarray(stations, dtype=object)
+
+        acquired = in_contact & ~c["in_contact"][rows]
+        c["in_contact"][rows] = in_contact
+        c["contact_station"][rows] = stations
+        c["contact_elevation_deg"][rows] = elevations
+
+        contact_rows = rows[in_contact]
+        c["last_contact_time"][contact_rows] = self.current_time
+        c["blackout_duration_sec"][rows] = np.where(in_contact, 0.0, c["blackout_duration_sec"][rows] + dt_seconds)
+        named = in_contact & (stations != None)  # noqa: E711 — elementwise on object array
+        c["nearest_station"][rows[named]] = stations[named]
+
+        self._update_comms(rows, self.noise.comms.last(rows))
+        return acquired
+
+
+def _column_property(name: str):
+    def fget(view):
+        value = view.fleet.columns[name][view.row]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def fset(view, value):
+        view.fleet.columns[name][view.row] = value
+
+    return property(fget, fset)
+
+
+class SatelliteView:
+    """
+    One fleet row behaving like a MissionState: same attribute names,
+    get_state() and update_state(), so passes, power and API code accept it.
+    """
+
+    def __init__(self, fleet: FleetState, key):
+        self.fleet = fleet
+        self.key = key
+
+    @property
+    def row(self) -> int:
+        return self.fleet.index[self.key]
+
+    @property
+    def current_time(self) -> datetime:
+        return self.fleet.current_time
+
+    @property
+    def position(self) -> np.ndarray:
+        return self.fleet.position[self.row].copy()
+
+    @position.setter
+    def position(self, value):
+        self.fleet.position[self.row] = value
+
+    @property
+    def velocity(self) -> np.ndarray:
+        return self.fleet.velocity[self.row].copy()
+
+    @velocity.setter
+    def velocity(self, value):
+        self.fleet.velocity[self.row] = value
+
+    @property
+    def tle_manager(self):
+        return self.fleet.tle_managers[self.row]
+
+    @property
+    def cache_key(self) -> tuple:
+        return ("member", self.key)
+
+    @property
+    def state_version(self) -> int:
+        return self.fleet.version
+
+    @state_version.setter
+    def state_version(self, value):
+        self.fleet.version = value
+
+    @property
+    def link_status(self) -> str:
+        return LINK_STATUS[self.fleet.columns["link_code"][self.row]]
+
+    @property
+    def current_storage_used_gb(self) -> float:
+        return self.storage_used_mb / 1024.0
+
+    @current_storage_used_gb.setter
+    def current_storage_used_gb(self, value):
+        pass  # derived from storage_used_mb
+
+    @property
+    def MAX_STORAGE_GB(self) -> float:
+        return self.storage_capacity_mb / 1024.0
+
+    latitude = _column_property("latitude")
+    longitude = _column_property("longitude")
+    altitude_km = _column_property("altitude_km")
+    battery_capacity_wh = _column_property("battery_capacity_wh")
+    current_battery_wh = _column_property("current_battery_wh")
+    bus_voltage = _column_property("bus_voltage")
+    solar_panel_current = _column_property("solar_panel_current")
+    solar_array_output_w = _column_property("solar_array_output_w")
+    base_load_w = _column_property("base_load_w")
+    current_draw = _column_property("current_draw")
+    component_temp = _column_property("component_temp")
+    battery_temp = _column_property("battery_temp")
+    heater_active = _column_property("heater_active")
+    snr_db = _column_property("snr_db")
+    data_rate_kbps = _column_property("data_rate_kbps")
+    nearest_station = _column_property("nearest_station")
+    attitude_mode = _column_property("attitude_mode")
+    pointing_error = _column_property("pointing_error")
+    angular_rate = _column_property("angular_rate")
+    storage_capacity_mb = _column_property("storage_capacity_mb")
+    storage_used_mb = _column_property("storage_used_mb")
+    in_eclipse = _column_property("in_eclipse")
+    payload_status = _column_property("payload_status")
+    in_contact = _column_property("in_contact")
+    contact_station = _column_property("contact_station")
+    contact_elevation_deg = _column_property("contact_elevation_deg")
+    blackout_duration_sec = _column_property("blackout_duration_sec")
+
+    get_state = MissionState.get_state
+    update_state = MissionState.update_state
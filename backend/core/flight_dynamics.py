@@ -7,8 +7,9 @@ coordinate transforms, eclipse model, visibility computation.
 
 import math
 import numpy as np
-from datetime import datetime, timedelta, timezone
-from backend.models.constants import MU_EARTH, EARTH_RADIUS_KM, J2_COEFF, EARTH_ROTATION_RATE, WGS84_FLATTENING, WGS84_E_SQ
+from datetime import datetime
+from backend.core.time_services import julian_date, julian_dates, gmst, sun_vector, epoch_info, epoch_seconds
+from backend.models.constants import MU_EARTH, EARTH_RADIUS_KM, J2_COEFF, EARTH_ROTATION_RATE, WGS84_E_SQ
 
 
 # ====================================================
@@ -16,78 +17,33 @@ from backend.models.constants import MU_EARTH, EARTH_RADIUS_KM, J2_COEFF, EARTH_
 # ====================================================
 
 def get_julian_date(dt: datetime) -> float:
-    """Convert UTC datetime to Julian Date."""
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-
-    year = dt.year
-    month = dt.month
-    day = dt.day
-    hour = dt.hour
-    minute = dt.minute
-    sec = dt.second + (dt.microsecond / 1e6)
-
-    UT = hour + (minute / 60) + (sec / 3600)
-    ee = math.floor((month + 9) / 12)
-
-    jd = (367 * year) \
-         - math.floor((7 * (year + ee)) / 4) \
-         + math.floor((275 * month) / 9) \
-         + day + 1721013.5 + (UT / 24)
-
-    return jd
+    """Convert UTC datetime to Julian Date (memoized in time_services)."""
+    return julian_date(dt)
 
 
 def get_gmst(dt: datetime) -> float:
     """Calculate Greenwich Mean Sidereal Time in radians (IAU formula)."""
-    JD = get_julian_date(dt)
+    return epoch_info(dt).gmst
 
-    JD_mid = math.floor(JD) + 0.5
-    days_mid = JD - JD_mid
-    UT = days_mid * 3600 * 24
 
-    t = (JD - 2451545.0) / 36525.0
-    t0 = (JD_mid - 2451545.0) / 36525.0
+def get_julian_dates(epoch: datetime, time_offsets) -> np.ndarray:
+    """Julian Dates for an array of second offsets from a UTC epoch."""
+    return julian_dates(epoch, time_offsets)
 
-    GMST1 = 24110.54841 + 8640184.812866 * t0 + 1.002737909350795 * UT + 0.093104 * t**2 - 0.0000062 * t**3
 
-    GMST0 = math.fmod(GMST1, 86400.0)
-    if GMST0 < 0:
-        GMST0 += 86400.0
-
-    GMST_deg = GMST0 / 240.0
-    return np.deg2rad(GMST_deg)
+def get_gmst_array(jd) -> np.ndarray:
+    """Vectorized get_gmst over an array of Julian Dates. Returns radians."""
+    return gmst(jd)
 
 
 def get_sun_position(dt: datetime) -> np.ndarray:
     """Compute approximate sun position vector in ECI frame (km)."""
-    JD = get_julian_date(dt)
-    T = (JD - 2451545.0) / 36525.0
-
-    # Mean longitude and anomaly of the Sun
-    L0 = 280.46646 + 36000.76983 * T  # degrees
-    M = 357.52911 + 35999.05029 * T   # degrees
-    M_rad = np.radians(M % 360)
+    return epoch_info(dt).sun
 
-    # Equation of center
-    C = (1.914602 - 0.004817 * T) * np.sin(M_rad) + \
-        0.019993 * np.sin(2 * M_rad)
 
-    # Sun's true longitude and obliquity
-    sun_lon = np.radians((L0 + C) % 360)
-    obliquity = np.radians(23.439 - 0.0000004 * T)
-
-    # Distance in AU, convert to km
-    AU_KM = 149597870.7
-    r_au = 1.00014 - 0.01671 * np.cos(M_rad) - 0.00014 * np.cos(2 * M_rad)
-    r_km = r_au * AU_KM
-
-    # ECI coordinates
-    x = r_km * np.cos(sun_lon)
-    y = r_km * np.sin(sun_lon) * np.cos(obliquity)
-    z = r_km * np.sin(sun_lon) * np.sin(obliquity)
-
-    return np.array([x, y, z])
+def get_sun_positions(jd) -> np.ndarray:
+    """Vectorized get_sun_position over Julian Dates. Returns (N,3) km."""
+    return sun_vector(jd)
 
 
 # ====================================================
@@ -96,44 +52,76 @@ def get_sun_position(dt: datetime) -> np.ndarray:
 
 def eci_to_ecef(r_eci: list, dt: datetime) -> np.ndarray:
     """Rotate ECI vector to ECEF frame using GMST Z-axis rotation."""
-    theta = get_gmst(dt)
-    c, s = np.cos(theta), np.sin(theta)
-    R_z = np.array([
-        [ c, s, 0],
-        [-s, c, 0],
-        [ 0, 0, 1]
-    ])
-    return np.dot(R_z, np.array(r_eci))
+    theta = epoch_info(dt).gmst
+    c, s = math.cos(theta), math.sin(theta)
+    x, y, z = r_eci
+    return np.array([c * x + s * y, -s * x + c * y, z], dtype=float)
 
 
 def ecef_to_lla(r_ecef: np.ndarray) -> dict:
-    """Convert ECEF [x,y,z] km to geodetic LLA (iterative WGS84 method)."""
-    x, y, z = r_ecef
+    """Convert ECEF [x,y,z] km to geodetic LLA (WGS84)."""
+    lat, lon, alt = ecef_to_lla_batch(r_ecef)[0]
+    return {
+        "lat": float(lat),
+        "lon": float(lon),
+        "alt_km": float(alt)
+    }
+
+
+def eci_to_ecef_batch(r_eci: np.ndarray, jd) -> np.ndarray:
+    """
+    Rotate an (N,3) array of ECI vectors to ECEF in one pass.
+    jd is a Julian Date (scalar or length-N array) per row.
+    """
+    r = np.asarray(r_eci, dtype=float).reshape(-1, 3)
+    theta = gmst(jd)
+    c, s = np.cos(theta), np.sin(theta)
+
+    r_ecef = np.empty_like(r)
+    r_ecef[:, 0] = c * r[:, 0] + s * r[:, 1]
+    r_ecef[:, 1] = -s * r[:, 0] + c * r[:, 1]
+    r_ecef[:, 2] = r[:, 2]
+    return r_ecef
+
+
+def eci_to_ecef_state_batch(states: np.ndarray, jd) -> tuple:
+    """
+    Rotate (N,6) ECI states to ECEF positions and Earth-fixed velocities
+    (v_ecef = R v_eci − ω × r_ecef). Returns ((N,3) r_ecef, (N,3) v_ecef).
+    """
+    states = np.asarray(states, dtype=float).reshape(-1, 6)
+    r_ecef = eci_to_ecef_batch(states[:, :3], jd)
+    v_ecef = eci_to_ecef_batch(states[:, 3:], jd)
+    v_ecef[:, 0] += EARTH_ROTATION_RATE * r_ecef[:, 1]
+    v_ecef[:, 1] -= EARTH_ROTATION_RATE * r_ecef[:, 0]
+    return r_ecef, v_ecef
+
+
+def ecef_to_lla_batch(r_ecef: np.ndarray, iterations: int = 4) -> np.ndarray:
+    """
+    Convert an (N,3) ECEF array (km) to (N,3) [lat_deg, lon_deg, alt_km].
+    Fixed-iteration WGS84 solver — converges well below 1e-9 rad for LEO
+    within 4 iterations, so no per-point convergence test is needed.
+    """
+    r = np.asarray(r_ecef, dtype=float).reshape(-1, 3)
+    x, y, z = r[:, 0], r[:, 1], r[:, 2]
     a = EARTH_RADIUS_KM
-    f = WGS84_FLATTENING
     e_sq = WGS84_E_SQ
-    tol = 1e-6
 
-    r_delta = np.sqrt(x**2 + y**2)
+    r_delta = np.hypot(x, y)
     lon = np.arctan2(y, x)
     lat = np.arctan2(z, r_delta)
 
-    for _ in range(20):
-        N = a / np.sqrt(1 - e_sq * np.sin(lat)**2)
-        lat_new = np.arctan2(z + e_sq * N * np.sin(lat), r_delta)
-        if abs(lat_new - lat) < tol:
-            lat = lat_new
-            break
-        lat = lat_new
+    for _ in range(iterations):
+        sin_lat = np.sin(lat)
+        N = a / np.sqrt(1 - e_sq * sin_lat**2)
+        lat = np.arctan2(z + e_sq * N * sin_lat, r_delta)
 
-    N = a / np.sqrt(1 - e_sq * np.sin(lat)**2)
-    alt = (r_delta / np.cos(lat)) - N if abs(np.cos(lat)) > 1e-10 else abs(z) / abs(np.sin(lat)) - N * (1 - e_sq)
+    # Height form valid at all latitudes (no pole special case)
+    sin_lat = np.sin(lat)
+    alt = r_delta * np.cos(lat) + z * sin_lat - a * np.sqrt(1 - e_sq * sin_lat**2)
 
-    return {
-        "lat": np.degrees(lat),
-        "lon": np.degrees(lon),
-        "alt_km": alt
-    }
+    return np.column_stack((np.degrees(lat), np.degrees(lon), alt))
 
 
 def lla_to_ecef(lat_deg: float, lon_deg: float, alt_km: float = 0.0) -> np.ndarray:
@@ -156,9 +144,13 @@ def lla_to_ecef(lat_deg: float, lon_deg: float, alt_km: float = 0.0) -> np.ndarr
 # ====================================================
 
 def get_j2_acceleration(position: np.ndarray) -> np.ndarray:
-    """Compute acceleration from point mass gravity + J2 perturbation."""
-    x, y, z = position
-    r = np.linalg.norm(position)
+    """
+    Compute acceleration from point mass gravity + J2 perturbation.
+    Accepts a single [x, y, z] or an (N,3) array of positions.
+    """
+    position = np.asarray(position, dtype=float)
+    x, y, z = position[..., 0], position[..., 1], position[..., 2]
+    r = np.linalg.norm(position, axis=-1)
     r_sq = r**2
     r_cb = r**3
     z_sq = z**2
@@ -172,7 +164,7 @@ def get_j2_acceleration(position: np.ndarray) -> np.ndarray:
     ay = -mu_r3 * y * (1.0 + factor * tx_ty)
     az = -mu_r3 * z * (1.0 + factor * tz)
 
-    return np.array([ax, ay, az])
+    return np.stack((ax, ay, az), axis=-1)
 
 
 def rk4_step(state: np.ndarray, dt: float) -> np.ndarray:
@@ -204,26 +196,230 @@ def rk4_step(state: np.ndarray, dt: float) -> np.ndarray:
     return np.concatenate((new_pos, new_vel))
 
 
-def propagate_orbit(initial_state: dict, duration_seconds: float, step_size: float = 60.0) -> list:
+# Dormand–Prince 5(4) tableau with the continuous extension used for dense output
+_DP_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0])
+_DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+]
+_DP_B = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+_DP_E = np.array([-71 / 57600, 0.0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40])
+_DP_P = np.array([
+    [1.0, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+    [0.0, 0.0, 0.0, 0.0],
+    [0.0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+    [0.0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+    [0.0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+    [0.0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+    [0.0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+])
+
+
+def _state_derivative(state: np.ndarray) -> np.ndarray:
+    return np.concatenate((state[3:], get_j2_acceleration(state[:3])))
+
+
+def dopri5_step(state: np.ndarray, dt: float, f0: np.ndarray = None) -> tuple:
+    """
+    One Dormand–Prince 5(4) step. f0 is the derivative at state (FSAL reuse).
+    Returns (new_state, error_estimate, stages) where stages is the (7, 6)
+    array of derivatives needed for dense output.
+    """
+    K = np.empty((7, 6))
+    K[0] = _state_derivative(state) if f0 is None else f0
+    for i in range(1, 6):
+        K[i] = _state_derivative(state + dt * np.dot(_DP_A[i], K[:i]))
+
+    new_state = state + dt * np.dot(_DP_B, K[:6])
+    K[6] = _state_derivative(new_state)
+    error = dt * np.dot(_DP_E, K)
+    return new_state, error, K
+
+
+def propagate_adaptive(initial_state: dict, duration_seconds: float, t_eval=None,
+                       rtol: float = 1e-9, atol: float = 1e-9, max_step: float = 600.0,
+                       first_step: float = 10.0) -> tuple:
+    """
+    Error-controlled HPOP (J2 + Dormand–Prince 5(4)) with dense output.
+    Steps as large as the tolerance allows; states at the requested epochs
+    (t_eval, seconds from start — default every 60 s) come from the 4th-order
+    continuous extension, so sampling does not constrain the step size.
+    Returns (t_eval, (M,6) states).
     """
-    Propagate orbit using HPOP (J2 + RK4) for given duration.
-    Returns list of {time_offset, eci_state} dicts.
+    state = np.concatenate((np.array(initial_state['position'], dtype=float),
+                            np.array(initial_state['velocity'], dtype=float)))
+    if t_eval is None:
+        t_eval = np.arange(0, duration_seconds, 60.0)
+    t_eval = np.asarray(t_eval, dtype=float)
+    out = np.empty((len(t_eval), 6))
+
+    t = 0.0
+    h = min(first_step, max_step)
+    f0 = _state_derivative(state)
+    j = 0
+    while j < len(t_eval) and t_eval[j] <= 0.0:
+        out[j] = state
+        j += 1
+
+    t_end = max(duration_seconds, t_eval[-1] if len(t_eval) else 0.0)
+    while t < t_end and j < len(t_eval):
+        h = min(h, t_end - t)
+        new_state, error, K = dopri5_step(state, h, f0)
+
+        scale = atol + rtol * np.maximum(np.abs(state), np.abs(new_state))
+        err_norm = np.sqrt(np.mean((error / scale) ** 2))
+
+        if err_norm <= 1.0:
+            t_new = t + h
+            # Dense output for every requested epoch inside (t, t_new]
+            k = int(np.searchsorted(t_eval, t_new, side="right"))
+            if k > j:
+                x = (t_eval[j:k] - t) / h
+                powers = np.stack((x, x**2, x**3, x**4), axis=1)
+                out[j:k] = state + h * powers @ (K.T @ _DP_P).T
+                j = k
+            t, state, f0 = t_new, new_state, K[6]
+
+        factor = 10.0 if err_norm == 0 else 0.9 * err_norm ** -0.2
+        h = min(max_step, h * min(10.0, max(0.2, factor)))
+
+    return t_eval, out
+
+
+def propagate_orbit(initial_state: dict, duration_seconds: float, step_size: float = 60.0,
+                    as_ephemeris: bool = False, method: str = "rk4",
+                    rtol: float = 1e-9, atol: float = 1e-9):
+    """
+    Propagate orbit using HPOP (J2) for given duration.
+    method="rk4" integrates with a fixed step of step_size; method="dopri5"
+    integrates adaptively to rtol/atol and samples every step_size via dense output;
+    method="j2_secular" evaluates the analytic mean-element model (fast, approximate).
+    Returns list of {time_offset, eci_state} dicts, or with as_ephemeris=True
+    a compact Ephemeris (Hermite segments of step_size) that can be sampled
+    at any resolution without re-integrating.
     """
     r = np.array(initial_state['position'], dtype=float)
     v = np.array(initial_state['velocity'], dtype=float)
     state_vec = np.concatenate((r, v))
 
     times = np.arange(0, duration_seconds, step_size)
-    results = []
+    # Ephemeris output needs one extra node so the last segment reaches past duration_seconds
+    n_nodes = max(len(times), 1) + 1 if as_ephemeris else len(times)
+
+    if method == "dopri5":
+        _, states = propagate_adaptive(initial_state, duration_seconds,
+                                       t_eval=np.arange(n_nodes) * step_size, rtol=rtol, atol=atol)
+    elif method == "j2_secular":
+        states = propagate_j2_secular(initial_state, np.arange(n_nodes) * step_size)
+    elif method == "rk4":
+        states = np.empty((n_nodes, 6))
+        for i in range(n_nodes):
+            states[i] = state_vec
+            state_vec = rk4_step(state_vec, step_size)
+    else:
+        raise ValueError(f"Unknown propagation method: {method}")
 
-    for t in times:
-        results.append({
-            "time_offset": t,
-            "eci_state": state_vec.copy()
-        })
-        state_vec = rk4_step(state_vec, step_size)
+    if as_ephemeris:
+        from backend.core.ephemeris import Ephemeris
+        return Ephemeris.from_states(initial_state.get("epoch"), step_size, states)
 
-    return results
+    return [{"time_offset": t, "eci_state": state} for t, state in zip(times, states)]
+
+
+# ====================================================
+# ORBIT PROPAGATION — ANALYTIC J2 SECULAR (fast mode)
+# ====================================================
+
+def _mean_elements(position, velocity, mu: float = MU_EARTH) -> dict:
+    """
+    Unrounded Keplerian elements (radians) for the secular propagator.
+    Same conversion as state_to_keplerian, but angles come from atan2 with
+    conventions for the singular cases: equatorial orbits use the +X axis as
+    the node line, circular orbits put periapsis on the node line.
+    The first-order short-period J2 term is removed from the semi-major axis
+    so the mean motion does not inherit the osculating oscillation.
+    """
+    r_vec = np.asarray(position, dtype=float)
+    v_vec = np.asarray(velocity, dtype=float)
+    r = np.linalg.norm(r_vec)
+    v = np.linalg.norm(v_vec)
+
+    h_vec = np.cross(r_vec, v_vec)
+    h_hat = h_vec / np.linalg.norm(h_vec)
+    e_vec = (np.cross(v_vec, h_vec) - mu * r_vec / r) / mu
+    e = np.linalg.norm(e_vec)
+    a = -mu / (2 * (0.5 * v**2 - mu / r))
+    inc = np.arccos(np.clip(h_hat[2], -1.0, 1.0))
+
+    n_vec = np.cross([0.0, 0.0, 1.0], h_vec)
+    raan = np.arctan2(n_vec[1], n_vec[0]) if np.linalg.norm(n_vec) > 1e-10 else 0.0
+    n_hat = np.array([np.cos(raan), np.sin(raan), 0.0])
+    m_hat = np.cross(h_hat, n_hat)
+
+    argp = np.arctan2(np.dot(e_vec, m_hat), np.dot(e_vec, n_hat)) if e > 1e-10 else 0.0
+    p_hat = np.cos(argp) * n_hat + np.sin(argp) * m_hat
+    nu = np.arctan2(np.dot(np.cross(p_hat, r_vec), h_hat), np.dot(p_hat, r_vec))
+
+    E = 2.0 * np.arctan2(np.sqrt(1 - e) * np.sin(nu / 2), np.sqrt(1 + e) * np.cos(nu / 2))
+    M = E - e * np.sin(E)
+
+    # Osculating → mean semi-major axis (Kozai first-order short-period term)
+    sin_i_sq = np.sin(inc) ** 2
+    a_r3 = (a / r) ** 3
+    da_sp = (J2_COEFF * EARTH_RADIUS_KM**2 / a) * (
+        (1.0 - 1.5 * sin_i_sq) * (a_r3 - (1 - e**2) ** -1.5)
+        + 1.5 * sin_i_sq * a_r3 * np.cos(2.0 * (argp + nu))
+    )
+
+    return {"a": a - da_sp, "e": e, "i": inc, "raan": raan, "argp": argp, "M": M}
+
+
+def propagate_j2_secular(initial_state: dict, time_offsets) -> np.ndarray:
+    """
+    Closed-form mean-element propagation with secular J2 drift of RAAN,
+    argument of perigee and mean anomaly. Evaluates any set of epochs
+    (seconds from the initial state) in one vectorized pass; no integration.
+    Approximate: short-period J2 terms are ignored (see README for accuracy).
+    Returns (M,6) ECI states.
+    """
+    el = _mean_elements(initial_state['position'], initial_state['velocity'])
+    a, e, inc = el["a"], el["e"], el["i"]
+    t = np.atleast_1d(np.asarray(time_offsets, dtype=float))
+
+    n0 = np.sqrt(MU_EARTH / a**3)
+    p = a * (1 - e**2)
+    k = 1.5 * J2_COEFF * (EARTH_RADIUS_KM / p) ** 2 * n0
+    cos_i, sin_i = np.cos(inc), np.sin(inc)
+
+    raan = el["raan"] - k * cos_i * t
+    argp = el["argp"] + k * (2.0 - 2.5 * sin_i**2) * t
+    M = el["M"] + (n0 + k * np.sqrt(1 - e**2) * (1.0 - 1.5 * sin_i**2)) * t
+
+    # Kepler's equation, fixed Newton iterations (e is small for our orbits)
+    E = M + e * np.sin(M)
+    for _ in range(6):
+        E = E - (E - e * np.sin(E) - M) / (1 - e * np.cos(E))
+    nu = 2.0 * np.arctan2(np.sqrt(1 + e) * np.sin(E / 2), np.sqrt(1 - e) * np.cos(E / 2))
+    r = a * (1 - e * np.cos(E))
+
+    # Perifocal position/velocity
+    sqrt_mu_p = np.sqrt(MU_EARTH / p)
+    r_pf = np.stack((r * np.cos(nu), r * np.sin(nu)), axis=1)
+    v_pf = np.stack((-sqrt_mu_p * np.sin(nu), sqrt_mu_p * (e + np.cos(nu))), axis=1)
+
+    # Perifocal → ECI: columns P and Q of R3(-Ω)·R1(-i)·R3(-ω)
+    cO, sO = np.cos(raan), np.sin(raan)
+    cw, sw = np.cos(argp), np.sin(argp)
+    P = np.stack((cO * cw - sO * sw * cos_i, sO * cw + cO * sw * cos_i, sw * sin_i * np.ones_like(t)), axis=1)
+    Q = np.stack((-cO * sw - sO * cw * cos_i, -sO * sw + cO * cw * cos_i, cw * sin_i * np.ones_like(t)), axis=1)
+
+    pos = r_pf[:, :1] * P + r_pf[:, 1:] * Q
+    vel = v_pf[:, :1] * P + v_pf[:, 1:] * Q
+    return np.concatenate((pos, vel), axis=1)
 
 
 # ====================================================
@@ -302,6 +498,225 @@ def is_visible(sat_ecef: np.ndarray, station_lat: float, station_lon: float,
     return elevation >= min_elevation_deg, elevation
 
 
+def station_geometry(lat_deg, lon_deg, alt_km) -> tuple:
+    """
+    Precompute ground station ECEF positions and local up unit vectors.
+    Accepts scalars or length-S arrays. Returns ((S,3) ecef, (S,3) up).
+    """
+    ecef = np.atleast_2d(lla_to_ecef(np.asarray(lat_deg, dtype=float),
+                                     np.asarray(lon_deg, dtype=float),
+                                     np.asarray(alt_km, dtype=float)).T)
+    up = ecef / np.linalg.norm(ecef, axis=1)[:, None]
+    return ecef, up
+
+
+def station_enu(station_ecef: np.ndarray, station_up: np.ndarray) -> np.ndarray:
+    """
+    ECEF -> local East/North/Up rotations for S stations, consistent with the
+    up vectors from station_geometry(). Returns (S,3,3); row order E, N, U, so
+    enu[s] @ r_vec gives station s's topocentric components.
+    """
+    lon = np.arctan2(station_ecef[:, 1], station_ecef[:, 0])
+    east = np.column_stack((-np.sin(lon), np.cos(lon), np.zeros_like(lon)))
+    north = np.cross(station_up, east)
+    return np.stack((east, north, station_up), axis=1)
+
+
+def compute_elevation_matrix(sat_ecef: np.ndarray, station_ecef: np.ndarray,
+                             station_up: np.ndarray) -> np.ndarray:
+    """
+    Elevation (deg) of N satellite ECEF positions seen from S stations.
+    Returns an (S, N) matrix, built from two matrix products so no (S, N, 3)
+    intermediate is allocated.
+    """
+    sat = np.asarray(sat_ecef, dtype=float).reshape(-1, 3)
+
+    # r_vec · up = sat · up − station · up
+    up_dot = station_up @ sat.T - np.einsum("ij,ij->i", station_ecef, station_up)[:, None]
+
+    # |r_vec|² = |sat|² − 2 sat · station + |station|²
+    range_sq = (np.einsum("ij,ij->i", sat, sat)[None, :]
+                - 2.0 * (station_ecef @ sat.T)
+                + np.einsum("ij,ij->i", station_ecef, station_ecef)[:, None])
+    range_km = np.sqrt(np.maximum(range_sq, 0.0))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sin_el = np.where(range_km < 1e-6, 1.0, up_dot / range_km)
+    return np.degrees(np.arcsin(np.clip(sin_el, -1.0, 1.0)))
+
+
+def compute_azimuth(sat_ecef: np.ndarray, station_ecef: np.ndarray,
+                    station_enu: np.ndarray) -> np.ndarray:
+    """
+    Azimuth (deg, from north through east, in [0, 360)) for P paired
+    satellite/station rows: (P,3) positions, (P,3) stations, (P,3,3) ENU
+    rotations from station_enu(). Pairs let callers evaluate only the
+    samples that need it (e.g. those above a station's elevation floor).
+    """
+    los = np.asarray(sat_ecef, dtype=float).reshape(-1, 3) - station_ecef
+    east = np.einsum("pj,pj->p", station_enu[:, 0], los)
+    north = np.einsum("pj,pj->p", station_enu[:, 1], los)
+    return np.degrees(np.arctan2(east, north)) % 360.0
+
+
+def compute_look_angles(sat_ecef: np.ndarray, sat_vel_ecef: np.ndarray,
+                        station_ecef: np.ndarray, station_enu: np.ndarray) -> tuple:
+    """
+    Full look-angle track of N satellite ECEF states from one station, from
+    a single ENU transform of the line of sight and its rate. Returns
+    (azimuth_deg, elevation_deg, range_km, range_rate_km_s), each (N,);
+    range rate is positive when the satellite recedes.
+    """
+    los = np.asarray(sat_ecef, dtype=float).reshape(-1, 3) - station_ecef
+    local = los @ station_enu.T
+    local_rate = np.asarray(sat_vel_ecef, dtype=float).reshape(-1, 3) @ station_enu.T
+    east, north, up = local[:, 0], local[:, 1], local[:, 2]
+
+    range_km = np.linalg.norm(local, axis=1)
+    azimuth = np.degrees(np.arctan2(east, north)) % 360.0
+    elevation = np.degrees(np.arctan2(up, np.hypot(east, north)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        range_rate = np.where(range_km > 1e-6, np.einsum("ij,ij->i", local, local_rate) / range_km, 0.0)
+    return azimuth, elevation, range_km, range_rate
+
+
+def horizon_mask_at(azimuth_deg: np.ndarray, mask_azimuth: np.ndarray, mask_table: np.ndarray,
+                    rows: np.ndarray) -> np.ndarray:
+    """
+    Linearly interpolate horizon masks at azimuth_deg, using mask_table row
+    rows (broadcast against the azimuths). All masks are sampled on one
+    shared ascending azimuth grid spanning 0..360 deg (mask_table is (M, K)
+    over mask_azimuth (K,)), so the lookup is one searchsorted and one
+    gather with no per-station loop.
+    """
+    az = np.asarray(azimuth_deg, dtype=float)
+    i0 = np.clip(np.searchsorted(mask_azimuth, az, side="right") - 1, 0, len(mask_azimuth) - 2)
+    frac = (az - mask_azimuth[i0]) / (mask_azimuth[i0 + 1] - mask_azimuth[i0])
+    lo = mask_table[rows, i0]
+    hi = mask_table[rows, i0 + 1]
+    return lo + frac * (hi - lo)
+
+
+def visibility_edges(visible: np.ndarray) -> tuple:
+    """
+    Find contiguous visible runs along the last axis of an (S, N) bool matrix.
+    Returns (row, start_idx, end_idx) arrays; end_idx is the first sample
+    after the run (N when the run is still open at the end).
+    """
+    vis = np.atleast_2d(visible).astype(np.int8)
+    padded = np.pad(vis, ((0, 0), (1, 1)))
+    delta = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(delta == 1)
+    _, ends = np.nonzero(delta == -1)
+    return rows, starts, ends
+
+
+# ====================================================
+# EVENT REFINEMENT (root finding)
+# ====================================================
+
+def brent_root(f, a: float, b: float, fa: float = None, fb: float = None,
+               xtol: float = 1e-2, max_iter: int = 60) -> float:
+    """
+    Brent's method for a root of f bracketed by [a, b].
+    fa/fb may be passed when already known (saves two evaluations).
+    """
+    fa = f(a) if fa is None else fa
+    fb = f(b) if fb is None else fb
+    if fa == 0:
+        return a
+    if fb == 0:
+        return b
+    if fa * fb > 0:
+        raise ValueError("brent_root: root not bracketed")
+
+    eps = np.finfo(float).eps
+    c, fc = a, fa
+    d = e = b - a
+
+    for _ in range(max_iter):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tol = 2.0 * eps * abs(b) + 0.5 * xtol
+        m = 0.5 * (c - b)
+        if abs(m) <= tol or fb == 0:
+            return b
+
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            # Inverse quadratic interpolation (secant when only two points)
+            s = fb / fa
+            if a == c:
+                p = 2.0 * m * s
+                q = 1.0 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2.0 * m * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0:
+                q = -q
+            else:
+                p = -p
+            if 2.0 * p < min(3.0 * m * q - abs(tol * q), abs(e * q)):
+                e = d
+                d = p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = f(b)
+
+    return b
+
+
+def golden_section_max(f, a: float, b: float, xtol: float = 1e-2, max_iter: int = 100) -> tuple:
+    """Golden-section search for the maximum of a unimodal f on [a, b]. Returns (x, f(x))."""
+    inv_phi = (np.sqrt(5.0) - 1.0) / 2.0
+    c = b - inv_phi * (b - a)
+    d = a + inv_phi * (b - a)
+    fc, fd = f(c), f(d)
+
+    for _ in range(max_iter):
+        if abs(b - a) <= xtol:
+            break
+        if fc > fd:
+            b, d, fd = d, c, fc
+            c = b - inv_phi * (b - a)
+            fc = f(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + inv_phi * (b - a)
+            fd = f(d)
+
+    x = 0.5 * (a + b)
+    return x, f(x)
+
+
+def make_elevation_function(position_at, epoch_jd: float,
+                            station_ecef: np.ndarray, station_up: np.ndarray):
+    """
+    Continuous elevation(t) for one station.
+    position_at(t) returns the ECI position at t seconds past the epoch —
+    typically Ephemeris.state_at, so refinement never re-integrates.
+    """
+    station_ecef = np.atleast_2d(station_ecef)
+    station_up = np.atleast_2d(station_up)
+
+    def elevation(t: float) -> float:
+        r_ecef = eci_to_ecef_batch(position_at(t)[:3], epoch_jd + t / 86400.0)
+        return float(compute_elevation_matrix(r_ecef, station_ecef, station_up)[0, 0])
+
+    return elevation
+
+
 # ====================================================
 # ORBITAL ELEMENTS
 # ====================================================
@@ -367,41 +782,53 @@ def state_to_keplerian(position: list, velocity: list, mu: float = MU_EARTH) ->
 # FEASIBILITY CHECK (for mission planner)
 # ====================================================
 
-def check_feasibility(request, mission_state) -> dict:
+def check_feasibility(request, mission_state, refine: bool = False, method: str = None,
+                      min_elevation_deg: float = 5.0) -> dict:
     """
     Propagate orbit and check geometric visibility for a target.
-    Returns {is_feasible: bool, windows: [(start, end), ...]}.
+    With refine=True, window edges are root-found to sub-second accuracy
+    instead of snapping to the 60 s propagation grid.
+    method="j2_secular" screens against the analytic model instead of the
+    cached high-fidelity ephemeris (see get_ephemeris).
+    Returns {is_feasible: bool, windows: [(start, end), ...]} with window
+    bounds as float64 epoch seconds (see time_services).
     """
     sim_start = request.window_start
     sim_end = request.window_end
     duration_sec = (sim_end - sim_start).total_seconds()
 
-    initial_state = {
-        "position": mission_state.position.tolist() if hasattr(mission_state.position, 'tolist') else list(mission_state.position),
-        "velocity": mission_state.velocity.tolist() if hasattr(mission_state.velocity, 'tolist') else list(mission_state.velocity),
-        "epoch": mission_state.current_time,
-    }
+    from backend.core.ephemeris import get_ephemeris
+    ephemeris = get_ephemeris(mission_state, duration_sec, method=method)
+    time_offsets, states = ephemeris.sample(60.0, duration_sec)
+
+    # Whole trajectory ECI → ECEF in one vectorized pass
+    r_ecef = eci_to_ecef_batch(states[:, :3], get_julian_dates(sim_start, time_offsets))
+
+    target_ecef, target_up = station_geometry(request.target_lat, request.target_lon, 0.0)
+    elevation = compute_elevation_matrix(r_ecef, target_ecef, target_up)
+    _, starts, ends = visibility_edges(elevation >= min_elevation_deg)
+
+    # Windows still open at the end of the trajectory are not reported
+    bounds = [(i0, i1) for i0, i1 in zip(starts, ends) if i1 < len(time_offsets)]
+
+    if refine and bounds:
+        elev_fn = make_elevation_function(ephemeris.state_at, get_julian_date(sim_start),
+                                          target_ecef, target_up)
+        margin = elevation[0] - min_elevation_deg
 
-    trajectory = propagate_orbit(initial_state, duration_sec, step_size=60.0)
+        def crossing(i):
+            return brent_root(lambda t: elev_fn(t) - min_elevation_deg,
+                              time_offsets[i - 1], time_offsets[i], margin[i - 1], margin[i])
 
+    epoch_sec = epoch_seconds(sim_start)
     access_windows = []
-    in_view = False
-    window_start = None
-
-    for step in trajectory:
-        t_offset = step["time_offset"]
-        current_dt = sim_start + timedelta(seconds=t_offset)
-        r_eci = step["eci_state"][:3]
-        r_ecef = eci_to_ecef(r_eci, current_dt)
-
-        visible, elev = is_visible(r_ecef, request.target_lat, request.target_lon)
-
-        if visible and not in_view:
-            in_view = True
-            window_start = current_dt
-        elif not visible and in_view:
-            in_view = False
-            access_windows.append((window_start, current_dt))
+    for i0, i1 in bounds:
+        t0, t1 = time_offsets[i0], time_offsets[i1]
+        if refine:
+            if i0 > 0:
+                t0 = crossing(i0)
+            t1 = crossing(i1)
+        access_windows.append((epoch_sec + float(t0), epoch_sec + float(t1)))
 
     return {
         "is_feasible": len(access_windows) > 0,
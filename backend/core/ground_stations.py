@@ -3,9 +3,16 @@ DISHA Beta — Ground Station Module
 8 pre-configured ISRO ISTRAC stations + pass prediction.
 """
 
-from datetime import timedelta
+import json
 import numpy as np
-from backend.core.flight_dynamics import propagate_orbit, eci_to_ecef, is_visible
+from threading import Lock
+from backend.core.flight_dynamics import (
+    eci_to_ecef, eci_to_ecef_batch, eci_to_ecef_state_batch, station_geometry, station_enu,
+    compute_elevation_matrix, compute_azimuth, compute_look_angles, horizon_mask_at,
+    visibility_edges, get_julian_date, make_elevation_function, brent_root, golden_section_max,
+)
+from backend.core.ephemeris import get_ephemeris
+from backend.core.time_services import epoch_seconds, isoformat_array
 from backend.models.config import get_config
 
 
@@ -63,36 +70,283 @@ STATION_PRESETS = {
 
 DEFAULT_GROUND_STATIONS = STATION_PRESETS["ISRO"]
 
-# Runtime active stations (mutable — changed via API)
-_active_stations = list(DEFAULT_GROUND_STATIONS)
-_active_network = "ISRO"
+# A pass is identified by station and AOS; predictions of the same pass from
+# different runs agree far better than this, consecutive passes are ~1 orbit apart
+PASS_MATCH_TOLERANCE_SEC = 60.0
+
+
+# ====================================================
+# STATION REGISTRY
+# ====================================================
+
+class StationNetwork:
+    """
+    Immutable snapshot of a station set with its geometry in contiguous
+    arrays, row s describing stations[s]: ECEF position (S,3), local up
+    vector (S,3), ECEF->ENU rotation (S,3,3) and elevation mask (S,).
+    version is the registry version it was built from.
+
+    Stations with a horizon_mask also get a row in horizon_table: the mask
+    sampled on horizon_azimuth, the union of every mask's breakpoints, so
+    linear interpolation on the shared grid reproduces each mask exactly.
+    The scalar minimum elevation still applies as a floor, so azimuth is
+    only evaluated for masked stations at samples already above it.
+    """
+
+    def __init__(self, stations: list, version: int = None):
+        self.stations = list(stations)
+        self.version = version
+        self.names = [s["name"] for s in self.stations]
+        self.ecef, self.up = station_geometry(
+            [s["lat"] for s in self.stations],
+            [s["lon"] for s in self.stations],
+            [s.get("alt_m", 0) / 1000.0 for s in self.stations],
+        )
+        self.ecef = self.ecef.reshape(-1, 3)
+        self.up = self.up.reshape(-1, 3)
+        self.enu = station_enu(self.ecef, self.up)
+        self.min_elevation_deg = np.array(
+            [s.get("min_elevation_deg", 5.0) for s in self.stations], dtype=float)
+
+        self.horizon_rows = np.array(
+            [i for i, s in enumerate(self.stations) if s.get("horizon_mask")], dtype=int)
+        masks = [np.asarray(self.stations[i]["horizon_mask"], dtype=float) for i in self.horizon_rows]
+        self.horizon_azimuth = np.unique(np.concatenate([m[:, 0] for m in masks] + [[0.0, 360.0]]))
+        self.horizon_table = np.array([
+            np.interp(self.horizon_azimuth, m[:, 0], m[:, 1], period=360.0) for m in masks
+        ]).reshape(len(masks), len(self.horizon_azimuth))
+        self._horizon_slot = np.full(len(self.stations), -1, dtype=int)
+        self._horizon_slot[self.horizon_rows] = np.arange(len(self.horizon_rows))
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def visibility(self, r_ecef: np.ndarray, rows: np.ndarray = None) -> tuple:
+        """
+        (elevation, margin) of N ECEF positions, both (S,N), optionally for
+        a subset of rows. margin is the elevation above the station's mask
+        at that azimuth (or above min_elevation_deg); visible where >= 0.
+        """
+        rows = np.arange(len(self.stations)) if rows is None else np.asarray(rows, dtype=int)
+        r_ecef = np.asarray(r_ecef, dtype=float).reshape(-1, 3)
+        elevation = compute_elevation_matrix(r_ecef, self.ecef[rows], self.up[rows])
+        margin = elevation - self.min_elevation_deg[rows][:, None]
+
+        # Below the floor nothing is visible whatever the mask says; only
+        # masked samples above it need azimuth and a mask lookup
+        slot = self._horizon_slot[rows]
+        i, n = np.nonzero((slot[:, None] >= 0) & (margin >= 0.0))
+        if len(i):
+            st = rows[i]
+            azimuth = compute_azimuth(r_ecef[n], self.ecef[st], self.enu[st])
+            mask = horizon_mask_at(azimuth, self.horizon_azimuth, self.horizon_table, slot[i])
+            margin[i, n] = np.minimum(margin[i, n], elevation[i, n] - mask)
+        return elevation, margin
+
+    def margin_function(self, position_at, epoch_jd: float, row: int):
+        """Continuous margin(t) over the mask for one station (pass refinement)."""
+        ecef, up, enu = self.ecef[row:row + 1], self.up[row:row + 1], self.enu[row:row + 1]
+        floor, slot = self.min_elevation_deg[row], self._horizon_slot[row]
+
+        def margin(t: float) -> float:
+            r_ecef = eci_to_ecef_batch(position_at(t)[:3], epoch_jd + t / 86400.0)
+            elevation = float(compute_elevation_matrix(r_ecef, ecef, up)[0, 0])
+            if slot < 0:
+                return elevation - floor
+            azimuth = compute_azimuth(r_ecef, ecef, enu)
+            mask = float(horizon_mask_at(azimuth, self.horizon_azimuth, self.horizon_table, slot)[0])
+            return elevation - max(mask, floor)
+
+        return margin
+
+    def contacts(self, r_ecef: np.ndarray, rows: np.ndarray = None) -> list:
+        """
+        Best visible station for each of N ECEF positions: above the station
+        mask (horizon mask where set) and the horizon, highest elevation wins. rows restricts the
+        search to those stations. One contact dict per position.
+        """
+        r_ecef = np.asarray(r_ecef, dtype=float).reshape(-1, 3)
+        rows = np.arange(len(self.stations)) if rows is None else np.asarray(rows, dtype=int)
+        if not len(rows):
+            return [{"in_contact": False, "station": None, "elevation_deg": 0.0}] * len(r_ecef)
+
+        elevation, margin = self.visibility(r_ecef, rows)
+        candidate = np.where((margin >= 0.0) & (elevation > 0.0), elevation, -np.inf)
+        best = candidate.argmax(axis=0)
+        best_elev = candidate[best, np.arange(len(r_ecef))]
+
+        return [
+            {"in_contact": True, "station": self.names[rows[k]], "elevation_deg": round(float(e), 2)}
+            if np.isfinite(e) else {"in_contact": False, "station": None, "elevation_deg": 0.0}
+            for k, e in zip(best, best_elev)
+        ]
+
+
+class StationRegistry:
+    """
+    Versioned active station set. Every change bumps version and drops the
+    cached StationNetwork, which is rebuilt on the next network() call —
+    reads never touch the station dicts. Writers hold a lock; readers get
+    whole snapshots, so the pass scheduler thread never sees a half-applied
+    change.
+    """
+
+    def __init__(self, stations: list, network_name: str):
+        self._lock = Lock()
+        self._stations = [_normalize_station(s) for s in stations]
+        self._network_name = network_name
+        self._network = None
+        self.version = 0
+
+    @property
+    def stations(self) -> list:
+        """Copies of the station dicts (masks included): editing them never reaches the registry."""
+        return [_copy_station(s) for s in self._stations]
+
+    @property
+    def network_name(self) -> str:
+        return self._network_name
+
+    def network(self) -> StationNetwork:
+        """Geometry for the current station set, built once per version."""
+        network = self._network
+        if network is not None:
+            return network
+        with self._lock:
+            if self._network is None:
+                self._network = StationNetwork(self._stations, self.version)
+            return self._network
+
+    def replace(self, stations: list, network_name: str):
+        stations = [_normalize_station(s) for s in stations]
+        with self._lock:
+            self._stations = stations
+            self._network_name = network_name
+            self._changed()
+
+    def add(self, station: dict):
+        station = _normalize_station(station)
+        with self._lock:
+            self._stations = self._stations + [station]
+            self._network_name = "CUSTOM"
+            self._changed()
+
+    def remove(self, name: str) -> int:
+        with self._lock:
+            kept = [s for s in self._stations if s["name"] != name]
+            removed = len(self._stations) - len(kept)
+            if removed:
+                self._stations = kept
+                self._network_name = "CUSTOM"
+                self._changed()
+            return removed
+
+    def _changed(self):
+        self._network = None
+        self.version += 1
+
+
+def _copy_station(station: dict) -> dict:
+    station = dict(station)
+    if "horizon_mask" in station:
+        station["horizon_mask"] = [list(point) for point in station["horizon_mask"]]
+    return station
+
+
+def _normalize_station(station: dict) -> dict:
+    """
+    Copy of a station dict with defaults filled in once, at registration.
+    A horizon mask given inline, as a file path, or by station name in the
+    config's "horizon_masks" is parsed here, so bad masks fail the change
+    instead of a later tick. Raises ValueError.
+    """
+    station = dict(station)
+    station.setdefault("country", "Unknown")
+    mask = station.get("horizon_mask") or get_config().get("horizon_masks", {}).get(station["name"])
+    if mask:
+        station["horizon_mask"] = load_horizon_mask(mask)
+    else:
+        station.pop("horizon_mask", None)
+    return station
+
+
+def load_horizon_mask(source) -> list:
+    """
+    Parse a horizon mask into [[azimuth_deg, elevation_deg], ...] sorted by
+    azimuth. source is a list of pairs, a dict of "azimuth_deg" and
+    "elevation_deg" lists, or a path to a JSON file holding either, or to a
+    text/CSV file of "azimuth, elevation" rows ('#' comments allowed).
+    Between points the mask is linear in azimuth and wraps at 360 deg.
+    """
+    if isinstance(source, str):
+        try:
+            with open(source, "r") as f:
+                text = f.read()
+        except OSError as e:
+            raise ValueError(f"Cannot read horizon mask file {source}: {e}")
+        if source.lower().endswith(".json"):
+            source = json.loads(text)
+        else:
+            rows = [line.split("#")[0].replace(",", " ").split() for line in text.splitlines()]
+            try:
+                source = [[float(a), float(e)] for a, e in (r for r in rows if r)]
+            except ValueError:
+                raise ValueError(f"Horizon mask file {source} must hold 'azimuth, elevation' rows")
+
+    if isinstance(source, dict):
+        source = list(zip(source.get("azimuth_deg", []), source.get("elevation_deg", [])))
+    try:
+        points = np.asarray(source, dtype=float).reshape(-1, 2)
+    except (TypeError, ValueError):
+        raise ValueError("Horizon mask must be a list of [azimuth_deg, elevation_deg] pairs")
+    if not len(points) or not np.isfinite(points).all() or (np.abs(points[:, 1]) > 90.0).any():
+        raise ValueError("Horizon mask needs at least one finite point with elevation in [-90, 90] deg")
+
+    points[:, 0] %= 360.0
+    points = points[np.argsort(points[:, 0], kind="stable")]
+    return points.round(4).tolist()
+
+
+# Runtime active stations (changed via API)
+_registry = StationRegistry(DEFAULT_GROUND_STATIONS, "ISRO")
+
+
+def get_station_registry() -> StationRegistry:
+    return _registry
+
+
+def as_station_network(stations) -> StationNetwork:
+    """Pass StationNetworks through; build one for a plain list of station dicts."""
+    return stations if isinstance(stations, StationNetwork) else StationNetwork(stations)
+
+
+def get_station_network() -> StationNetwork:
+    """Geometry of the active station set (cached until the set changes)."""
+    return _registry.network()
 
 
 def get_ground_stations() -> list:
     """Get currently active ground stations."""
-    for s in _active_stations:
-        if "country" not in s:
-            s["country"] = "Unknown"
-    return _active_stations
+    return _registry.stations
 
 
 def set_ground_stations(network: str = None, stations: list = None) -> dict:
     """Set active ground stations by preset name or custom list."""
-    global _active_stations, _active_network
-    if network and network in STATION_PRESETS:
-        _active_stations = list(STATION_PRESETS[network])
-        _active_network = network
-    elif stations:
-        _active_stations = list(stations)
-        _active_network = "CUSTOM"
-    else:
-        return {"status": "ERROR", "message": f"Unknown network: {network}"}
-    return {"status": "SUCCESS", "network": _active_network, "count": len(_active_stations)}
-
-
-def add_custom_station(name: str, lat: float, lon: float, alt_m: float = 0, min_elevation_deg: float = 5) -> dict:
-    """Add a custom ground station to the active list."""
-    global _active_network
+    try:
+        if network and network in STATION_PRESETS:
+            _registry.replace(STATION_PRESETS[network], network)
+        elif stations:
+            _registry.replace(stations, "CUSTOM")
+        else:
+            return {"status": "ERROR", "message": f"Unknown network: {network}"}
+    except (KeyError, ValueError) as e:
+        return {"status": "ERROR", "message": f"Invalid station list: {e}"}
+    return {"status": "SUCCESS", "network": _registry.network_name, "count": len(_registry.stations)}
+
+
+def add_custom_station(name: str, lat: float, lon: float, alt_m: float = 0, min_elevation_deg: float = 5,
+                       horizon_mask=None) -> dict:
+    """Add a custom ground station to the active list, optionally with a horizon mask."""
     station = {
         "name": name,
         "lat": round(lat, 4),
@@ -101,20 +355,20 @@ def add_custom_station(name: str, lat: float, lon: float, alt_m: float = 0, min_
         "min_elevation_deg": min_elevation_deg,
         "country": "Custom",
     }
-    _active_stations.append(station)
-    _active_network = "CUSTOM"
-    return {"status": "SUCCESS", "network": _active_network, "count": len(_active_stations), "added": station}
+    if horizon_mask:
+        station["horizon_mask"] = horizon_mask
+    try:
+        _registry.add(station)
+    except ValueError as e:
+        return {"status": "ERROR", "message": str(e)}
+    station = _registry.stations[-1]
+    return {"status": "SUCCESS", "network": _registry.network_name, "count": len(_registry.stations), "added": station}
 
 
 def remove_station(name: str) -> dict:
     """Remove a station by name from the active list."""
-    global _active_network
-    before = len(_active_stations)
-    _active_stations[:] = [s for s in _active_stations if s["name"] != name]
-    removed = before - len(_active_stations)
-    if removed:
-        _active_network = "CUSTOM"
-    return {"status": "SUCCESS", "removed": removed, "count": len(_active_stations)}
+    removed = _registry.remove(name)
+    return {"status": "SUCCESS", "removed": removed, "count": len(_registry.stations)}
 
 
 def get_available_networks() -> dict:
@@ -123,7 +377,12 @@ def get_available_networks() -> dict:
 
 
 def get_active_network() -> str:
-    return _active_network
+    return _registry.network_name
+
+
+def get_stations_version() -> int:
+    """Registry version — bumped on every change to the active set (cache key)."""
+    return _registry.version
 
 
 # Legacy compatibility
@@ -135,116 +394,283 @@ def check_contact_now(position_eci: list, current_time) -> dict:
     Check if satellite is in contact with any ground station RIGHT NOW.
     Returns {"in_contact": bool, "station": str|None, "elevation_deg": float}.
     """
-    stations = get_ground_stations()
-    r_ecef = eci_to_ecef(position_eci, current_time)
+    return get_station_network().contacts(eci_to_ecef(position_eci, current_time))[0]
 
-    best_station = None
-    best_elevation = 0.0
 
-    for station in stations:
-        min_elev = station.get("min_elevation_deg", 5.0)
-        station_alt_km = station.get("alt_m", 0) / 1000.0
-        visible, elevation = is_visible(
-            r_ecef, station["lat"], station["lon"],
-            min_elevation_deg=min_elev,
-            station_alt_km=station_alt_km,
-        )
-        if visible and elevation > best_elevation:
-            best_station = station["name"]
-            best_elevation = elevation
-
-    return {
-        "in_contact": best_station is not None,
-        "station": best_station,
-        "elevation_deg": round(best_elevation, 2),
-    }
+def check_contact_many(r_ecef: np.ndarray) -> list:
+    """
+    check_contact_now for many satellites at once, from their (N,3) ECEF
+    positions. One (stations × satellites) elevation matrix replaces the
+    per-satellite station loop. Returns one contact dict per satellite.
+    """
+    return get_station_network().contacts(r_ecef)
 
 
 class GroundStationPassPredictor:
     """
     Predicts ground station contact windows.
-    Steps through orbit at 10-second intervals, checks elevation for each station.
+    Samples the orbit at 10-second intervals and evaluates a full
+    (stations × timesteps) elevation matrix in one vectorized operation;
+    AOS/LOS edges are taken from array diffs of the visibility mask.
+
+    Refine mode scans on a coarser grid (coarse_step_sec) and then root-finds
+    each AOS/LOS with Brent's method and the max-elevation time (TCA) with a
+    golden-section search. Passes shorter than the coarse step can slip
+    between samples, so keep coarse_step_sec near the shortest pass of interest.
     """
 
-    def __init__(self, min_duration_sec: float = 30.0):
+    def __init__(self, min_duration_sec: float = 30.0, refine: bool = False,
+                 coarse_step_sec: float = 30.0, time_tolerance_sec: float = 0.01):
         self.min_duration_sec = min_duration_sec
+        self.refine = refine
+        self.coarse_step_sec = coarse_step_sec
+        self.time_tolerance_sec = time_tolerance_sec
 
-    def compute_passes(self, mission_state, duration_hours: float = 24.0) -> list:
+    def compute_passes(self, mission_state, duration_hours: float = 24.0, refine: bool = None,
+                       stations: list = None) -> list:
         """
         Compute pass windows for all stations over given duration.
-        Returns list of pass dicts sorted by AOS time.
+        refine overrides the predictor's default mode for this call; stations
+        defaults to the active network.
+        Returns list of pass dicts sorted by AOS time (ISO timestamps).
         """
-        stations = get_ground_stations()
+        return passes_to_dicts(self.compute_pass_table(mission_state, duration_hours, refine, stations))
 
-        initial_state = {
-            "position": mission_state.position.tolist() if hasattr(mission_state.position, 'tolist') else list(mission_state.position),
-            "velocity": mission_state.velocity.tolist() if hasattr(mission_state.velocity, 'tolist') else list(mission_state.velocity),
-            "epoch": mission_state.current_time,
-        }
+    def compute_pass_table(self, mission_state, duration_hours: float = 24.0, refine: bool = None,
+                           stations: list = None) -> dict:
+        """
+        Columnar pass prediction: NumPy arrays of AOS/LOS/TCA as float64
+        epoch seconds plus duration and max elevation, sorted by AOS.
+        "station" indexes into "stations". No datetimes are built here.
+        Pass stations explicitly when running outside the API process (the
+        active network is per-process state).
+        """
+        stations = get_station_network() if stations is None else as_station_network(stations)
+        if not stations:
+            return _empty_pass_table(stations.stations)
 
         duration_sec = duration_hours * 3600.0
-        step_size = 10.0  # 10-second intervals per spec
-        trajectory = propagate_orbit(initial_state, duration_sec, step_size=step_size)
-        sim_start = mission_state.current_time
-
-        all_passes = []
-
-        for station in stations:
-            min_elev = station.get("min_elevation_deg", 5.0)
-            station_alt_km = station.get("alt_m", 0) / 1000.0
-
-            in_view = False
-            window_start = None
-            max_elev = 0.0
-
-            for step in trajectory:
-                t_offset = step["time_offset"]
-                current_dt = sim_start + timedelta(seconds=float(t_offset))
-                r_eci = step["eci_state"][:3]
-                r_ecef = eci_to_ecef(r_eci, current_dt)
-
-                visible, elevation = is_visible(
-                    r_ecef, station["lat"], station["lon"],
-                    min_elevation_deg=min_elev,
-                    station_alt_km=station_alt_km,
+        ephemeris = get_ephemeris(mission_state, duration_sec)
+        table = self.find_passes(ephemeris, 0.0, duration_sec, stations, refine)
+        return select_passes(table, table["duration_sec"] >= self.min_duration_sec)
+
+    def find_passes(self, ephemeris, t_start: float, t_end: float, stations,
+                    refine: bool = None) -> dict:
+        """
+        Pass table for [t_start, t_end) seconds past the ephemeris epoch,
+        not filtered by duration. Passes already in view at t_start keep
+        that as their AOS ("clamped_start"); passes still in view at t_end
+        close there ("open"). Rolling schedulers use the flags to stitch
+        consecutive windows together. stations is a StationNetwork or a
+        list of station dicts.
+        """
+        refine = self.refine if refine is None else refine
+        network = as_station_network(stations)
+        stations = network.stations
+        if not stations:
+            return _empty_pass_table(stations)
+
+        step_size = self.coarse_step_sec if refine else 10.0  # 10-second intervals per spec
+        if t_start == 0:
+            time_offsets, states = ephemeris.sample(step_size, t_end)
+        else:
+            time_offsets = np.arange(t_start, t_end, step_size, dtype=float)
+            states = ephemeris.states_at(time_offsets)
+        epoch_jd = get_julian_date(ephemeris.epoch)
+
+        # Transform the whole trajectory to ECEF once, shared by every station
+        r_ecef = eci_to_ecef_batch(states[:, :3], epoch_jd + time_offsets / 86400.0)
+
+        # Station geometry comes precomputed with the network
+        station_ecef, station_up = network.ecef, network.up
+
+        elevation, margin = network.visibility(r_ecef)
+        rows, starts, ends = visibility_edges(margin >= 0.0)
+
+        # Passes still open at the end of the window close at the horizon
+        n_steps = len(time_offsets)
+        end_offsets = np.append(time_offsets, t_end)
+
+        n_pass = len(rows)
+        aos = time_offsets[starts].astype(float)
+        los = end_offsets[np.minimum(ends, n_steps)].astype(float)
+        peak = np.array([i0 + int(np.argmax(elevation[row, i0:i1]))
+                         for row, i0, i1 in zip(rows, starts, ends)], dtype=int)
+        tca = time_offsets[peak].astype(float) if n_pass else np.empty(0)
+        max_elev = elevation[rows, peak] if n_pass else np.empty(0)
+
+        if refine:
+            for j, (row, i0, i1, k) in enumerate(zip(rows, starts, ends, peak)):
+                elev_fn = make_elevation_function(ephemeris.state_at, epoch_jd,
+                                                  station_ecef[row], station_up[row])
+                margin_fn = network.margin_function(ephemeris.state_at, epoch_jd, row)
+                aos[j], los[j], tca[j], max_elev[j] = self._refine_pass(
+                    elev_fn, margin_fn, margin[row], time_offsets,
+                    i0, i1, k, aos[j], los[j],
                 )
 
-                if visible and not in_view:
-                    in_view = True
-                    window_start = current_dt
-                    max_elev = elevation
-                elif visible and in_view:
-                    max_elev = max(max_elev, elevation)
-                elif not visible and in_view:
-                    in_view = False
-                    duration = (current_dt - window_start).total_seconds()
-                    if duration >= self.min_duration_sec:
-                        all_passes.append({
-                            "station_name": station["name"],
-                            "latitude": station["lat"],
-                            "longitude": station["lon"],
-                            "country": station.get("country", "Unknown"),
-                            "aos_time": window_start.isoformat(),
-                            "los_time": current_dt.isoformat(),
-                            "duration_sec": round(duration, 1),
-                            "max_elevation_deg": round(float(max_elev), 2),
-                        })
-
-            # Close pass still in progress at end of simulation
-            if in_view and window_start:
-                end_dt = sim_start + timedelta(seconds=duration_sec)
-                duration = (end_dt - window_start).total_seconds()
-                if duration >= self.min_duration_sec:
-                    all_passes.append({
-                        "station_name": station["name"],
-                        "latitude": station["lat"],
-                        "longitude": station["lon"],
-                        "country": station.get("country", "Unknown"),
-                        "aos_time": window_start.isoformat(),
-                        "los_time": end_dt.isoformat(),
-                        "duration_sec": round(duration, 1),
-                        "max_elevation_deg": round(float(max_elev), 2),
-                    })
-
-        all_passes.sort(key=lambda p: p["aos_time"])
-        return all_passes
+        order = np.argsort(aos, kind="stable")
+        t0 = epoch_seconds(ephemeris.epoch)
+        return {
+            "stations": stations,
+            "station": rows[order],
+            "aos": t0 + aos[order],
+            "los": t0 + los[order],
+            "tca": t0 + tca[order],
+            "duration_sec": (los - aos)[order],
+            "max_elevation_deg": max_elev[order],
+            "clamped_start": (starts == 0)[order],
+            "open": (ends >= n_steps)[order],
+        }
+
+    def pass_track(self, mission_state, station_name: str, aos_sec: float, step_sec: float = 1.0,
+                   duration_hours: float = 24.0, stations=None) -> dict:
+        """
+        Look-angle track (see compute_pass_track) of the pass over
+        station_name with AOS near aos_sec (epoch seconds), predicted on the
+        same cached ephemeris as the pass itself. None if there is no such
+        pass in the next duration_hours.
+        """
+        network = get_station_network() if stations is None else as_station_network(stations)
+        duration_sec = duration_hours * 3600.0
+        ephemeris = get_ephemeris(mission_state, duration_sec)
+        table = self.find_passes(ephemeris, 0.0, duration_sec, network)
+        j = find_pass(table, station_name, aos_sec)
+        return None if j is None else compute_pass_track(ephemeris, network, table, j, step_sec)
+
+    def _refine_pass(self, elev_fn, margin_fn, margin, time_offsets,
+                     i0, i1, k, aos_offset, los_offset) -> tuple:
+        """
+        Root-find AOS/LOS (zeros of the margin over the station mask) inside
+        their bracketing coarse samples and golden-section search the max
+        elevation around the peak sample. Edges at the start/end of the
+        prediction window stay clamped.
+        """
+        g = margin_fn
+        tol = self.time_tolerance_sec
+        n_steps = len(time_offsets)
+
+        if i0 > 0:
+            aos_offset = brent_root(g, time_offsets[i0 - 1], time_offsets[i0],
+                                    margin[i0 - 1], margin[i0], xtol=tol)
+        if i1 < n_steps:
+            los_offset = brent_root(g, time_offsets[i1 - 1], time_offsets[i1],
+                                    margin[i1 - 1], margin[i1], xtol=tol)
+
+        lo = max(time_offsets[max(k - 1, 0)], aos_offset)
+        hi = min(time_offsets[min(k + 1, n_steps - 1)], los_offset)
+        tca_offset, max_elev = golden_section_max(elev_fn, lo, hi, xtol=tol)
+
+        return float(aos_offset), float(los_offset), float(tca_offset), float(max_elev)
+
+
+def _empty_pass_table(stations: list) -> dict:
+    empty = np.empty(0)
+    flags = np.empty(0, dtype=bool)
+    return {"stations": stations, "station": np.empty(0, dtype=int), "aos": empty, "los": empty,
+            "tca": empty, "duration_sec": empty, "max_elevation_deg": empty,
+            "clamped_start": flags, "open": flags}
+
+
+def select_passes(table: dict, index) -> dict:
+    """Subset of a pass table by boolean mask, index array or slice."""
+    return {key: (value if key == "stations" else value[index]) for key, value in table.items()}
+
+
+def concat_passes(first: dict, second: dict) -> dict:
+    """Concatenate two pass tables over the same station list."""
+    return {key: (value if key == "stations" else np.concatenate((value, second[key])))
+            for key, value in first.items()}
+
+
+def find_pass(table: dict, station_name: str, aos_sec: float) -> int:
+    """Index of station_name's pass with AOS nearest aos_sec (within tolerance), or None."""
+    names = np.array([s["name"] for s in table["stations"]], dtype=object)
+    candidates = np.flatnonzero(names[table["station"]] == station_name) if len(table["aos"]) else []
+    if not len(candidates):
+        return None
+    j = candidates[np.argmin(np.abs(table["aos"][candidates] - aos_sec))]
+    return int(j) if abs(table["aos"][j] - aos_sec) <= PASS_MATCH_TOLERANCE_SEC else None
+
+
+def compute_pass_track(ephemeris, network: StationNetwork, table: dict, index: int,
+                       step_sec: float = 1.0) -> dict:
+    """
+    Azimuth, elevation, slant range and range rate for one pass of a table
+    found on ephemeris, every step_sec from AOS plus a final sample at LOS.
+    All samples are evaluated in one batch: Hermite states, ECI -> ECEF
+    state rotation, then one ENU transform (compute_look_angles).
+    Columnar: "time" is float64 epoch seconds, the rest are parallel arrays.
+    """
+    row = int(table["station"][index])
+    aos, los = float(table["aos"][index]), float(table["los"][index])
+    t0 = epoch_seconds(ephemeris.epoch)
+    start = max(aos, t0)
+
+    times = np.append(np.arange(start, los, step_sec, dtype=float), los)
+    offsets = times - t0
+    r_ecef, v_ecef = eci_to_ecef_state_batch(ephemeris.states_at(offsets),
+                                             get_julian_date(ephemeris.epoch) + offsets / 86400.0)
+    azimuth, elevation, range_km, range_rate = compute_look_angles(
+        r_ecef, v_ecef, network.ecef[row], network.enu[row])
+
+    return {
+        "station": network.stations[row],
+        "aos": aos,
+        "los": los,
+        "tca": float(table["tca"][index]),
+        "step_sec": float(step_sec),
+        "time": times,
+        "azimuth_deg": azimuth,
+        "elevation_deg": elevation,
+        "range_km": range_km,
+        "range_rate_km_s": range_rate,
+    }
+
+
+def track_to_columns(track: dict) -> dict:
+    """
+    Serialize a pass track as one column per quantity (no per-sample
+    dicts). Sample times are seconds after start_time.
+    """
+    times = track["time"]
+    start_iso, aos_iso, los_iso, tca_iso = isoformat_array(
+        np.array([times[0], track["aos"], track["los"], track["tca"]]))
+    return {
+        "station_name": track["station"]["name"],
+        "aos_time": aos_iso,
+        "los_time": los_iso,
+        "tca_time": tca_iso,
+        "start_time": start_iso,
+        "step_sec": track["step_sec"],
+        "samples": len(times),
+        "columns": {
+            "t_sec": np.round(times - times[0], 3).tolist(),
+            "azimuth_deg": np.round(track["azimuth_deg"], 4).tolist(),
+            "elevation_deg": np.round(track["elevation_deg"], 4).tolist(),
+            "range_km": np.round(track["range_km"], 3).tolist(),
+            "range_rate_km_s": np.round(track["range_rate_km_s"], 6).tolist(),
+        },
+    }
+
+
+def passes_to_dicts(table: dict) -> list:
+    """Serialize a pass table to the API's list-of-dicts form (ISO timestamps)."""
+    stations = table["stations"]
+    aos_iso = isoformat_array(table["aos"])
+    los_iso = isoformat_array(table["los"])
+    tca_iso = isoformat_array(table["tca"])
+    return [
+        {
+            "station_name": stations[row]["name"],
+            "latitude": stations[row]["lat"],
+            "longitude": stations[row]["lon"],
+            "country": stations[row].get("country", "Unknown"),
+            "aos_time": aos_iso[j],
+            "los_time": los_iso[j],
+            "tca_time": tca_iso[j],
+            "duration_sec": round(float(table["duration_sec"][j]), 1),
+            "max_elevation_deg": round(float(table["max_elevation_deg"][j]), 2),
+        }
+        for j, row in enumerate(table["station"])
+    ]
@@ -0,0 +1,221 @@
+"""
+DISHA Beta — Loop Scheduler
+Deadline-based pacing for the 1 Hz simulation loop. Ticks are released on
+a fixed wall-clock grid (start + k × period) instead of sleeping a period
+after the work, so processing time no longer stretches the period and
+simulated time stays locked to wall time. Overruns, skipped ticks and
+per-stage latency histograms show where the tick budget goes.
+
+Time warp scales simulated seconds per wall second; headless mode drops
+the wall clock entirely and runs ticks back to back. Either way a tick may
+cover many simulation steps, and telemetry is only emitted at the
+broadcast rate (one frame per period of wall time).
+"""
+
+import asyncio
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from backend.models.config import get_config
+
+
+# Histogram bucket upper edges, seconds: 10 µs .. 10 s, four per decade
+LATENCY_BUCKETS_SEC = tuple(10.0 ** (k / 4.0) for k in range(-20, 5))
+
+
+class LatencyHistogram:
+    """Fixed log-spaced latency buckets; O(log buckets) per sample, no sample storage."""
+
+    def __init__(self, edges: tuple = LATENCY_BUCKETS_SEC):
+        self.edges = edges
+        self.counts = [0] * (len(edges) + 1)  # last bucket: above the top edge
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect_left(self.edges, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket edge below which a fraction q of samples fall (max for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target and n:
+                return min(self.edges[i], self.max) if i < len(self.edges) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        ms = lambda sec: round(sec * 1000.0, 3)
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total / self.count) if self.count else 0.0,
+            "last_ms": ms(self.last),
+            "max_ms": ms(self.max),
+            "p50_ms": ms(self.quantile(0.50)),
+            "p90_ms": ms(self.quantile(0.90)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "buckets": [
+                {"le_ms": ms(self.edges[i]) if i < len(self.edges) else None, "count": n}
+                for i, n in enumerate(self.counts) if n
+            ],
+        }
+
+
+class TickScheduler:
+    """
+    Releases ticks at start + k × period_sec. A tick that starts late by
+    whole periods skips those slots: the next tick advances the simulation
+    by the elapsed slots (up to max_catchup_ticks of them), so simulated
+    time keeps pace with wall time instead of drifting. A tick that is
+    still running at the next deadline counts as an overrun.
+
+    time_warp simulated seconds pass per wall second; a tick is split into
+    steps of sim_step_sec (steps()). In headless mode ticks are not paced:
+    each advances headless_step_sec of simulated time as fast as the work
+    allows, yielding to the event loop in between.
+
+    Stage timings are recorded with stage(name) around each part of the
+    tick; runs on the event loop only.
+    """
+
+    def __init__(self, period_sec: float = 1.0, max_catchup_ticks: int = 5,
+                 time_warp: float = 1.0, sim_step_sec: float = 1.0,
+                 headless: bool = False, headless_step_sec: float = 600.0):
+        self.period_sec = period_sec
+        self.max_catchup_ticks = max(1, int(max_catchup_ticks))
+        self.time_warp = 1.0
+        self.sim_step_sec = sim_step_sec
+        self.headless = False
+        self.headless_step_sec = headless_step_sec
+        self.set_mode(time_warp=time_warp, headless=headless)
+        self._start = None
+        self._deadline = None
+        self._tick_start = 0.0
+        self._last_emit = None
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.sim_elapsed_sec = 0.0
+        self.lost_sec = 0.0        # skipped time beyond the catch-up limit (not simulated)
+        self.tick_latency = LatencyHistogram()
+        self.wakeup_lateness = LatencyHistogram()
+        self.stages = {}
+
+    def set_mode(self, time_warp: float = None, headless: bool = None):
+        """Change the warp factor and/or headless mode; pacing restarts from the next tick."""
+        if time_warp is not None:
+            if time_warp <= 0:
+                raise ValueError("time_warp must be positive")
+            self.time_warp = float(time_warp)
+        if headless is not None:
+            self.headless = bool(headless)
+        self._deadline = None
+
+    def steps(self, dt: float) -> tuple:
+        """(n_steps, step_sec) splitting a tick's dt into simulation steps of about sim_step_sec."""
+        n_steps = max(1, int(round(dt / self.sim_step_sec)))
+        return n_steps, dt / n_steps
+
+    def emit_due(self) -> bool:
+        """Whether this tick should emit telemetry: paced ticks always, headless ones once per period."""
+        if not self.headless:
+            return True
+        now = time.monotonic()
+        if self._last_emit is not None and now - self._last_emit < self.period_sec:
+            return False
+        self._last_emit = now
+        return True
+
+    async def next_tick(self) -> float:
+        """Wait for the next deadline; returns the simulated dt_seconds for this tick."""
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+        if self.headless:
+            await asyncio.sleep(0)
+            self._tick_start = time.monotonic()
+            self._deadline = None
+            self.sim_elapsed_sec += self.headless_step_sec
+            return self.headless_step_sec
+
+        if self._deadline is None:
+            self._deadline = now
+        elif now < self._deadline:
+            await asyncio.sleep(self._deadline - now)
+            now = time.monotonic()
+            if self._deadline is None:  # set_mode() while waiting
+                self._deadline = now
+
+        late = max(0.0, now - self._deadline)
+        missed = int(late // self.period_sec)
+        slots = min(1 + missed, self.max_catchup_ticks)
+        self.skipped += missed
+        self.lost_sec += (1 + missed - slots) * self.period_sec * self.time_warp
+        self.wakeup_lateness.record(late - missed * self.period_sec)
+
+        self._deadline += (1 + missed) * self.period_sec
+        self._tick_start = now
+        dt = slots * self.period_sec * self.time_warp
+        self.sim_elapsed_sec += dt
+        return dt
+
+    def end_tick(self):
+        finished = time.monotonic()
+        self.ticks += 1
+        self.tick_latency.record(finished - self._tick_start)
+        if self._deadline is not None and finished > self._deadline:
+            self.overruns += 1
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram = self.stages.get(name)
+            if histogram is None:
+                histogram = self.stages[name] = LatencyHistogram()
+            histogram.record(time.perf_counter() - t0)
+
+    def stats(self) -> dict:
+        wall = time.monotonic() - self._start if self._start is not None else 0.0
+        return {
+            "period_sec": self.period_sec,
+            "time_warp": self.time_warp,
+            "headless": self.headless,
+            "sim_step_sec": self.sim_step_sec,
+            "sim_rate": round(self.sim_elapsed_sec / wall, 2) if wall > 0 else 0.0,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped_ticks": self.skipped,
+            "wall_elapsed_sec": round(wall, 3),
+            "sim_elapsed_sec": round(self.sim_elapsed_sec, 3),
+            "sim_lost_sec": round(self.lost_sec, 3),
+            "budget_used_pct": round(100.0 * self.tick_latency.total / self.ticks / self.period_sec, 2)
+            if self.ticks else 0.0,
+            "tick": self.tick_latency.to_dict(),
+            "wakeup_lateness": self.wakeup_lateness.to_dict(),
+            "stages": {name: h.to_dict() for name, h in self.stages.items()},
+        }
+
+
+def build_tick_scheduler() -> TickScheduler:
+    loop_cfg = get_config().get("telemetry_loop", {})
+    return TickScheduler(
+        period_sec=loop_cfg.get("period_sec", 1.0),
+        max_catchup_ticks=loop_cfg.get("max_catchup_ticks", 5),
+        time_warp=loop_cfg.get("time_warp", 1.0),
+        sim_step_sec=loop_cfg.get("sim_step_sec", 1.0),
+        headless=loop_cfg.get("headless", False),
+        headless_step_sec=loop_cfg.get("headless_step_sec", 600.0),
+    )
@@ -4,9 +4,11 @@ Greedy scheduler, feasibility scoring, conflict detection.
 Supports four task types: IMAGING, DOWNLINK, MANOEUVRE, CONTACT.
 """
 
-from datetime import datetime, timedelta, timezone
+import numpy as np
+from datetime import datetime
 from backend.models.schemas import MissionPlan, Task
-from backend.core.flight_dynamics import predict_eclipse_simple
+from backend.core.eclipse import get_eclipse_timeline
+from backend.core.time_services import epoch_seconds, to_datetime
 from backend.models.config import get_config
 
 
@@ -26,6 +28,9 @@ DATA_RATE_GBPS = {
     "CONTACT": 0.0,
 }
 
+# A ground pass within this margin of a task counts as contact coverage
+CONTACT_BUFFER_SEC = 1800.0
+
 
 def calculate_energy_cost(mode: str, duration_sec: float) -> float:
     """Energy consumed in Watt-hours."""
@@ -38,10 +43,10 @@ def calculate_data_volume(mode: str, duration_sec: float) -> float:
     return DATA_RATE_GBPS.get(mode, 0) * duration_sec
 
 
-def check_temporal_overlap(new_start: datetime, new_end: datetime, existing_tasks: list) -> bool:
-    """Returns True if time window overlaps with any existing task."""
-    for task in existing_tasks:
-        if new_start < task.end_time and new_end > task.start_time:
+def check_temporal_overlap(new_start: float, new_end: float, existing_windows: list) -> bool:
+    """Returns True if the window overlaps any existing (start, end) window (epoch seconds)."""
+    for start, end in existing_windows:
+        if new_start < end and new_end > start:
             return True
     return False
 
@@ -49,9 +54,12 @@ def check_temporal_overlap(new_start: datetime, new_end: datetime, existing_task
 def generate_mission_plan(requests, mission_state=None) -> MissionPlan:
     """
     Greedy scheduler: sort by priority, check constraints, schedule.
+    Feasible windows are (start, end) epoch seconds from check_feasibility;
+    datetimes are only built for the tasks that end up scheduled.
     """
     sorted_requests = sorted(requests, key=lambda x: x.priority, reverse=True)
     scheduled_tasks = []
+    scheduled_windows = []
     rejected_count = 0
 
     for req in sorted_requests:
@@ -61,9 +69,9 @@ def generate_mission_plan(requests, mission_state=None) -> MissionPlan:
 
         selected_window = None
         for window in req.feasible_windows:
-            start_t, end_t = window
-            if not check_temporal_overlap(start_t, end_t, scheduled_tasks):
-                selected_window = window
+            start_t, end_t = _to_epoch(window[0]), _to_epoch(window[1])
+            if not check_temporal_overlap(start_t, end_t, scheduled_windows):
+                selected_window = (start_t, end_t)
                 break
 
         if selected_window is None:
@@ -71,7 +79,7 @@ def generate_mission_plan(requests, mission_state=None) -> MissionPlan:
             continue
 
         start_time, end_time = selected_window
-        duration = (end_time - start_time).total_seconds()
+        duration = end_time - start_time
         action = getattr(req, 'task_type', 'IMAGING') if hasattr(req, 'task_type') else 'IMAGING'
 
         power_cost = calculate_energy_cost(action, duration)
@@ -80,12 +88,13 @@ def generate_mission_plan(requests, mission_state=None) -> MissionPlan:
         new_task = Task(
             task_id=f"TASK-{req.request_id}",
             action=action,
-            start_time=start_time,
-            end_time=end_time,
+            start_time=to_datetime(start_time),
+            end_time=to_datetime(end_time),
             power_cost_wh=power_cost,
             data_cost_gb=data_cost,
         )
         scheduled_tasks.append(new_task)
+        scheduled_windows.append(selected_window)
 
     plan = MissionPlan(
         request_id="MASTER-PLAN-001",
@@ -97,10 +106,14 @@ def generate_mission_plan(requests, mission_state=None) -> MissionPlan:
     return plan
 
 
-def compute_feasibility(task: dict, mission_state, passes: list = None) -> dict:
+def compute_feasibility(task: dict, mission_state, passes=None) -> dict:
     """
     Compute feasibility score for a scheduled task.
     Score = 0.50 × power + 0.25 × contact + 0.25 × sunlit
+
+    Task start/end may be epoch seconds, datetimes or ISO strings. passes is
+    a pass table from PassPredictor.compute_pass_table or a legacy list of
+    pass dicts.
     """
     battery_pct = (mission_state.current_battery_wh / mission_state.battery_capacity_wh) * 100
     power_cost = task.get("power_cost_wh", 0)
@@ -120,26 +133,22 @@ def compute_feasibility(task: dict, mission_state, passes: list = None) -> dict:
 
     # Contact availability
     contact_score = 0.5
-    if passes:
-        task_start = task.get("start_time", "")
-        task_end = task.get("end_time", "")
-        if isinstance(task_start, str) and task_start:
-            try:
-                task_start_dt = datetime.fromisoformat(task_start.replace("Z", "+00:00"))
-                task_end_dt = datetime.fromisoformat(task_end.replace("Z", "+00:00"))
-                buffer = timedelta(minutes=30)
-                for p in passes:
-                    aos = datetime.fromisoformat(p["aos_time"].replace("Z", "+00:00"))
-                    los = datetime.fromisoformat(p["los_time"].replace("Z", "+00:00"))
-                    if aos <= task_end_dt + buffer and los >= task_start_dt - buffer:
-                        contact_score = 1.0
-                        break
-            except (ValueError, KeyError):
-                contact_score = 0.6
-
-    # Sunlit score
-    r_eci = mission_state.position.tolist() if hasattr(mission_state.position, 'tolist') else list(mission_state.position)
-    in_eclipse = predict_eclipse_simple(r_eci)
+    task_start = _to_epoch(task.get("start_time"))
+    task_end = _to_epoch(task.get("end_time"))
+    if task_start is not None and task_end is not None and _has_passes(passes):
+        try:
+            aos, los = _pass_bounds(passes)
+            if np.any((aos <= task_end + CONTACT_BUFFER_SEC) & (los >= task_start - CONTACT_BUFFER_SEC)):
+                contact_score = 1.0
+        except (ValueError, KeyError, TypeError):
+            contact_score = 0.6
+
+    # Sunlit score — shadow state at task start from the shared eclipse timeline
+    now = epoch_seconds(mission_state.current_time)
+    lead_sec = max(0.0, task_start - now) if task_start is not None else 0.0
+    timeline = get_eclipse_timeline(mission_state, lead_sec)
+    # Timeline offsets count from its own (possibly older) epoch, not from now
+    in_eclipse = bool(timeline.in_eclipse(timeline.offset(now) + lead_sec))
     sunlit_score = 1.0 if not in_eclipse else 0.4
 
     score = round(0.50 * power_score + 0.25 * contact_score + 0.25 * sunlit_score, 2)
@@ -165,56 +174,55 @@ def compute_feasibility(task: dict, mission_state, passes: list = None) -> dict:
 
 
 def detect_conflicts(tasks: list, mission_state) -> list:
-    """Detect time, mode, and power conflicts between tasks."""
+    """
+    Detect time, mode, and power conflicts between tasks.
+    Task times are converted to epoch seconds once; pairwise overlap is one
+    broadcast comparison instead of re-parsing timestamps per pair.
+    """
     conflicts = []
     battery_pct = (mission_state.current_battery_wh / mission_state.battery_capacity_wh) * 100
 
+    n = len(tasks)
+    starts = np.full(n, np.nan)
+    ends = np.full(n, np.nan)
+    for k, t in enumerate(tasks):
+        start, end = _to_epoch(t.get("start_time")), _to_epoch(t.get("end_time"))
+        if start is not None and end is not None:
+            starts[k], ends[k] = start, end
+    valid = ~np.isnan(starts)
+
+    # overlap[i, j] for j > i only; NaN rows/columns compare False
+    overlap = np.triu((starts[:, None] < ends[None, :]) & (ends[:, None] > starts[None, :]), k=1)
+    cumulative_cost = np.cumsum([t.get("power_cost_wh", 0) for t in tasks])
+
     for i, t1 in enumerate(tasks):
-        start1 = t1.get("start_time", "")
-        end1 = t1.get("end_time", "")
-        if not start1 or not end1:
+        if not valid[i]:
             continue
 
-        start1_dt = _parse_dt(start1)
-        end1_dt = _parse_dt(end1)
-        if not start1_dt or not end1_dt:
-            continue
+        for j in np.flatnonzero(overlap[i]):
+            t2 = tasks[j]
+            conflicts.append({
+                "conflict": True,
+                "type": "TIME_OVERLAP",
+                "tasks": [t1.get("task_id", f"task-{i}"), t2.get("task_id", f"task-{j}")],
+                "reason": f"Time overlap between {t1.get('task_id', '')} and {t2.get('task_id', '')}",
+                "severity": "WARNING",
+            })
 
-        for j, t2 in enumerate(tasks):
-            if j <= i:
-                continue
-            start2 = t2.get("start_time", "")
-            end2 = t2.get("end_time", "")
-            start2_dt = _parse_dt(start2)
-            end2_dt = _parse_dt(end2)
-            if not start2_dt or not end2_dt:
-                continue
-
-            # Time overlap
-            if start1_dt < end2_dt and end1_dt > start2_dt:
+            # Mode conflict
+            a1 = t1.get("action", "")
+            a2 = t2.get("action", "")
+            if (a1 == "IMAGING" and a2 == "DOWNLINK") or (a1 == "DOWNLINK" and a2 == "IMAGING"):
                 conflicts.append({
                     "conflict": True,
-                    "type": "TIME_OVERLAP",
-                    "tasks": [t1.get("task_id", f"task-{i}"), t2.get("task_id", f"task-{j}")],
-                    "reason": f"Time overlap between {t1.get('task_id', '')} and {t2.get('task_id', '')}",
-                    "severity": "WARNING",
+                    "type": "MODE_CONFLICT",
+                    "tasks": [t1.get("task_id"), t2.get("task_id")],
+                    "reason": "Imaging and downlink cannot run simultaneously",
+                    "severity": "CRITICAL",
                 })
 
-                # Mode conflict
-                a1 = t1.get("action", "")
-                a2 = t2.get("action", "")
-                if (a1 == "IMAGING" and a2 == "DOWNLINK") or (a1 == "DOWNLINK" and a2 == "IMAGING"):
-                    conflicts.append({
-                        "conflict": True,
-                        "type": "MODE_CONFLICT",
-                        "tasks": [t1.get("task_id"), t2.get("task_id")],
-                        "reason": "Imaging and downlink cannot run simultaneously",
-                        "severity": "CRITICAL",
-                    })
-
         # Power deficit check
-        cumulative_cost = sum(t.get("power_cost_wh", 0) for t in tasks[:i + 1])
-        projected_battery = battery_pct - (cumulative_cost / mission_state.battery_capacity_wh * 100)
+        projected_battery = battery_pct - (cumulative_cost[i] / mission_state.battery_capacity_wh * 100)
         if projected_battery < 20:
             conflicts.append({
                 "conflict": True,
@@ -227,6 +235,29 @@ def detect_conflicts(tasks: list, mission_state) -> list:
     return conflicts
 
 
+def _has_passes(passes) -> bool:
+    if isinstance(passes, dict):
+        return len(passes.get("aos", ())) > 0
+    return bool(passes)
+
+
+def _pass_bounds(passes) -> tuple:
+    """(aos, los) epoch-second arrays from a pass table or a list of pass dicts."""
+    if isinstance(passes, dict):
+        return passes["aos"], passes["los"]
+    aos = [_to_epoch(p["aos_time"]) for p in passes]
+    los = [_to_epoch(p["los_time"]) for p in passes]
+    return np.array(aos, dtype=float), np.array(los, dtype=float)
+
+
+def _to_epoch(val):
+    """Epoch seconds from a float, datetime or ISO string; None if unparseable."""
+    if isinstance(val, (int, float, np.floating)) and not isinstance(val, bool):
+        return float(val)
+    dt = _parse_dt(val)
+    return epoch_seconds(dt) if dt is not None else None
+
+
 def _parse_dt(val):
     """Parse datetime from string or return datetime as-is."""
     if isinstance(val, datetime):
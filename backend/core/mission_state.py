@@ -4,15 +4,26 @@ Central digital twin object. Single source of truth for all satellite state.
 The tick() method advances all subsystems by 1 second.
 """
 
-import random
+import itertools
 import numpy as np
 from datetime import datetime, timedelta, timezone
-from backend.core.flight_dynamics import rk4_step, eci_to_ecef, ecef_to_lla, is_in_eclipse
+from backend.core.flight_dynamics import rk4_step, eci_to_ecef, ecef_to_lla
+from backend.core.ephemeris import invalidate_ephemeris
+from backend.core.eclipse import get_eclipse_timeline
+from backend.core.noise import SatelliteNoise, scale_uniform
 from backend.models.config import get_config
 
 
+_state_versions = itertools.count(1)
+
+
+def next_state_version() -> int:
+    """Process-wide increasing version; never reused across resets or satellites."""
+    return next(_state_versions)
+
+
 class MissionState:
-    def __init__(self):
+    def __init__(self, seed: int = None):
         config = get_config()
         orbit_cfg = config.get("orbit", {})
         power_cfg = config.get("power", {})
@@ -20,6 +31,11 @@ class MissionState:
         storage_cfg = config.get("storage", {})
         comms_cfg = config.get("comms", {})
 
+        # Bumped whenever the orbit or resources change (result-cache key)
+        self.state_version = next_state_version()
+        # Stable identity of this orbit source (eclipse timeline / pass schedule key); new on reset
+        self.cache_key = ("mission", next_state_version())
+
         # Simulation clock
         self.current_time = datetime.now(timezone.utc)
         self.last_updated = datetime.now(timezone.utc)
@@ -66,6 +82,9 @@ class MissionState:
         # Eclipse state
         self.in_eclipse = False
 
+        # Seeded per-subsystem noise streams (seed: argument, then noise.seed config, then fresh)
+        self.noise = SatelliteNoise(seed)
+
         # FDIR alert list (populated by FDIR engine)
         self.fdir_alerts = []
 
@@ -109,26 +128,38 @@ class MissionState:
         """Advance satellite state by dt_seconds. Called by simulation loop."""
         # 1. Flight Dynamics: propagate orbit
         if self.tle_manager and self.tle_manager.satrec:
-            self.current_time += timedelta(seconds=dt_seconds)
-            pos, vel = self.tle_manager.propagate_at(self.current_time)
-            self.position = np.array(pos)
-            self.velocity = np.array(vel)
+            pos, vel = self.tle_manager.propagate_at(self.current_time + timedelta(seconds=dt_seconds))
         else:
             state_vec = np.concatenate((self.position, self.velocity))
             new_state = rk4_step(state_vec, dt_seconds)
-            self.position = new_state[:3]
-            self.velocity = new_state[3:]
-            self.current_time += timedelta(seconds=dt_seconds)
+            pos, vel = new_state[:3], new_state[3:]
+
+        self.apply_orbit_state(pos, vel, dt_seconds)
+
+    def apply_orbit_state(self, position, velocity, dt_seconds: float = 1.0,
+                          lat_lon: tuple = None, in_eclipse: bool = None):
+        """
+        Advance the clock by dt_seconds to an already propagated position/velocity
+        and update geometry and subsystems. Batched callers (constellation) pass
+        precomputed lat/lon and eclipse state; otherwise they are computed here.
+        """
+        self.current_time += timedelta(seconds=dt_seconds)
+        self.state_version = next_state_version()
+        self.position = np.asarray(position, dtype=float)
+        self.velocity = np.asarray(velocity, dtype=float)
 
         # 2. Coordinate transforms: ECI → ECEF → LLA
-        r_ecef = eci_to_ecef(self.position.tolist(), self.current_time)
-        lla = ecef_to_lla(r_ecef)
-        self.latitude = lla["lat"]
-        self.longitude = lla["lon"]
+        if lat_lon is None:
+            r_ecef = eci_to_ecef(self.position.tolist(), self.current_time)
+            lla = ecef_to_lla(r_ecef)
+            lat_lon = (lla["lat"], lla["lon"])
+        self.latitude, self.longitude = lat_lon
         self.altitude_km = np.linalg.norm(self.position) - 6378.137
 
-        # 3. Eclipse check
-        self.in_eclipse = is_in_eclipse(self.position.tolist(), self.current_time)
+        # 3. Eclipse check (binary search in the shared shadow-interval timeline)
+        if in_eclipse is None:
+            in_eclipse = get_eclipse_timeline(self).in_eclipse_at(self.current_time)
+        self.in_eclipse = in_eclipse
 
         # 4. Subsystem updates
         self._update_power(dt_seconds)
@@ -147,40 +178,48 @@ class MissionState:
     def _update_power(self, dt: float):
         """Update power subsystem based on eclipse/sunlit state."""
         hours = dt / 3600.0
+        noise = self.noise.power
+        solar_noise = noise.uniform(-1, 1)   # drawn every step, so the stream stays aligned
 
         if self.in_eclipse:
             self.solar_panel_current = 0.0
             net_power = -self.base_load_w
         else:
-            self.solar_panel_current = 1.5 + 0.2 * random.uniform(-1, 1)
+            self.solar_panel_current = 1.5 + 0.2 * solar_noise
             net_power = self.solar_array_output_w - self.base_load_w
 
         self.current_battery_wh = max(0, min(self.battery_capacity_wh,
                                               self.current_battery_wh + net_power * hours))
-        self.bus_voltage = 12.0 + random.uniform(-0.3, 0.3)
+        self.bus_voltage = 12.0 + noise.uniform(-0.3, 0.3)
         self.current_draw = self.base_load_w / max(self.bus_voltage, 1.0)
 
     def _update_thermal(self, dt: float):
         """Update thermal state based on sun exposure."""
+        noise = self.noise.thermal
         if self.in_eclipse:
-            self.component_temp += random.uniform(-0.5, 0.0) * (dt / 60.0)
+            self.component_temp += noise.uniform(-0.5, 0.0) * (dt / 60.0)
             if self.component_temp < -20 and not self.heater_active:
                 self.heater_active = True
         else:
-            self.component_temp += random.uniform(-0.2, 0.5) * (dt / 60.0)
+            self.component_temp += noise.uniform(-0.2, 0.5) * (dt / 60.0)
             if self.component_temp > 10:
                 self.heater_active = False
 
         self.component_temp = max(-50, min(100, self.component_temp))
-        self.battery_temp += random.uniform(-0.1, 0.1) * (dt / 60.0)
+        self.battery_temp += noise.uniform(-0.1, 0.1) * (dt / 60.0)
         self.battery_temp = max(-10, min(55, self.battery_temp))
 
     def _update_comms(self, dt: float):
-        """Update comms state based on actual ground station contact."""
+        """
+        Update comms state based on actual ground station contact. A tick
+        draws the step's SNR sample; the refresh from update_contact (dt=0)
+        reuses it, so each step consumes exactly one.
+        """
+        u = self.noise.comms.next() if dt > 0 else self.noise.comms.last
         if self.in_contact:
             # In contact: SNR based on elevation (higher elevation = better signal)
             base_snr = 8.0 + (self.contact_elevation_deg / 90.0) * 12.0
-            self.snr_db = base_snr + random.uniform(-0.5, 0.5)
+            self.snr_db = base_snr + scale_uniform(u, -0.5, 0.5)
             if self.snr_db >= 12:
                 self.link_status = "NOMINAL"
                 self.data_rate_kbps = 256.0
@@ -199,8 +238,9 @@ class MissionState:
 
     def _update_attitude(self, dt: float):
         """Update attitude state (simplified state machine)."""
-        self.pointing_error = max(0.0, 0.1 + 0.05 * random.uniform(-1, 1))
-        self.angular_rate = max(0.0, 0.01 + 0.005 * random.uniform(-1, 1))
+        noise = self.noise.attitude
+        self.pointing_error = max(0.0, 0.1 + 0.05 * noise.uniform(-1, 1))
+        self.angular_rate = max(0.0, 0.01 + 0.005 * noise.uniform(-1, 1))
 
     def get_state(self) -> dict:
         """Return full state snapshot for API/telemetry."""
@@ -292,11 +332,13 @@ class MissionState:
 
     def update_state(self, power_cost_wh: float, data_cost_gb: float):
         """Deduct power and add storage from task execution."""
+        self.state_version = next_state_version()
         self.current_battery_wh = max(0, self.current_battery_wh - power_cost_wh)
         self.storage_used_mb = min(self.storage_capacity_mb,
                                    self.storage_used_mb + data_cost_gb * 1024.0)
         self.current_storage_used_gb = self.storage_used_mb / 1024.0
 
-    def reset(self):
-        """Reset to initial state."""
-        self.__init__()
+    def reset(self, seed: int = None):
+        """Reset to initial state (with a given noise seed to replay a run)."""
+        self.__init__(seed)
+        invalidate_ephemeris()
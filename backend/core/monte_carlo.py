@@ -0,0 +1,226 @@
+"""
+DISHA Beta — Monte Carlo
+Seeded ensembles of the digital twin. R realizations share the orbit,
+eclipse and contact timeline (deterministic for a given start state) and
+differ in the subsystem noise MissionState injects every step plus
+dispersed initial state and power parameters. The subsystem models run
+vectorized over an (R, n) block of realizations × steps; each block is
+reduced on the spot to percentile envelopes at the sample times and to
+per-realization first-firing times of every FDIR rule, so memory stays
+bounded by the block size whatever the horizon or ensemble size.
+"""
+
+import time
+from datetime import timedelta
+import numpy as np
+
+from backend.core.fdir_engine import FDIREngine
+from backend.core.noise import EnsembleNoise, new_seed
+from backend.core.time_services import isoformat_array
+from backend.core.time_warp import COLUMN_DIGITS, orbit_track, subsystem_track
+from backend.models.config import get_config
+
+
+# Columns reported as percentile envelopes
+ENVELOPE_COLUMNS = ("battery_pct", "component_temp", "battery_temp", "storage_pct")
+
+# Model bounds the dispersed initial values are clipped to (as in MissionState)
+_TEMP_BOUNDS = {"component_temp": (-50.0, 100.0), "battery_temp": (-10.0, 55.0)}
+
+
+# ====================================================
+# ENSEMBLE STATE
+# ====================================================
+
+class Ensemble:
+    """
+    R realizations of the MissionState subsystem fields, as (R,) arrays —
+    the state time_warp.subsystem_track() reads. Capacities are shared;
+    each realization has its own subsystem noise streams (EnsembleNoise),
+    so a seed gives the same run whatever the block size.
+
+    dispersions maps a field to {"sd": σ, "relative": bool}: each
+    realization starts from the mission state's value plus N(0, σ) noise
+    (σ a fraction of the value when relative), drawn from the seed's root
+    Generator.
+    """
+
+    FIELDS = ("current_battery_wh", "base_load_w", "solar_array_output_w",
+              "component_temp", "battery_temp", "heater_active", "storage_used_mb")
+
+    def __init__(self, mission_state, realizations: int, seed: int, dispersions: dict = None):
+        self.noise = EnsembleNoise(seed, realizations)
+        rng = np.random.default_rng(seed)
+        self.realizations = realizations
+        self.battery_capacity_wh = float(mission_state.battery_capacity_wh)
+        self.storage_capacity_mb = float(mission_state.storage_capacity_mb)
+        for name in self.FIELDS:
+            dtype = bool if name == "heater_active" else float
+            setattr(self, name, np.full(realizations, getattr(mission_state, name), dtype=dtype))
+
+        for name, spec in (dispersions or {}).items():
+            if name not in self.FIELDS or name == "heater_active":
+                raise ValueError(f"Cannot disperse {name}")
+            values = getattr(self, name)
+            sd = float(spec.get("sd", 0.0)) * (np.abs(values) if spec.get("relative") else 1.0)
+            values = values + sd * rng.standard_normal(realizations)
+            if name == "current_battery_wh":
+                values = np.clip(values, 0.0, self.battery_capacity_wh)
+            elif name == "storage_used_mb":
+                values = np.clip(values, 0.0, self.storage_capacity_mb)
+            elif name in _TEMP_BOUNDS:
+                values = np.clip(values, *_TEMP_BOUNDS[name])
+            else:
+                values = np.maximum(values, 0.0)
+            setattr(self, name, values)
+
+    def store(self, track: dict):
+        """Carry the last step of a subsystem_track() block over to the next."""
+        self.current_battery_wh = track["battery_wh"][:, -1]
+        self.component_temp = track["component_temp"][:, -1]
+        self.battery_temp = track["battery_temp"][:, -1]
+        self.heater_active = track["heater_active"][:, -1]
+
+
+# ====================================================
+# RUN
+# ====================================================
+
+def monte_carlo_defaults() -> dict:
+    """Run parameters and their defaults ("monte_carlo" config section)."""
+    mc_cfg = get_config().get("monte_carlo", {})
+    return {
+        "realizations": mc_cfg.get("realizations", 500),
+        "horizon_sec": mc_cfg.get("horizon_sec", 21600.0),
+        "step_sec": mc_cfg.get("step_sec", 1.0),
+        "sample_sec": mc_cfg.get("sample_sec", 60.0),
+        "percentiles": mc_cfg.get("percentiles", [5, 25, 50, 75, 95]),
+        "dispersions": mc_cfg.get("dispersions", {}),
+        "seed": None,
+    }
+
+
+def run_monte_carlo(mission_state, network, params: dict = None) -> dict:
+    """
+    Run an ensemble forward from mission_state (MissionState or
+    SatelliteSnapshot; not modified) with contact against the
+    StationNetwork. params override monte_carlo_defaults(). The seed (drawn
+    and reported when not given) reproduces the run exactly.
+
+    Returns the sample times, percentile envelopes (plus mean) of
+    ENVELOPE_COLUMNS, and per FDIR rule the probability of firing within
+    the horizon, its cumulative probability at each sample time and the
+    percentiles of the first-firing time among realizations that fired.
+    """
+    mc_cfg = get_config().get("monte_carlo", {})
+    spec = {**monte_carlo_defaults(), **(params or {})}
+    realizations = int(spec["realizations"])
+    max_realizations = mc_cfg.get("max_realizations", 20000)
+    if not 1 <= realizations <= max_realizations:
+        raise ValueError(f"realizations must be between 1 and {max_realizations}")
+    step_sec = float(spec["step_sec"])
+    horizon_sec = float(spec["horizon_sec"])
+    if not (step_sec > 0 and horizon_sec >= step_sec):
+        raise ValueError("horizon_sec must be at least one step_sec > 0")
+    max_horizon_sec = mc_cfg.get("max_horizon_sec", 604800.0)
+    if horizon_sec > max_horizon_sec:
+        raise ValueError(f"horizon_sec must be at most {max_horizon_sec:g}")
+    seed = spec["seed"]
+    if seed is None:
+        seed = new_seed()
+    q = [float(p) for p in spec["percentiles"]]
+
+    total = int(round(horizon_sec / step_sec))
+    stride = max(1, int(round(float(spec["sample_sec"]) / step_sec)))
+    # Work is R × steps; the result holds percentiles at every sample step
+    max_realization_steps = mc_cfg.get("max_realization_steps", 100000000)
+    if realizations * total > max_realization_steps:
+        raise ValueError(f"realizations × horizon_sec / step_sec must be at most {max_realization_steps}")
+    max_samples = mc_cfg.get("max_samples", 20000)
+    if total // stride > max_samples:
+        raise ValueError(f"horizon_sec / sample_sec must be at most {max_samples}")
+    block_elements = mc_cfg.get("block_elements", 200000)
+    block = max(stride, block_elements // realizations // stride * stride)
+
+    ensemble = Ensemble(mission_state, realizations, int(seed), spec["dispersions"])
+    fdir = FDIREngine()
+    first_fire = {rule["rule_id"]: np.full(realizations, np.nan) for rule in fdir.rules}
+    min_battery = np.full(realizations, np.inf)
+    sample_times, envelopes = [], {name: [] for name in ENVELOPE_COLUMNS}
+
+    t0 = time.perf_counter()
+    done = 0
+    while done < total:
+        n = min(block, total - done)
+        offsets = step_sec * np.arange(done + 1, done + n + 1, dtype=float)
+        orbit = orbit_track(mission_state, offsets, network)
+        track = subsystem_track(ensemble, orbit["in_eclipse"], orbit["in_contact"],
+                                orbit["contact_elevation_deg"], step_sec)
+        ensemble.store(track)
+        # FDIR and the envelopes see telemetry as the twin reports it
+        columns = {name: np.round(values, COLUMN_DIGITS[name]) if name in COLUMN_DIGITS else values
+                   for name, values in track.items()}
+        columns.update({"in_contact": orbit["in_contact"], "altitude_km": np.round(orbit["altitude_km"], 3)})
+
+        # Streaming reductions: only the envelopes at sample steps and
+        # per-realization scalars outlive the block.
+        keep = slice(stride - 1, n, stride)
+        sample_times.append(orbit["time"][keep])
+        for name in ENVELOPE_COLUMNS:
+            # (samples, R), contiguous: the mean then sums each sample's realizations
+            # in the same order whatever the block holds
+            values = np.ascontiguousarray(columns[name][:, keep].T)
+            envelopes[name].append(np.vstack((np.percentile(values, q, axis=1), values.mean(axis=1))))
+        min_battery = np.minimum(min_battery, columns["battery_pct"].min(axis=1))
+        for rule_id, triggered in fdir.conditions_batch(columns).items():
+            triggered = np.broadcast_to(triggered, (realizations, n))
+            fired = np.isnan(first_fire[rule_id]) & triggered.any(axis=1)
+            first_fire[rule_id][fired] = offsets[np.argmax(triggered[fired], axis=1)]
+        done += n
+    wall_sec = time.perf_counter() - t0
+
+    sample_times = np.concatenate(sample_times)
+    sample_offsets = step_sec * np.arange(stride, total + 1, stride, dtype=float)
+    labels = [_percentile_label(p) for p in q]
+
+    def summarize(values) -> dict:
+        return {label: np.round(row, 3).tolist() for label, row in zip(labels + ["mean"], values)}
+
+    rules = []
+    for rule in fdir.rules:
+        fired_at = first_fire[rule["rule_id"]]
+        fired = fired_at[~np.isnan(fired_at)]
+        rules.append({
+            "rule_id": rule["rule_id"],
+            "severity": rule["severity"],
+            "parameter": rule["parameter"],
+            "probability": round(len(fired) / realizations, 4),
+            "cumulative_probability": np.round(
+                np.searchsorted(np.sort(fired), sample_offsets, side="right") / realizations, 4).tolist(),
+            "first_fire_sec": ({label: round(float(v), 1) for label, v in zip(labels, np.percentile(fired, q))}
+                               if len(fired) else None),
+        })
+
+    start = mission_state.current_time
+    return {
+        "realizations": realizations,
+        "seed": seed,
+        "start": start.isoformat(),
+        "end": (start + timedelta(seconds=total * step_sec)).isoformat(),
+        "horizon_sec": total * step_sec,
+        "step_sec": step_sec,
+        "sample_sec": stride * step_sec,
+        "steps": total,
+        "percentiles": q,
+        "dispersions": spec["dispersions"],
+        "time": isoformat_array(sample_times),
+        "envelopes": {name: summarize(np.hstack(parts)) for name, parts in envelopes.items()},
+        "min_battery_pct": {label: round(float(v), 3)
+                            for label, v in zip(labels, np.percentile(min_battery, q))},
+        "fdir": rules,
+        "wall_sec": round(wall_sec, 3),
+    }
+
+
+def _percentile_label(p: float) -> str:
+    return f"p{p:g}"
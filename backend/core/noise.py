@@ -0,0 +1,242 @@
+"""
+DISHA Beta — Noise Streams
+Seeded per-satellite, per-subsystem noise. Each subsystem (power, thermal,
+comms, attitude) of each satellite owns a numpy Generator spawned from
+SeedSequence(seed, spawn_key=(satellite key,)). Uniform [0, 1) samples are
+drawn in blocks of block_size and consumed by index, so a tick costs an
+array lookup, not a generator call.
+
+Every subsystem consumes a fixed number of samples per step in a fixed
+order (NOISE_WIDTH), whatever branch the model takes. A stream is therefore
+one sequence however it is consumed — one tick at a time, or a batch of
+steps under time warp — and a run replays exactly from its seed.
+"""
+
+import zlib
+import numpy as np
+from backend.models.config import get_config
+
+
+SUBSYSTEMS = ("power", "thermal", "comms", "attitude")
+
+# Samples consumed per step: power (solar current, bus voltage), thermal
+# (panel drift, battery drift), comms (SNR), attitude (pointing, rate)
+NOISE_WIDTH = {"power": 2, "thermal": 2, "comms": 1, "attitude": 2}
+
+# Stream key of the primary satellite (constellation members use their NORAD ID)
+PRIMARY_KEY = 0
+
+
+def scale_uniform(u, low: float, high: float):
+    """Map uniform [0, 1) samples onto [low, high) (same arithmetic for scalars and arrays)."""
+    return low + (high - low) * u
+
+
+def satellite_key(key) -> int:
+    """Stable integer spawn key for a satellite ID (NORAD ID or name)."""
+    if isinstance(key, (int, np.integer)):
+        return int(key)
+    return zlib.crc32(str(key).encode())
+
+
+def _noise_config() -> dict:
+    return get_config().get("noise", {})
+
+
+def new_seed() -> int:
+    """Fresh seed from OS entropy, for runs that were not given one (reported so they can be replayed)."""
+    return int(np.random.SeedSequence().entropy % 2**63)
+
+
+def _seed_sequences(seed: int, key) -> list:
+    """One SeedSequence per subsystem for satellite `key`."""
+    return np.random.SeedSequence(seed, spawn_key=(satellite_key(key),)).spawn(len(SUBSYSTEMS))
+
+
+# ====================================================
+# SINGLE SATELLITE
+# ====================================================
+
+class NoiseStream:
+    """
+    Uniform [0, 1) samples from one Generator, pre-generated block_size at
+    a time and consumed by index. next() serves one sample, take() any
+    number in stream order; last is the most recently consumed sample
+    (0.5, i.e. zero noise, before the first).
+    """
+
+    def __init__(self, seed_sequence, block_size: int = 4096):
+        self.generator = np.random.default_rng(seed_sequence)
+        self.block_size = block_size
+        self._refill()
+        self.last = 0.5
+
+    def _refill(self):
+        self._block = self.generator.random(self.block_size)
+        self._values = self._block.tolist()   # plain floats for the per-tick path
+        self._index = 0
+
+    def next(self) -> float:
+        index = self._index
+        if index == self.block_size:
+            self._refill()
+            index = 0
+        self._index = index + 1
+        self.last = u = self._values[index]
+        return u
+
+    def uniform(self, low: float, high: float) -> float:
+        """next() mapped onto [low, high) (inlined: this is the per-tick path)."""
+        index = self._index
+        if index == self.block_size:
+            self._refill()
+            index = 0
+        self._index = index + 1
+        self.last = u = self._values[index]
+        return low + (high - low) * u
+
+    def take(self, shape) -> np.ndarray:
+        """The next prod(shape) samples, in stream order, as an array of that shape."""
+        shape = (shape,) if isinstance(shape, (int, np.integer)) else tuple(shape)
+        count = int(np.prod(shape))
+        end = self._index + count
+        if end <= self.block_size:
+            values = self._block[self._index:end]
+            self._index = end
+        else:
+            # Past the block: the rest of it, then straight from the generator
+            values = np.concatenate((self._block[self._index:],
+                                     self.generator.random(end - self.block_size)))
+            self._refill()
+        if count:
+            self.last = float(values[-1])
+        return values.reshape(shape)
+
+
+class SatelliteNoise:
+    """The four subsystem streams of one satellite (attributes power, thermal, comms, attitude)."""
+
+    def __init__(self, seed: int = None, key=PRIMARY_KEY, block_size: int = None):
+        noise_cfg = _noise_config()
+        if seed is None:
+            seed = noise_cfg.get("seed")
+        self.seed = new_seed() if seed is None else int(seed)
+        self.key = key
+        block_size = block_size or noise_cfg.get("block_size", 4096)
+        for name, seq in zip(SUBSYSTEMS, _seed_sequences(self.seed, key)):
+            setattr(self, name, NoiseStream(seq, block_size))
+
+
+# ====================================================
+# FLEET
+# ====================================================
+
+class NoiseBank:
+    """
+    One subsystem's streams for many satellites: a (rows, block_size) block
+    array and a read index per row, so a vectorized tick draws for any
+    subset of rows with one gather. Each row's samples follow its own
+    Generator exactly as a NoiseStream would.
+    """
+
+    def __init__(self, block_size: int = 4096):
+        self.block_size = block_size
+        self._generators = []
+        self._blocks = np.empty((0, block_size))
+        self._index = np.empty(0, dtype=np.int64)
+        self._last = np.empty(0)
+
+    def __len__(self) -> int:
+        return len(self._generators)
+
+    def add(self, seed_sequence):
+        generator = np.random.default_rng(seed_sequence)
+        self._generators.append(generator)
+        self._blocks = np.vstack((self._blocks, generator.random(self.block_size)))
+        self._index = np.append(self._index, 0)
+        self._last = np.append(self._last, 0.5)
+
+    def remove(self, row: int):
+        del self._generators[row]
+        self._blocks = np.delete(self._blocks, row, axis=0)
+        self._index = np.delete(self._index, row)
+        self._last = np.delete(self._last, row)
+
+    def take(self, rows, width: int) -> np.ndarray:
+        """The next `width` samples of each row: shape (len(rows), width)."""
+        rows = np.arange(len(self))[rows]
+        for row in rows[self._index[rows] + width > self.block_size]:
+            # Keep the unread tail, continue the row's generator behind it
+            tail = self._blocks[row, self._index[row]:]
+            self._blocks[row] = np.concatenate(
+                (tail, self._generators[row].random(self.block_size - len(tail))))
+            self._index[row] = 0
+        start = self._index[rows]
+        values = self._blocks[rows[:, None], start[:, None] + np.arange(width)]
+        self._index[rows] = start + width
+        self._last[rows] = values[:, -1]
+        return values
+
+    def last(self, rows) -> np.ndarray:
+        """Most recently consumed sample of each row (0.5 before the first)."""
+        return self._last[rows]
+
+
+class FleetNoise:
+    """Per-satellite subsystem streams for a FleetState, one NoiseBank per subsystem."""
+
+    def __init__(self, seed: int = None, block_size: int = None):
+        noise_cfg = _noise_config()
+        if seed is None:
+            seed = noise_cfg.get("seed")
+        self.seed = new_seed() if seed is None else int(seed)
+        block_size = block_size or noise_cfg.get("block_size", 4096)
+        for name in SUBSYSTEMS:
+            setattr(self, name, NoiseBank(block_size))
+
+    def add(self, key):
+        for name, seq in zip(SUBSYSTEMS, _seed_sequences(self.seed, key)):
+            getattr(self, name).add(seq)
+
+    def remove(self, row: int):
+        for name in SUBSYSTEMS:
+            getattr(self, name).remove(row)
+
+
+# ====================================================
+# MONTE CARLO REALIZATIONS
+# ====================================================
+
+class RealizationStreams:
+    """
+    One subsystem's streams for R realizations: a Generator per realization,
+    spawned from the subsystem's SeedSequence. take() fills each row
+    straight from its own Generator, so realization r sees the same
+    sequence however the run is blocked and whatever R is.
+    """
+
+    def __init__(self, seed_sequence, realizations: int):
+        self.generators = [np.random.default_rng(seq) for seq in seed_sequence.spawn(realizations)]
+
+    def take(self, shape) -> np.ndarray:
+        """Each realization's next prod(shape[1:]) samples, as an array of shape (R, ...)."""
+        shape = tuple(shape)
+        if shape[0] != len(self.generators):
+            raise ValueError(f"Expected {len(self.generators)} rows, got shape {shape}")
+        values = np.empty(shape)
+        for generator, row in zip(self.generators, values):
+            generator.random(out=row)
+        return values
+
+
+class EnsembleNoise:
+    """
+    Subsystem streams of R independent realizations of one satellite
+    (attributes power, thermal, comms, attitude), for monte_carlo.Ensemble.
+    """
+
+    def __init__(self, seed: int, realizations: int, key=PRIMARY_KEY):
+        self.seed = int(seed)
+        self.key = key
+        for name, seq in zip(SUBSYSTEMS, _seed_sequences(self.seed, key)):
+            setattr(self, name, RealizationStreams(seq, realizations))
@@ -0,0 +1,267 @@
+"""
+DISHA Beta — Pass Scheduler
+Rolling-horizon pass table for the primary satellite, maintained in the
+background. The table is extended incrementally at the horizon edge from
+the ephemeris it was built on, expired passes are pruned, and it is only
+rebuilt when the station set or orbit source changes. Readers slice it by
+binary search on AOS; the telemetry tick uses it as its AOS/LOS timeline.
+"""
+
+import numpy as np
+from functools import partial
+from threading import Lock
+from backend.core.ephemeris import get_ephemeris, get_ephemeris_cache
+from backend.core.flight_dynamics import eci_to_ecef
+from backend.core.ground_stations import (
+    get_stations_version, as_station_network, find_pass, compute_pass_track, select_passes, concat_passes, passes_to_dicts,
+)
+from backend.core.time_services import epoch_seconds
+from backend.models.config import get_config
+
+
+class PassScheduler:
+    """
+    Keeps passes from now to now + horizon_sec (plus up to extend_step_sec
+    of lookahead) for one satellite. update() runs off the event loop; the
+    published table is swapped atomically, so lookups never block on it.
+
+    The ephemeris behind the table is re-propagated from the current state
+    once it is older than one horizon, which bounds its length and the
+    drift between the schedule and the ticking state.
+    """
+
+    def __init__(self, pass_predictor, horizon_hours: float = 24.0,
+                 extend_step_sec: float = 600.0, check_interval_sec: float = 5.0,
+                 contact_margin_sec: float = 5.0):
+        self.pass_predictor = pass_predictor
+        self.horizon_sec = horizon_hours * 3600.0
+        self.extend_step_sec = extend_step_sec
+        self.check_interval_sec = check_interval_sec
+        self.contact_margin_sec = contact_margin_sec
+
+        self._update_lock = Lock()
+        self._source = None       # (orbit source, ephemeris generation, station-set version)
+        self._network = None      # StationNetwork the table was found with
+        self._ephemeris = None
+        self._epoch_sec = 0.0     # ephemeris epoch, epoch seconds
+        self._edge_sec = 0.0      # passes are complete up to this instant
+        # (pass table, its StationNetwork, its ephemeris, version), swapped as one
+        self._published = (None, None, None, 0)
+        self._max_duration = 0.0
+        self.rebuilds = 0
+        self.extensions = 0
+
+    @staticmethod
+    def source_key(mission_state) -> tuple:
+        """Identity of everything the schedule depends on; a change forces a rebuild."""
+        tle = getattr(mission_state, "tle_manager", None)
+        if tle is not None and tle.satrec is not None:
+            orbit = ("tle", tle.tle_line1, tle.tle_line2)
+        else:
+            orbit = ("state", mission_state.cache_key)
+        return (orbit, get_ephemeris_cache().generation, get_stations_version())
+
+    @property
+    def _table(self):
+        return self._published[0]
+
+    @property
+    def version(self) -> int:
+        return self._published[3]
+
+    @property
+    def _step_sec(self) -> float:
+        predictor = self.pass_predictor
+        return predictor.coarse_step_sec if predictor.refine else 10.0
+
+    # ====================================================
+    # MAINTENANCE (background)
+    # ====================================================
+
+    def needs_update(self, source: tuple, now) -> bool:
+        if source != self._source or self._table is None:
+            return True
+        now_sec = epoch_seconds(now)
+        return (self._edge_sec < now_sec + self.horizon_sec
+                or now_sec - self._epoch_sec > self.horizon_sec)
+
+    def update(self, snapshot, source: tuple, stations) -> str:
+        """
+        Bring the table up to now + horizon for a SatelliteSnapshot taken with
+        source_key() and the matching StationNetwork (or station list).
+        Returns "rebuilt", "extended" or "current".
+        """
+        now_sec = epoch_seconds(snapshot.current_time)
+        target_sec = now_sec + self.horizon_sec + self.extend_step_sec
+
+        with self._update_lock:
+            if (source != self._source or self._table is None
+                    or now_sec - self._epoch_sec > self.horizon_sec):
+                self._rebuild(snapshot, source, as_station_network(stations), target_sec - now_sec)
+                return "rebuilt"
+            if self._edge_sec < now_sec + self.horizon_sec:
+                self._extend(target_sec, now_sec)
+                return "extended"
+            return "current"
+
+    def _rebuild(self, snapshot, source: tuple, network, duration_sec: float):
+        ephemeris = get_ephemeris(snapshot, duration_sec)
+        table = self.pass_predictor.find_passes(ephemeris, 0.0, duration_sec, network)
+
+        self._ephemeris = ephemeris
+        self._epoch_sec = epoch_seconds(ephemeris.epoch)
+        self._edge_sec = self._epoch_sec + duration_sec
+        self._network = network
+        self._source = source
+        self._publish(table, network, ephemeris)
+        self.rebuilds += 1
+
+    def _extend(self, target_sec: float, now_sec: float):
+        """
+        Scan only the new stretch of horizon. The scan restarts one step
+        before the earliest pass still open at the old edge (aligned to the
+        original sampling grid), so open passes are re-found whole; passes
+        the new scan sees already in view at its start are complete in the
+        old table and are kept from there.
+        """
+        table, step = self._table, self._step_sec
+        restart_sec = self._edge_sec
+        if table["open"].any():
+            restart_sec = min(restart_sec, table["aos"][table["open"]].min() - step)
+        restart = max(0.0, np.floor((restart_sec - self._epoch_sec) / step) * step)
+        target = target_sec - self._epoch_sec
+
+        get_ephemeris_cache().extend(self._ephemeris, target)
+        new = self.pass_predictor.find_passes(self._ephemeris, restart, target, self._network)
+        new = select_passes(new, ~new["clamped_start"])
+
+        old = select_passes(table, (table["aos"] < self._epoch_sec + restart) & (table["los"] >= now_sec))
+        merged = concat_passes(old, new)
+        self._edge_sec = target_sec
+        self._publish(select_passes(merged, np.argsort(merged["aos"], kind="stable")))
+        self.extensions += 1
+
+    def _publish(self, table: dict, network=None, ephemeris=None):
+        self._max_duration = float(table["duration_sec"].max()) if len(table["aos"]) else 0.0
+        _, old_network, old_ephemeris, version = self._published
+        self._published = (table, old_network if network is None else network,
+                           old_ephemeris if ephemeris is None else ephemeris, version + 1)
+
+    # ====================================================
+    # QUERIES (O(log n) + result size)
+    # ====================================================
+
+    def lookup(self, mission_state, duration_hours: float = None):
+        """
+        (table, key) for passes overlapping [now, now + duration_hours], or
+        None when the schedule is not current for this satellite/station set
+        or does not reach that far. key identifies the exact result (for the
+        result cache / ETag).
+        """
+        table, _, _, version = self._published
+        if table is None or self.source_key(mission_state) != self._source:
+            return None
+        duration_sec = self.horizon_sec if duration_hours is None else duration_hours * 3600.0
+        t_from = epoch_seconds(mission_state.current_time)
+        t_to = t_from + duration_sec
+        if t_to > self._edge_sec:
+            return None
+
+        idx = self._window(table, t_from, t_to)
+        return select_passes(table, idx), ("pass_schedule", version, idx.tobytes())
+
+    def next_contact(self, mission_state) -> dict:
+        """Current pass (if any) and the next AOS from now, from the schedule."""
+        found = self.lookup(mission_state)
+        if found is None:
+            return {"status": "PENDING", "current_pass": None, "next_pass": None}
+        table, _ = found
+        t_now = epoch_seconds(mission_state.current_time)
+        passes = passes_to_dicts(table)
+        in_view = np.flatnonzero(table["aos"] <= t_now)
+        upcoming = np.flatnonzero(table["aos"] > t_now)
+        current = passes[in_view[np.argmax(table["los"][in_view])]] if len(in_view) else None
+        nxt = passes[upcoming[0]] if len(upcoming) else None
+        return {
+            "status": "SUCCESS",
+            "current_pass": current,
+            "next_pass": nxt,
+            "seconds_to_aos": round(float(table["aos"][upcoming[0]] - t_now), 1) if nxt else None,
+        }
+
+    def contact_at(self, mission_state) -> dict:
+        """
+        check_contact_now() driven by the schedule: outside every scheduled
+        pass no station geometry is evaluated at all, inside one only the
+        stations with a pass around now are. Returns None when the schedule
+        is not current for this satellite/station set or does not cover now,
+        so the caller falls back to the full station scan.
+        """
+        table, network, _, _ = self._published
+        if table is None or self.source_key(mission_state) != self._source:
+            return None
+        t_now = epoch_seconds(mission_state.current_time)
+        if t_now > self._edge_sec:
+            return None
+
+        # Passes are timed on the schedule's ephemeris, the tick on the live
+        # propagator; the margin absorbs the difference (and one scan step
+        # when passes are not refined).
+        margin = self.contact_margin_sec + (0.0 if self.pass_predictor.refine else self._step_sec)
+        aos = table["aos"]
+        lo = np.searchsorted(aos, t_now - self._max_duration - margin, side="left")
+        hi = np.searchsorted(aos, t_now + margin, side="right")
+        near = lo + np.flatnonzero(table["los"][lo:hi] >= t_now - margin)
+        if not len(near):
+            return {"in_contact": False, "station": None, "elevation_deg": 0.0}
+
+        rows = np.unique(table["station"][near])
+        r_ecef = eci_to_ecef(mission_state.position, mission_state.current_time)
+        return network.contacts(r_ecef, rows)[0]
+
+    def pass_track(self, mission_state, station_name: str, aos_sec: float, step_sec: float = 1.0):
+        """
+        (compute, key) for a scheduled pass. compute() samples its track from
+        a snapshot of the ephemeris the schedule was found on, so it can run
+        off the event loop while the background update extends the schedule;
+        compute is None if no such pass is scheduled. None when the schedule
+        is not current for this satellite/station set.
+        """
+        table, network, ephemeris, version = self._published
+        if table is None or self.source_key(mission_state) != self._source:
+            return None
+        j = find_pass(table, station_name, aos_sec)
+        if j is None:
+            return None, None
+        key = ("pass_track", version, station_name, float(table["aos"][j]), float(step_sec))
+        return partial(compute_pass_track, ephemeris.snapshot(), network, table, j, step_sec), key
+
+    def _window(self, table: dict, t_from: float, t_to: float) -> np.ndarray:
+        """Indices of passes with AOS < t_to and LOS >= t_from, above the minimum duration."""
+        aos = table["aos"]
+        lo = np.searchsorted(aos, t_from - self._max_duration, side="left")
+        hi = np.searchsorted(aos, t_to, side="left")
+        keep = ((table["los"][lo:hi] >= t_from)
+                & (table["duration_sec"][lo:hi] >= self.pass_predictor.min_duration_sec))
+        return lo + np.flatnonzero(keep)
+
+    def stats(self) -> dict:
+        table = self._table
+        return {
+            "version": self.version,
+            "passes": 0 if table is None else len(table["aos"]),
+            "horizon_hours": self.horizon_sec / 3600.0,
+            "rebuilds": self.rebuilds,
+            "extensions": self.extensions,
+        }
+
+
+def build_pass_scheduler(pass_predictor) -> PassScheduler:
+    sched_cfg = get_config().get("pass_schedule", {})
+    return PassScheduler(
+        pass_predictor,
+        horizon_hours=sched_cfg.get("horizon_hours", 24.0),
+        extend_step_sec=sched_cfg.get("extend_step_sec", 600.0),
+        check_interval_sec=sched_cfg.get("check_interval_sec", 5.0),
+        contact_margin_sec=sched_cfg.get("contact_margin_sec", 5.0),
+    )
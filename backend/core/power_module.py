@@ -5,7 +5,7 @@ Consolidates power_prediction + power_projection.
 """
 
 import numpy as np
-from backend.core.flight_dynamics import propagate_orbit, predict_eclipse_simple
+from backend.core.eclipse import get_eclipse_timeline
 from backend.models.constants import EARTH_RADIUS_KM
 from backend.models.config import get_config
 
@@ -43,7 +43,7 @@ def predict_power(mission_state, duration_minutes: int = 90, step_minutes: int =
                   scheduled_tasks: list = None) -> dict:
     """
     90-minute SOC prediction curve with eclipse model.
-    Takes current state + orbit prediction → steps through eclipse/sunlit transitions.
+    Eclipse state per step comes from the shared shadow-interval timeline.
 
     Returns dict with prediction_points, storage_prediction_points, min_soc_pct, etc.
     """
@@ -53,15 +53,11 @@ def predict_power(mission_state, duration_minutes: int = 90, step_minutes: int =
     battery_capacity_wh = pcfg["battery_wh"]
     task_loads = pcfg["task_loads"]
 
-    initial_state = {
-        "position": mission_state.position.tolist() if hasattr(mission_state.position, 'tolist') else list(mission_state.position),
-        "velocity": mission_state.velocity.tolist() if hasattr(mission_state.velocity, 'tolist') else list(mission_state.velocity),
-        "epoch": mission_state.current_time,
-    }
-
     duration_sec = duration_minutes * 60
     step_sec = step_minutes * 60
-    trajectory = propagate_orbit(initial_state, duration_sec, step_size=step_sec)
+    time_offsets = np.arange(0, duration_sec, step_sec, dtype=float)
+    timeline = get_eclipse_timeline(mission_state, duration_sec)
+    eclipse_mask = timeline.in_eclipse(timeline.offset(mission_state.current_time) + time_offsets)
 
     # Build task load/data maps
     task_load_map = {}
@@ -84,14 +80,11 @@ def predict_power(mission_state, duration_minutes: int = 90, step_minutes: int =
     storage_predictions = []
     min_soc = current_soc_wh
 
-    for step in trajectory:
-        t_offset = step["time_offset"]
-        t_min = round(t_offset / 60.0, 1)
+    for t_offset, in_eclipse in zip(time_offsets, eclipse_mask):
+        t_min = round(float(t_offset) / 60.0, 1)
         t_min_int = int(t_min)
-        r_eci = step["eci_state"][:3]
-        r_list = r_eci.tolist() if hasattr(r_eci, 'tolist') else list(r_eci)
 
-        in_eclipse = predict_eclipse_simple(r_list)
+        in_eclipse = bool(in_eclipse)
         solar_gen = 0.0 if in_eclipse else solar_w
         task_extra_w = task_load_map.get(t_min_int, 0)
         load_w = base_load_w + task_extra_w
@@ -134,9 +127,22 @@ def predict_power(mission_state, duration_minutes: int = 90, step_minutes: int =
     }
 
 
-def project_power(mission_state) -> dict:
+def _eclipse_segments(timeline, t0: float, t1: float):
+    """(start, end, in_eclipse) runs covering [t0, t1], cut at the timeline's shadow boundaries."""
+    cuts = np.concatenate(([t0], timeline.starts, timeline.ends, [t1]))
+    cuts = np.unique(cuts[(cuts >= t0) & (cuts <= t1)])
+    mids = (cuts[:-1] + cuts[1:]) / 2.0
+    return zip(cuts[:-1], cuts[1:], timeline.in_eclipse(mids))
+
+
+def project_power(mission_state, method: str = "j2_secular") -> dict:
     """
     Project battery % at next eclipse and end of next orbit.
+    Integrates charge/discharge piecewise between the eclipse boundaries of
+    the shared shadow timeline service, so milestone times are exact rather
+    than snapped to a sampling grid. Milestones only need approximate
+    geometry, so the timeline is built on the analytic J2 secular model by
+    default; pass method=None for the cached HPOP ephemeris the tick uses.
     Returns milestone projections + warnings.
     """
     pcfg = _get_power_config()
@@ -144,49 +150,31 @@ def project_power(mission_state) -> dict:
     discharge_rate = pcfg["base_load_w"] / 60.0
     battery_capacity_wh = pcfg["battery_wh"]
 
-    initial_state = {
-        "position": mission_state.position.tolist() if hasattr(mission_state.position, 'tolist') else list(mission_state.position),
-        "velocity": mission_state.velocity.tolist() if hasattr(mission_state.velocity, 'tolist') else list(mission_state.velocity),
-        "epoch": mission_state.current_time,
-    }
-
     duration_sec = 6000  # 100 minutes
-    step_sec = 30
-    trajectory = propagate_orbit(initial_state, duration_sec, step_size=step_sec)
+    timeline = get_eclipse_timeline(mission_state, duration_sec, method)
+    t_now = timeline.offset(mission_state.current_time)
 
     current_battery_wh = mission_state.current_battery_wh
     battery_pct = round((current_battery_wh / battery_capacity_wh) * 100, 2)
 
-    r_eci_now = mission_state.position.tolist() if hasattr(mission_state.position, 'tolist') else list(mission_state.position)
-    in_eclipse_now = predict_eclipse_simple(r_eci_now)
+    in_eclipse_now = timeline.in_eclipse(t_now)
     current_mode = "ECLIPSE" if in_eclipse_now else "SUNLIT"
 
     sim_battery_wh = current_battery_wh
-    prev_eclipse = in_eclipse_now
-    eclipse_transition_found = False
     projected_at_eclipse = None
     time_to_eclipse_min = None
 
-    for step in trajectory:
-        t_offset = step["time_offset"]
-        t_min = t_offset / 60.0
-        r_eci = step["eci_state"][:3]
-        r_list = r_eci.tolist() if hasattr(r_eci, 'tolist') else list(r_eci)
-        in_eclipse = predict_eclipse_simple(r_list)
-
-        step_min = step_sec / 60.0
+    for seg_start, seg_end, in_eclipse in _eclipse_segments(timeline, t_now, t_now + duration_sec):
+        seg_min = float(seg_end - seg_start) / 60.0
         if in_eclipse:
-            sim_battery_wh = max(0, sim_battery_wh - discharge_rate * step_min)
+            # First sunlit → eclipse transition
+            if projected_at_eclipse is None and seg_start > t_now:
+                projected_at_eclipse = round((sim_battery_wh / battery_capacity_wh) * 100, 2)
+                time_to_eclipse_min = round(float(seg_start - t_now) / 60.0, 1)
+            sim_battery_wh = max(0, sim_battery_wh - discharge_rate * seg_min)
         else:
             sim_battery_wh = min(battery_capacity_wh,
-                                 sim_battery_wh + (charge_rate - discharge_rate) * step_min)
-
-        if not eclipse_transition_found and not prev_eclipse and in_eclipse:
-            eclipse_transition_found = True
-            projected_at_eclipse = round((sim_battery_wh / battery_capacity_wh) * 100, 2)
-            time_to_eclipse_min = round(t_min, 1)
-
-        prev_eclipse = in_eclipse
+                                 sim_battery_wh + (charge_rate - discharge_rate) * seg_min)
 
     projected_at_orbit = round((sim_battery_wh / battery_capacity_wh) * 100, 2)
 
@@ -0,0 +1,112 @@
+"""
+DISHA Beta — Result Cache
+Single-flight request coalescing plus a TTL/LRU cache for expensive REST
+results (passes, power prediction/projection). Keys carry the satellite
+state version, ephemeris generation and station-set version, so an entry
+is only ever served for exactly the state it was computed from.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from backend.models.config import get_config
+
+
+class ResultCache:
+    """
+    Keyed async result cache. Concurrent callers with the same key share
+    one in-flight computation, run as a task the cache owns, so cancelling
+    one caller never cancels it for the others. Finished results live for
+    ttl_sec, at most max_entries of them, least recently used evicted
+    first. Failures are propagated to every waiter and never cached.
+
+    Runs on the event loop only — no locking.
+    """
+
+    def __init__(self, ttl_sec: float = 10.0, max_entries: int = 128):
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._inflight = {}             # key -> asyncio.Task
+        self._nonce = os.urandom(8).hex()  # keeps ETags unique across restarts
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.not_modified = 0
+
+    def etag(self, key) -> str:
+        """Strong ETag for a key — the key fully determines the result."""
+        digest = hashlib.blake2b(repr((self._nonce, key)).encode(), digest_size=12).hexdigest()
+        return f'"{digest}"'
+
+    async def get_or_compute(self, key, compute):
+        """Return the cached value for key, or await compute() once for all concurrent callers."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # The computation belongs to the cache, not to the first caller:
+            # every caller awaits it shielded, so a cancelled request only
+            # stops its own wait and the others still get the result.
+            task = asyncio.ensure_future(self._compute(key, compute))
+            task.add_done_callback(_retrieve_exception)
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _compute(self, key, compute):
+        try:
+            value = await compute()
+        finally:
+            self._inflight.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl_sec, value)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_sec": self.ttl_sec,
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "not_modified": self.not_modified,
+        }
+
+
+def _retrieve_exception(task):
+    # Mark a failure retrieved when every waiter was cancelled before it
+    if not task.cancelled():
+        task.exception()
+
+
+def _build_cache() -> ResultCache:
+    cache_cfg = get_config().get("result_cache", {})
+    return ResultCache(
+        ttl_sec=cache_cfg.get("ttl_sec", 10.0),
+        max_entries=cache_cfg.get("max_entries", 128),
+    )
+
+
+# Shared process-wide cache
+_cache = _build_cache()
+
+
+def get_result_cache() -> ResultCache:
+    return _cache
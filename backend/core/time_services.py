@@ -0,0 +1,161 @@
+"""
+DISHA Beta — Time Services
+Float Julian-date time base for the simulation clock.
+Vectorized GMST and sun vector over JD arrays, plus a memoized per-epoch
+lookup so everything that asks about the same instant within a tick
+(orbit transforms, ground contact, eclipse) shares one computation.
+"""
+
+import math
+import numpy as np
+from collections import namedtuple
+from datetime import datetime, timezone
+from functools import lru_cache
+
+SECONDS_PER_DAY = 86400.0
+JD_J2000 = 2451545.0
+JD_UNIX_EPOCH = 2440587.5
+AU_KM = 149597870.7
+
+
+# ====================================================
+# JULIAN DATES
+# ====================================================
+
+@lru_cache(maxsize=256)
+def julian_date(dt: datetime) -> float:
+    """UTC datetime → Julian Date (memoized; the tick asks for the same instant repeatedly)."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+
+    UT = dt.hour + (dt.minute / 60) + ((dt.second + dt.microsecond / 1e6) / 3600)
+    ee = math.floor((dt.month + 9) / 12)
+
+    return (367 * dt.year) \
+        - math.floor((7 * (dt.year + ee)) / 4) \
+        + math.floor((275 * dt.month) / 9) \
+        + dt.day + 1721013.5 + (UT / 24)
+
+
+def julian_dates(epoch, time_offsets) -> np.ndarray:
+    """Julian Dates for second offsets from an epoch (datetime or float JD)."""
+    jd0 = epoch if isinstance(epoch, float) else julian_date(epoch)
+    return jd0 + np.asarray(time_offsets, dtype=float) / SECONDS_PER_DAY
+
+
+# ====================================================
+# EPOCH SECONDS (internal float64 timeline)
+# ====================================================
+# Internally, instants are float64 seconds since 1970-01-01 UTC held in
+# NumPy arrays; datetimes/ISO strings are produced only when serializing.
+
+def epoch_seconds(dt: datetime) -> float:
+    """UTC datetime → float64 seconds since the Unix epoch (naive = UTC)."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def epoch_seconds_to_jd(t) -> np.ndarray:
+    return JD_UNIX_EPOCH + np.asarray(t, dtype=float) / SECONDS_PER_DAY
+
+
+def to_datetime(t: float) -> datetime:
+    return datetime.fromtimestamp(float(t), tz=timezone.utc)
+
+
+def isoformat(t: float) -> str:
+    """Single epoch-seconds value → ISO 8601 string (UTC)."""
+    return to_datetime(t).isoformat()
+
+
+def isoformat_array(t) -> list:
+    """
+    Vectorized epoch seconds → ISO 8601 strings (UTC), formatted as
+    isoformat() formats each value: microseconds only when non-zero.
+    """
+    t = np.asarray(t, dtype=float)
+    whole = np.floor(t)   # round the fraction alone, as datetime.fromtimestamp does
+    us = whole.astype(np.int64) * 1000000 + np.round((t - whole) * 1e6).astype(np.int64)
+    stamps = us.astype("datetime64[us]")
+    strings = np.where(us % 1000000 == 0, np.datetime_as_string(stamps, unit="s"),
+                       np.datetime_as_string(stamps, unit="us"))
+    return [s + "+00:00" for s in strings.tolist()]
+
+
+# ====================================================
+# VECTORIZED GMST / SUN
+# ====================================================
+
+def gmst(jd) -> np.ndarray:
+    """Greenwich Mean Sidereal Time (rad, IAU formula) for scalar or array JD."""
+    JD = np.asarray(jd, dtype=float)
+
+    JD_mid = np.floor(JD) + 0.5
+    UT = (JD - JD_mid) * SECONDS_PER_DAY
+
+    t = (JD - JD_J2000) / 36525.0
+    t0 = (JD_mid - JD_J2000) / 36525.0
+
+    GMST1 = 24110.54841 + 8640184.812866 * t0 + 1.002737909350795 * UT + 0.093104 * t**2 - 0.0000062 * t**3
+
+    GMST0 = np.mod(GMST1, SECONDS_PER_DAY)
+    return np.deg2rad(GMST0 / 240.0)
+
+
+def sun_vector(jd) -> np.ndarray:
+    """Approximate sun position in ECI (km) for Julian Dates. Returns (N,3)."""
+    JD = np.atleast_1d(np.asarray(jd, dtype=float))
+    T = (JD - JD_J2000) / 36525.0
+
+    # Mean longitude and anomaly of the Sun
+    L0 = 280.46646 + 36000.76983 * T  # degrees
+    M = 357.52911 + 35999.05029 * T   # degrees
+    M_rad = np.radians(np.mod(M, 360))
+
+    # Equation of center
+    C = (1.914602 - 0.004817 * T) * np.sin(M_rad) + \
+        0.019993 * np.sin(2 * M_rad)
+
+    # Sun's true longitude and obliquity
+    sun_lon = np.radians(np.mod(L0 + C, 360))
+    obliquity = np.radians(23.439 - 0.0000004 * T)
+
+    # Distance in AU, convert to km
+    r_au = 1.00014 - 0.01671 * np.cos(M_rad) - 0.00014 * np.cos(2 * M_rad)
+    r_km = r_au * AU_KM
+
+    # ECI coordinates
+    x = r_km * np.cos(sun_lon)
+    y = r_km * np.sin(sun_lon) * np.cos(obliquity)
+    z = r_km * np.sin(sun_lon) * np.sin(obliquity)
+
+    return np.stack((x, y, z), axis=-1)
+
+
+# ====================================================
+# PER-EPOCH CACHE
+# ====================================================
+
+EpochInfo = namedtuple("EpochInfo", ["jd", "gmst", "sun"])
+
+
+@lru_cache(maxsize=64)
+def epoch_info(dt: datetime) -> EpochInfo:
+    """
+    JD, GMST and sun vector for one instant, computed once and shared.
+    The returned sun array is read-only since it is handed to every caller.
+    """
+    jd = julian_date(dt)
+    sun = sun_vector(jd)[0]
+    sun.flags.writeable = False
+    return EpochInfo(jd, float(gmst(jd)), sun)
+
+
+def cache_stats() -> dict:
+    jd_info = julian_date.cache_info()
+    ep_info = epoch_info.cache_info()
+    return {
+        "julian_date": {"hits": jd_info.hits, "misses": jd_info.misses},
+        "epoch_info": {"hits": ep_info.hits, "misses": ep_info.misses},
+    }
@@ -0,0 +1,297 @@
+"""
+DISHA Beta — Time Warp
+Batched multi-step advance of the primary satellite for accelerated and
+headless simulation. One call covers n_steps fixed steps: the orbit is
+propagated for all of them at once (batched SGP4, or the ephemeris for the
+simulated orbit), eclipse and ground contact are evaluated per step as
+arrays, and the MissionState subsystem models run along the time axis.
+The per-step telemetry columns it returns feed the batched FDIR and
+constraint checks, so nothing that happens between broadcast frames is lost.
+"""
+
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from backend.core.eclipse import get_eclipse_timeline
+from backend.core.ephemeris import get_ephemeris
+from backend.core.flight_dynamics import eci_to_ecef_batch, ecef_to_lla_batch
+from backend.core.mission_state import next_state_version
+from backend.core.noise import NOISE_WIDTH, scale_uniform
+from backend.core.time_services import epoch_seconds, epoch_seconds_to_jd
+from backend.models.constants import EARTH_RADIUS_KM
+
+
+# Rounding of the per-step telemetry columns, as in MissionState.get_state()
+COLUMN_DIGITS = {
+    "battery_wh": 2, "battery_pct": 2, "bus_voltage": 2, "solar_panel_current_a": 2,
+    "current_draw": 2, "storage_pct": 2, "component_temp": 1, "battery_temp": 1,
+    "snr": 1, "data_rate": 1, "pointing_error": 3, "angular_rate": 4,
+}
+
+
+# ====================================================
+# SEQUENCE PRIMITIVES
+# ====================================================
+
+def bounded_cumsum(x0, increments, lo: float, hi: float) -> np.ndarray:
+    """
+    x[k] = clip(x[k-1] + increments[k], lo, hi) from x[-1] = x0 along the
+    last axis, without a per-step loop; leading axes are independent paths
+    (x0 broadcasts over them). Until a path reaches the opposite bound it is
+    a walk reflected at one bound only, which has the closed form
+    x0 + S_k + max(0, max_j<=k (lo - x0 - S_j)) (mirrored for hi); one
+    array pass per crossing from one bound to the other.
+    """
+    d = np.asarray(increments, dtype=float)
+    shape = d.shape
+    d = d.reshape(-1, shape[-1])
+    m, n = d.shape
+    x = np.clip(np.broadcast_to(np.asarray(x0, dtype=float), shape[:-1]).reshape(m), lo, hi)
+    csum = np.cumsum(d, axis=1)
+    out = np.empty((m, n))
+    start = np.zeros(m, dtype=int)
+    at_floor = x - lo <= hi - x   # either bound is correct; the nearer one usually needs one pass
+    step = np.arange(n)
+
+    pending = np.arange(m)
+    while len(pending):
+        carried = []
+        for floor in (True, False):
+            rows = pending[at_floor[pending] == floor]
+            if not len(rows):
+                continue
+            path, j = _reflected_walk(x[rows], csum[rows], start[rows], floor, lo, hi)
+            if j.min() == n and not start[rows].any():
+                out[rows] = path
+                continue
+            keep = (step >= start[rows, None]) & (step < j[:, None])
+            out[rows] = np.where(keep, path, out[rows])
+
+            hit = j < n
+            rows, j = rows[hit], j[hit]
+            out[rows, j] = x[rows] = hi if floor else lo
+            start[rows] = j + 1
+            at_floor[rows] = not floor
+            carried.append(rows[start[rows] < n])
+        pending = np.concatenate(carried) if carried else pending[:0]
+    return out.reshape(shape)
+
+
+def _reflected_walk(x, csum, start, floor: bool, lo: float, hi: float):
+    """
+    Rows continuing from x at step start, reflected at lo (floor) or hi
+    only. Returns the paths and each row's first step past the opposite
+    bound (n if none); steps before start are meaningless.
+    """
+    n = csum.shape[1]
+    offset = x - np.where(start > 0, csum[np.arange(len(start)), start - 1], 0.0)
+    s = csum + offset[:, None]
+    if start.any():
+        s[np.arange(n) < start[:, None]] = lo if floor else hi   # neutral: no push, no escape
+    if floor:
+        path = s + np.maximum(np.maximum.accumulate(lo - s, axis=1), 0.0)
+        escaped = path > hi
+    else:
+        path = s - np.maximum(np.maximum.accumulate(s - hi, axis=1), 0.0)
+        escaped = path < lo
+    return path, np.where(escaped.any(axis=1), np.argmax(escaped, axis=1), n)
+
+
+def latch(initial, set_mask, clear_mask) -> np.ndarray:
+    """
+    Set/reset flip-flop along the last axis: each step holds the last event
+    so far (initial, broadcast over leading axes, before the first).
+    """
+    set_mask = np.asarray(set_mask, dtype=bool)
+    event = set_mask | np.asarray(clear_mask, dtype=bool)
+    last = np.maximum.accumulate(np.where(event, np.arange(set_mask.shape[-1]), -1), axis=-1)
+    held = np.take_along_axis(set_mask, np.maximum(last, 0), axis=-1)
+    return np.where(last >= 0, held, np.asarray(initial, dtype=bool)[..., None])
+
+
+# ====================================================
+# BATCHED ADVANCE
+# ====================================================
+
+def orbit_track(mission_state, offsets, network) -> dict:
+    """
+    The deterministic part of n steps at current_time + offsets: ECI
+    states, LLA, eclipse and ground contact against the StationNetwork.
+    Does not modify mission_state (a SatelliteSnapshot works as well).
+    """
+    ms = mission_state
+    offsets = np.asarray(offsets, dtype=float)
+    times = epoch_seconds(ms.current_time) + offsets
+
+    tle = ms.tle_manager
+    if tle is not None and tle.satrec is not None:
+        r, v, errors = tle.propagate_offsets(ms.current_time, offsets)
+        if errors.any():
+            raise RuntimeError(f"SGP4 error code {int(errors[errors != 0][0])}")
+    else:
+        states = get_ephemeris(ms, offsets[-1]).states_at(offsets)
+        r, v = states[:, :3], states[:, 3:]
+
+    r_ecef = eci_to_ecef_batch(r, epoch_seconds_to_jd(times))
+    timeline = get_eclipse_timeline(ms, offsets[-1])
+    contacts = network.contacts(r_ecef)
+    return {
+        "time": times,
+        "position": r,
+        "velocity": v,
+        "lla": ecef_to_lla_batch(r_ecef),
+        "altitude_km": np.linalg.norm(r, axis=1) - EARTH_RADIUS_KM,
+        "in_eclipse": np.asarray(timeline.in_eclipse(timeline.offset(times)), dtype=bool),
+        "in_contact": np.array([c["in_contact"] for c in contacts], dtype=bool),
+        "contact_elevation_deg": np.array([c["elevation_deg"] for c in contacts], dtype=float),
+        "contacts": contacts,
+    }
+
+
+def advance(mission_state, n_steps: int, step_sec: float, network) -> dict:
+    """
+    Advance mission_state by n_steps × step_sec, equivalent to n_steps
+    tick(step_sec) + update_contact() calls, and leave it in the state of
+    the last step. Contact is checked against the StationNetwork at every
+    step. Returns {"time": epoch seconds (n,), "columns": per-step telemetry
+    arrays named like get_state() fields, "contact_acquired": bool}.
+    """
+    ms = mission_state
+    offsets = step_sec * np.arange(1, n_steps + 1, dtype=float)
+
+    # 1. Flight dynamics, eclipse and contact: every step in one call
+    track = orbit_track(ms, offsets, network)
+    r, v, lla, altitude = track["position"], track["velocity"], track["lla"], track["altitude_km"]
+    eclipse, in_contact, contacts = track["in_eclipse"], track["in_contact"], track["contacts"]
+    elevation = track["contact_elevation_deg"]
+
+    # 2. Subsystems along the time axis
+    columns = _subsystem_columns(ms, eclipse, in_contact, elevation, step_sec)
+
+    # 3. Final state = last step
+    ms.current_time += timedelta(seconds=float(offsets[-1]))
+    ms.state_version = next_state_version()
+    ms.position, ms.velocity = r[-1].copy(), v[-1].copy()
+    ms.latitude, ms.longitude = float(lla[-1, 0]), float(lla[-1, 1])
+    ms.altitude_km = float(altitude[-1])
+    ms.in_eclipse = bool(eclipse[-1])
+
+    was_in_contact = ms.in_contact
+    acquired = in_contact & ~np.concatenate(([was_in_contact], in_contact[:-1]))
+    seen = np.flatnonzero(in_contact)
+    if len(seen):
+        last = seen[-1]
+        ms.last_contact_time = ms.current_time - timedelta(seconds=float(offsets[-1] - offsets[last]))
+        ms.blackout_duration_sec = float((n_steps - 1 - last) * step_sec)
+        ms.nearest_station = contacts[last]["station"] or ms.nearest_station
+    else:
+        ms.blackout_duration_sec += n_steps * step_sec
+    ms.in_contact = bool(in_contact[-1])
+    ms.contact_station = contacts[-1]["station"]
+    ms.contact_elevation_deg = contacts[-1]["elevation_deg"]
+
+    ms.last_updated = datetime.now(timezone.utc)
+    ms.panel_temp_c = ms.component_temp
+    ms.battery_temp_c = ms.battery_temp
+    ms.solar_panel_current_a = ms.solar_panel_current
+    ms.current_storage_used_gb = ms.storage_used_mb / 1024.0
+
+    columns.update({
+        "latitude": np.round(lla[:, 0], 6),
+        "longitude": np.round(lla[:, 1], 6),
+        "altitude_km": np.round(altitude, 3),
+        "in_eclipse": eclipse,
+        "in_contact": in_contact,
+        "contact_elevation_deg": elevation,
+    })
+    return {"time": track["time"], "columns": columns, "contact_acquired": bool(acquired.any())}
+
+
+def subsystem_track(state, eclipse, in_contact, elevation, step_sec: float) -> dict:
+    """
+    MissionState._update_power/_thermal/_comms/_attitude over n steps as
+    array operations along the last axis. state is a MissionState, or an
+    object with the same fields as (R,) arrays and a SatelliteNoise (R
+    independent realizations, see monte_carlo.Ensemble), giving (R, n)
+    tracks. Noise is taken from the streams exactly as n ticks would. eclipse,
+    in_contact and elevation are the shared (n,) orbit columns. Values are
+    unrounded; state is not modified.
+    """
+    col = lambda value: np.asarray(value, dtype=float)[..., None]
+    shape = np.broadcast_shapes(np.shape(state.current_battery_wh) + (1,), np.shape(eclipse))
+    # Per-step samples in stream order (NOISE_WIDTH), as tick() consumes them
+    noise = {name: getattr(state.noise, name).take(shape + (width,)) for name, width in NOISE_WIDTH.items()}
+
+    # Power
+    base_load = col(state.base_load_w)
+    solar_current = np.where(eclipse, 0.0, 1.5 + 0.2 * scale_uniform(noise["power"][..., 0], -1, 1))
+    net_power = np.where(eclipse, -base_load, col(state.solar_array_output_w) - base_load)
+    battery_wh = bounded_cumsum(state.current_battery_wh, net_power * (step_sec / 3600.0),
+                                0.0, state.battery_capacity_wh)
+    bus_voltage = 12.0 + scale_uniform(noise["power"][..., 1], -0.3, 0.3)
+    current_draw = base_load / np.maximum(bus_voltage, 1.0)
+
+    # Thermal (the heater acts on the unclipped temperature, as in _update_thermal)
+    scale = step_sec / 60.0
+    u = noise["thermal"][..., 0]
+    drift = np.where(eclipse, scale_uniform(u, -0.5, 0.0), scale_uniform(u, -0.2, 0.5)) * scale
+    component_temp = bounded_cumsum(state.component_temp, drift, -50.0, 100.0)
+    previous = np.concatenate((np.broadcast_to(col(state.component_temp), shape[:-1] + (1,)),
+                               component_temp[..., :-1]), axis=-1)
+    unclipped = previous + drift
+    heater = latch(state.heater_active, eclipse & (unclipped < -20), ~eclipse & (unclipped > 10))
+    battery_temp = bounded_cumsum(state.battery_temp, scale_uniform(noise["thermal"][..., 1], -0.1, 0.1) * scale,
+                                  -10.0, 55.0)
+
+    # Comms (state after update_contact for the step's contact)
+    snr = np.where(in_contact, 8.0 + (elevation / 90.0) * 12.0 + scale_uniform(noise["comms"][..., 0], -0.5, 0.5),
+                   0.0)
+    data_rate = np.where(in_contact, np.where(snr >= 12, 256.0, 64.0), 0.0)
+
+    # Attitude
+    pointing_error = np.maximum(0.0, 0.1 + 0.05 * scale_uniform(noise["attitude"][..., 0], -1, 1))
+    angular_rate = np.maximum(0.0, 0.01 + 0.005 * scale_uniform(noise["attitude"][..., 1], -1, 1))
+
+    capacity_mb = state.storage_capacity_mb
+    storage_pct = col(state.storage_used_mb) / capacity_mb * 100 if capacity_mb > 0 else np.zeros(1)
+    return {
+        "battery_wh": battery_wh,
+        "battery_pct": battery_wh / col(state.battery_capacity_wh) * 100,
+        "bus_voltage": bus_voltage,
+        "solar_panel_current_a": solar_current,
+        "current_draw": current_draw,
+        "storage_pct": np.broadcast_to(storage_pct, shape),
+        "component_temp": component_temp,
+        "battery_temp": battery_temp,
+        "heater_active": heater,
+        "snr": snr,
+        "data_rate": data_rate,
+        "pointing_error": pointing_error,
+        "angular_rate": angular_rate,
+    }
+
+
+def _subsystem_columns(ms, eclipse: np.ndarray, in_contact: np.ndarray, elevation: np.ndarray,
+                       step_sec: float) -> dict:
+    """subsystem_track() for the MissionState: stores the last step on ms and returns
+    the per-step values rounded as in get_state()."""
+    track = subsystem_track(ms, eclipse, in_contact, elevation, step_sec)
+
+    ms.solar_panel_current = float(track["solar_panel_current_a"][-1])
+    ms.current_battery_wh = float(track["battery_wh"][-1])
+    ms.bus_voltage = float(track["bus_voltage"][-1])
+    ms.current_draw = float(track["current_draw"][-1])
+    ms.component_temp = float(track["component_temp"][-1])
+    ms.heater_active = bool(track["heater_active"][-1])
+    ms.battery_temp = float(track["battery_temp"][-1])
+    ms.snr_db = float(track["snr"][-1])
+    ms.data_rate_kbps = float(track["data_rate"][-1])
+    ms.pointing_error = float(track["pointing_error"][-1])
+    ms.angular_rate = float(track["angular_rate"][-1])
+
+    link_status = np.where(in_contact, np.where(track["snr"] >= 12, "NOMINAL", "DEGRADED"),
+                           "NO_CONTACT").astype(object)
+    ms.link_status = link_status[-1]
+
+    columns = {name: np.round(track[name], digits) for name, digits in COLUMN_DIGITS.items()}
+    columns.update({"heater_active": track["heater_active"], "link_status": link_status})
+    return columns
@@ -5,6 +5,7 @@ Fetch TLE from CelesTrak, parse, cache. SGP4 propagation.
 
 import asyncio
 import httpx
+import numpy as np
 from sgp4.api import Satrec, WGS72
 from sgp4.api import jday
 from datetime import datetime, timezone
@@ -35,13 +36,17 @@ class TLEManager:
         if len(lines) < 3:
             raise ValueError(f"Invalid TLE response for NORAD ID {norad_id}")
 
-        self.satellite_name = lines[0].strip()
-        self.tle_line1 = lines[1].strip()
-        self.tle_line2 = lines[2].strip()
-        self.norad_id = norad_id
+        self.load_lines(lines[0], lines[1], lines[2], norad_id)
+        return self.get_tle_info()
+
+    def load_lines(self, name: str, line1: str, line2: str, norad_id: int = None):
+        """Parse a TLE already in hand (no network)."""
+        self.satellite_name = name.strip()
+        self.tle_line1 = line1.strip()
+        self.tle_line2 = line2.strip()
         self.satrec = Satrec.twoline2rv(self.tle_line1, self.tle_line2, WGS72)
+        self.norad_id = norad_id if norad_id is not None else self.satrec.satnum
         self.fetch_time = datetime.now(timezone.utc)
-        return self.get_tle_info()
 
     def propagate_at(self, dt: datetime) -> tuple:
         """Propagate to given datetime using SGP4. Returns (position, velocity) in km."""
@@ -62,6 +67,38 @@ class TLEManager:
 
         return list(r), list(v)
 
+    def propagate_many(self, epochs) -> tuple:
+        """
+        Propagate to many epochs in one call via Satrec.sgp4_array.
+        epochs: float Julian dates (array-like) or a sequence of datetimes.
+        Returns (positions (N,3), velocities (N,3), errors (N,)) in km, km/s;
+        rows with a non-zero SGP4 error code are NaN.
+        """
+        if self.satrec is None:
+            raise ValueError("No TLE loaded")
+
+        return self._sgp4_array(*_split_epochs(epochs))
+
+    def propagate_offsets(self, epoch: datetime, time_offsets) -> tuple:
+        """propagate_many on epoch + time_offsets (seconds), without building datetimes."""
+        if self.satrec is None:
+            raise ValueError("No TLE loaded")
+
+        if epoch.tzinfo is None:
+            epoch = epoch.replace(tzinfo=timezone.utc)
+        jd0, fr0 = jday(epoch.year, epoch.month, epoch.day, epoch.hour, epoch.minute,
+                        epoch.second + epoch.microsecond / 1e6)
+        fr = fr0 + np.asarray(time_offsets, dtype=float) / 86400.0
+        return self._sgp4_array(np.full(fr.shape, jd0), fr)
+
+    def _sgp4_array(self, jd: np.ndarray, fr: np.ndarray) -> tuple:
+        errors, r, v = self.satrec.sgp4_array(jd, fr)
+        bad = errors != 0
+        if bad.any():
+            r[bad] = np.nan
+            v[bad] = np.nan
+        return r, v, errors
+
     def get_tle_info(self) -> dict:
         """Return TLE metadata including epoch age."""
         info = {
@@ -84,3 +121,21 @@ class TLEManager:
         self.satellite_name = ""
         self.norad_id = None
         self.fetch_time = None
+
+
+def _split_epochs(epochs) -> tuple:
+    """(jd, fr) float arrays for sgp4_array — whole day at midnight plus day fraction."""
+    epochs = list(epochs) if not isinstance(epochs, np.ndarray) else epochs
+    if len(epochs) and isinstance(epochs[0], datetime):
+        parts = []
+        for dt in epochs:
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            parts.append(jday(dt.year, dt.month, dt.day, dt.hour, dt.minute,
+                              dt.second + dt.microsecond / 1e6))
+        jd, fr = np.array(parts, dtype=float).reshape(-1, 2).T
+        return np.ascontiguousarray(jd), np.ascontiguousarray(fr)
+
+    jd_full = np.asarray(epochs, dtype=float)
+    jd = np.floor(jd_full - 0.5) + 0.5
+    return jd, jd_full - jd
@@ -4,7 +4,6 @@ Startup event, simulation loop orchestration, route registration.
 """
 
 import asyncio
-from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -13,11 +12,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from backend.models.config import load_config
 from backend.core.mission_state import MissionState
 from backend.core.tle_manager import TLEManager
+from backend.core.constellation import Constellation
+from backend.core.ephemeris import invalidate_ephemeris
+from backend.core.compute_pool import get_compute_pool
 from backend.core.fdir_engine import FDIREngine
-from backend.core.constraint_engine import evaluate_constraints
+from backend.core.constraint_engine import (
+    evaluate_constraints, constraint_risk_batch, evaluate_constraint_window,
+)
 from backend.core.autonomy_manager import AutonomyManager
 from backend.core.command_engine import CommandEngine
-from backend.core.ground_stations import GroundStationPassPredictor, check_contact_now
+from backend.core.ground_stations import GroundStationPassPredictor, check_contact_now, get_station_network
+from backend.core.pass_scheduler import build_pass_scheduler
+from backend.core.loop_scheduler import build_tick_scheduler
+from backend.core.time_warp import advance
+from backend.core.compute_pool import SatelliteSnapshot
 from backend.core.telemetry_manager import ConnectionManager, build_telemetry_frame
 from backend.core.telemetry_recorder import TelemetryRecorder
 
@@ -31,12 +39,15 @@ load_config()
 
 satellite = MissionState()
 tle_manager = TLEManager()
+constellation = Constellation()
 fdir_engine = FDIREngine()
 ws_manager = ConnectionManager()
-pass_predictor = GroundStationPassPredictor()
+pass_predictor = GroundStationPassPredictor(refine=True)
+pass_scheduler = build_pass_scheduler(pass_predictor)
 command_engine = CommandEngine()
 autonomy_manager = AutonomyManager()
 telemetry_recorder = TelemetryRecorder()
+loop_scheduler = build_tick_scheduler()
 
 satellite.tle_manager = tle_manager
 
@@ -47,16 +58,18 @@ intelligence_cache = {
 }
 
 
-def reset_state():
-    """Reset all systems to initial state."""
+def reset_state(seed: int = None):
+    """Reset all systems to initial state (seed: replay the noise of an earlier run)."""
     global satellite
-    satellite = MissionState()
+    satellite = MissionState(seed)
+    invalidate_ephemeris()
     satellite.tle_manager = tle_manager
     fdir_engine.reset()
     command_engine.reset()
     autonomy_manager.reset()
     intelligence_cache["constraints"] = {"risk_score": 0, "active_constraints": []}
     intelligence_cache["autonomy"] = autonomy_manager.get_status()
+    intelligence_cache.pop("monte_carlo", None)
 
 
 # ====================================================
@@ -69,73 +82,131 @@ async def telemetry_loop():
     - Simulation always runs (satellite keeps moving regardless of contact).
     - During CONTACT: send live telemetry + dump stored blackout buffer.
     - During BLACKOUT: buffer telemetry onboard, send predicted state to frontend.
+    - Ticks are released on a wall-clock deadline grid (loop_scheduler); each
+      stage is timed into its latency histogram.
+    - A tick spanning several simulation steps (time warp, headless mode,
+      catch-up) advances them in one batch and runs FDIR/constraints over
+      every step; telemetry is emitted at the broadcast rate only, carrying
+      the alerts raised since the last frame.
     """
+    stage = loop_scheduler.stage
+    raised_alerts = []
     while True:
+        dt = await loop_scheduler.next_tick()
+        n_steps, step_sec = loop_scheduler.steps(dt)
         try:
-            # 1. Advance simulation by 1 second (always runs)
-            satellite.tick(dt_seconds=1.0)
-            raw_state = satellite.get_state()
-
-            # 2. Check ground station contact
-            contact = check_contact_now(
-                satellite.position.tolist(), satellite.current_time
-            )
-            contact_acquired = satellite.update_contact(
-                contact["in_contact"], contact["station"], contact["elevation_deg"]
-            )
-            # Re-get state after contact update (comms fields changed)
-            raw_state = satellite.get_state()
-
-            # 3. FDIR evaluation (always runs — satellite monitors itself)
-            alerts = fdir_engine.evaluate(raw_state)
-
-            # 4. Constraint + Autonomy (always runs)
-            constraint_result = evaluate_constraints(raw_state)
-            intelligence_cache["constraints"] = constraint_result
-            autonomy_result = autonomy_manager.evaluate(raw_state, constraint_result)
-            intelligence_cache["autonomy"] = autonomy_result
-
-            if contact["in_contact"]:
-                # === IN CONTACT: send live telemetry ===
-
-                # If contact was just acquired, dump the blackout buffer first
-                if contact_acquired:
-                    buffer = satellite.dump_buffer()
-                    if buffer:
+            if n_steps == 1:
+                # 1. Advance simulation (always runs)
+                with stage("propagate"):
+                    satellite.tick(dt_seconds=dt)
+
+                # 2. Check ground station contact
+                #    (scheduled AOS/LOS timeline; full station scan until it is built)
+                with stage("contact"):
+                    contact = pass_scheduler.contact_at(satellite)
+                    if contact is None:
+                        contact = check_contact_now(
+                            satellite.position.tolist(), satellite.current_time
+                        )
+                    contact_acquired = satellite.update_contact(
+                        contact["in_contact"], contact["station"], contact["elevation_deg"]
+                    )
+                    raw_state = satellite.get_state()
+
+                # 3. FDIR evaluation (always runs — satellite monitors itself)
+                with stage("fdir"):
+                    alerts = fdir_engine.evaluate(raw_state)
+
+                # 4. Constraint + Autonomy (always runs)
+                with stage("constraints"):
+                    constraint_result = evaluate_constraints(raw_state)
+                    intelligence_cache["constraints"] = constraint_result
+                with stage("autonomy"):
+                    intelligence_cache["autonomy"] = autonomy_manager.evaluate(raw_state, constraint_result)
+            else:
+                # 1-2. Batched advance: propagation, contact and subsystems for every step
+                with stage("propagate"):
+                    batch = advance(satellite, n_steps, step_sec, get_station_network())
+                    contact_acquired = batch["contact_acquired"]
+                    raw_state = satellite.get_state()
+
+                # 3. FDIR over every step — alerts raised and cleared in between are kept
+                with stage("fdir"):
+                    alerts = fdir_engine.evaluate_batch(batch["columns"], batch["time"])
+
+                # 4. Constraints at the last step plus the window's peak risk; autonomy over every step
+                with stage("constraints"):
+                    risk_batch = constraint_risk_batch(batch["columns"], n_steps)
+                    constraint_result = evaluate_constraints(raw_state)
+                    constraint_result["window"] = evaluate_constraint_window(
+                        batch["columns"], batch["time"], risk_batch
+                    )
+                    intelligence_cache["constraints"] = constraint_result
+                with stage("autonomy"):
+                    intelligence_cache["autonomy"] = autonomy_manager.evaluate_batch(
+                        batch["columns"], risk_batch[0], batch["time"]
+                    )
+
+            raised_alerts.extend(fdir_engine.last_raised)
+
+            # If contact was just acquired, dump the blackout buffer first
+            if contact_acquired:
+                buffer = satellite.dump_buffer()
+                if buffer:
+                    with stage("serialize"):
+                        frames = [build_telemetry_frame(s, source="BUFFERED") for s in buffer]
+                    with stage("broadcast"):
                         await ws_manager.broadcast({
                             "type": "buffer_dump",
-                            "frames": [
-                                build_telemetry_frame(s, source="BUFFERED")
-                                for s in buffer
-                            ],
+                            "frames": frames,
                             "count": len(buffer),
                         })
-                        print(f"[CONTACT] {contact['station']} — dumped {len(buffer)} buffered frames")
-
-                # Send live telemetry
-                frame = build_telemetry_frame(raw_state, alerts, source="LIVE")
-                telemetry_recorder.record(frame, source="LIVE", alerts=alerts)
-                await ws_manager.broadcast({
-                    "type": "telemetry",
-                    "telemetry": frame,
-                    "alerts": alerts,
-                })
-            else:
-                # === BLACKOUT: buffer onboard, send predicted to frontend ===
-                satellite.buffer_telemetry(raw_state)
-
-                # Send predicted frame so the frontend isn't blind
-                frame = build_telemetry_frame(raw_state, alerts, source="PREDICTED")
-                telemetry_recorder.record(frame, source="PREDICTED", alerts=alerts)
-                await ws_manager.broadcast({
-                    "type": "telemetry",
-                    "telemetry": frame,
-                    "alerts": alerts,
-                })
+                    print(f"[CONTACT] {satellite.contact_station} — dumped {len(buffer)} buffered frames")
+
+            # === IN CONTACT: live telemetry; BLACKOUT: buffer onboard, send predicted frame ===
+            # Frames are decimated to the broadcast rate when ticks run faster than wall time
+            if loop_scheduler.emit_due():
+                source = "LIVE" if satellite.in_contact else "PREDICTED"
+                with stage("serialize"):
+                    frame = build_telemetry_frame(raw_state, alerts, source=source)
+                with stage("record"):
+                    if source == "PREDICTED":
+                        satellite.buffer_telemetry(raw_state)
+                    telemetry_recorder.record(frame, source=source, alerts=alerts)
+                with stage("broadcast"):
+                    await ws_manager.broadcast({
+                        "type": "telemetry",
+                        "telemetry": frame,
+                        "alerts": alerts,
+                        "raised_alerts": raised_alerts,
+                    })
+                raised_alerts = []
 
         except Exception as e:
             print(f"[TELEMETRY LOOP ERROR] {e}")
-        await asyncio.sleep(1.0)
+
+        # 5. Constellation members (batched SGP4 + per-satellite streams)
+        try:
+            with stage("constellation"):
+                constellation.tick(dt_seconds=dt)
+                await constellation.broadcast_telemetry()
+        except Exception as e:
+            print(f"[CONSTELLATION TICK ERROR] {e}")
+        loop_scheduler.end_tick()
+
+
+async def pass_schedule_loop():
+    """Background task: keep the rolling pass schedule current for the primary satellite."""
+    while True:
+        try:
+            source = pass_scheduler.source_key(satellite)
+            if pass_scheduler.needs_update(source, satellite.current_time):
+                # Snapshot on the loop thread; propagation and scanning run off it
+                await asyncio.to_thread(pass_scheduler.update, SatelliteSnapshot(satellite),
+                                        source, get_station_network())
+        except Exception as e:
+            print(f"[PASS SCHEDULER ERROR] {e}")
+        await asyncio.sleep(pass_scheduler.check_interval_sec)
 
 
 # ====================================================
@@ -144,15 +215,21 @@ async def telemetry_loop():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    compute_pool = get_compute_pool()
+    compute_pool.start()
     task = asyncio.create_task(telemetry_loop())
+    schedule_task = asyncio.create_task(pass_schedule_loop())
     print("[STARTUP] DISHA Beta — Telemetry broadcast loop started (1 Hz)")
     print(f"[STARTUP] Simulation epoch: {satellite.current_time.isoformat()}")
+    print(f"[STARTUP] Compute pool: {compute_pool.workers} worker(s)")
     yield
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    for t in (task, schedule_task):
+        t.cancel()
+        try:
+            await t
+        except asyncio.CancelledError:
+            pass
+    compute_pool.shutdown()
 
 
 # ====================================================
@@ -183,6 +260,7 @@ from backend.api.planning import router as planning_router
 from backend.api.intelligence import router as intelligence_router
 from backend.api.websocket import router as ws_router
 from backend.api.recorder import router as recorder_router
+from backend.api.constellation import router as constellation_router
 
 app.include_router(core_router)
 app.include_router(tle_router)
@@ -192,3 +270,4 @@ app.include_router(planning_router)
 app.include_router(intelligence_router)
 app.include_router(ws_router)
 app.include_router(recorder_router)
+app.include_router(constellation_router)
@@ -26,6 +26,12 @@ def load_config(path: str = None) -> dict:
     return _config
 
 
+def set_config(config: dict):
+    """Install an already-loaded configuration (compute-pool worker processes)."""
+    global _config
+    _config = config
+
+
 def get_config() -> dict:
     """Get the current configuration (loads if not yet loaded)."""
     if _config is None:
@@ -82,6 +88,64 @@ def _get_default_config() -> dict:
             "pointing_error_limit_deg": 2.0,
             "angular_rate_limit_deg_s": 1.0
         },
+        "propagation": {
+            "method": "rk4",
+            "ephemeris_step_sec": 10.0,
+            "ephemeris_cache_entries": 8,
+            "rtol": 1e-9,
+            "atol": 1e-9
+        },
+        "compute": {
+            "workers": None,
+            "start_method": "spawn"
+        },
+        "noise": {
+            "seed": None,
+            "block_size": 4096
+        },
+        "simulation": {
+            "step_sec": 1.0,
+            "chunk_sec": 3600.0,
+            "sample_sec": 60.0,
+            "workers": None
+        },
+        "monte_carlo": {
+            "realizations": 500,
+            "max_realizations": 20000,
+            "max_horizon_sec": 604800.0,
+            "max_realization_steps": 100000000,
+            "max_samples": 20000,
+            "horizon_sec": 21600.0,
+            "step_sec": 1.0,
+            "sample_sec": 60.0,
+            "percentiles": [5, 25, 50, 75, 95],
+            "block_elements": 200000,
+            "dispersions": {
+                "current_battery_wh": {"sd": 0.02, "relative": True},
+                "base_load_w": {"sd": 0.05, "relative": True},
+                "solar_array_output_w": {"sd": 0.05, "relative": True},
+                "component_temp": {"sd": 2.0},
+                "battery_temp": {"sd": 1.0}
+            }
+        },
+        "telemetry_loop": {
+            "period_sec": 1.0,
+            "max_catchup_ticks": 5,
+            "time_warp": 1.0,
+            "sim_step_sec": 1.0,
+            "headless": False,
+            "headless_step_sec": 600.0
+        },
+        "pass_schedule": {
+            "horizon_hours": 24.0,
+            "extend_step_sec": 600.0,
+            "check_interval_sec": 5.0,
+            "contact_margin_sec": 5.0
+        },
+        "result_cache": {
+            "ttl_sec": 10.0,
+            "max_entries": 128
+        },
         "fdir_rules": [
             {"rule_id": "BATT_CRITICAL", "parameter": "battery_soc", "operator": "<", "threshold": 20, "severity": "CRITICAL", "corrective_action": "Switch to SAFE mode. Disable non-essential loads."},
             {"rule_id": "BATT_LOW", "parameter": "battery_soc", "operator": "<", "threshold": 40, "severity": "WARNING", "corrective_action": "Reduce payload duty cycle. Defer low-priority downlinks."},
@@ -118,5 +182,6 @@ def _get_default_config() -> dict:
             {"name": "ISTRAC Mauritius", "lat": -20.10, "lon": 57.55, "alt_m": 422, "min_elevation_deg": 5},
             {"name": "ISTRAC Brunei", "lat": 4.93, "lon": 114.95, "alt_m": 23, "min_elevation_deg": 5},
             {"name": "ISTRAC Biak", "lat": -1.17, "lon": 136.10, "alt_m": 46, "min_elevation_deg": 5}
-        ]
+        ],
+        "horizon_masks": {}
     }
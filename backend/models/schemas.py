@@ -136,6 +136,17 @@ class TLELoadRequest(BaseModel):
     norad_id: int
 
 
+class TLEEntry(BaseModel):
+    name: str = ""
+    line1: str
+    line2: str
+
+
+class ConstellationLoadRequest(BaseModel):
+    norad_ids: List[int] = []
+    tles: List[TLEEntry] = []
+
+
 class TLEInfo(BaseModel):
     norad_id: Optional[int] = None
     satellite_name: str = ""
@@ -162,6 +173,7 @@ class GroundStationPass(BaseModel):
     country: str
     aos_time: str
     los_time: str
+    tca_time: Optional[str] = None
     duration_sec: float
     max_elevation_deg: float
 
@@ -0,0 +1,78 @@
+"""
+DISHA Beta — Propagation Accuracy Check
+Reproduces the README's analytic J2 table: for each reference orbit,
+propagates 24 h on a 10 s grid with RK4 (J2) and with the analytic J2
+secular model, and reports the maximum position difference and the wall
+time of each.
+
+    python -m backend.propagation_accuracy
+    python -m backend.propagation_accuracy --hours 6 --step 30
+"""
+
+import argparse
+import math
+import time
+import numpy as np
+
+from backend.core.ephemeris import make_propagator
+from backend.core.flight_dynamics import propagate_j2_secular
+from backend.models.constants import EARTH_RADIUS_KM, MU_EARTH
+
+
+# (label, semi-major axis km, inclination deg) — circular reference orbits
+REFERENCE_ORBITS = (
+    ("7000 km equatorial (default)", 7000.0, 0.0),
+    ("400 km, 51.6°", EARTH_RADIUS_KM + 400.0, 51.6),
+    ("700 km SSO, 97.8°", EARTH_RADIUS_KM + 700.0, 97.8),
+)
+
+
+def circular_state(sma_km: float, inclination_deg: float) -> np.ndarray:
+    """(6,) ECI state at the ascending node of a circular orbit."""
+    inc = math.radians(inclination_deg)
+    speed = math.sqrt(MU_EARTH / sma_km)
+    return np.array([sma_km, 0.0, 0.0, 0.0, speed * math.cos(inc), speed * math.sin(inc)])
+
+
+def _timed(fn, repeat: int):
+    best, result = math.inf, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return result, best
+
+
+def compare(sma_km: float, inclination_deg: float, hours: float = 24.0, step_sec: float = 10.0,
+            repeat: int = 3) -> dict:
+    """Max RK4 vs J2 secular position error (km) and best-of-repeat wall times (s)."""
+    state = circular_state(sma_km, inclination_deg)
+    n = int(hours * 3600.0 / step_sec) + 1
+    rk4 = make_propagator("rk4")
+    reference, rk4_sec = _timed(lambda: rk4(state, n, step_sec), repeat)
+    initial_state = {"position": state[:3], "velocity": state[3:]}
+    offsets = np.arange(n) * step_sec
+    analytic, j2_sec = _timed(lambda: propagate_j2_secular(initial_state, offsets), repeat)
+    error = np.linalg.norm(analytic[:, :3] - reference[:, :3], axis=1)
+    return {"max_error_km": float(error.max()), "rk4_sec": rk4_sec, "j2_secular_sec": j2_sec}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.propagation_accuracy",
+                                     description="Compare the analytic J2 secular model against RK4.")
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--step", type=float, default=10.0, help="grid step in seconds")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repeats (best is reported)")
+    args = parser.parse_args(argv)
+
+    print(f"| Orbit | Max position error | {args.hours:g} h @ {args.step:g} s, RK4 "
+          f"| {args.hours:g} h @ {args.step:g} s, J2 secular |")
+    print("|---|---|---|---|")
+    for label, sma_km, inclination_deg in REFERENCE_ORBITS:
+        result = compare(sma_km, inclination_deg, args.hours, args.step, args.repeat)
+        print(f"| {label} | {result['max_error_km']:.0f} km | {result['rk4_sec']:.2f} s "
+              f"| {result['j2_secular_sec'] * 1e3:.1f} ms |")
+
+
+if __name__ == "__main__":
+    main()
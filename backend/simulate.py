@@ -0,0 +1,344 @@
+"""
+DISHA Beta — Batch Simulation Runner
+Runs the MissionState → FDIR → constraints → autonomy pipeline offline at
+full speed, with no FastAPI app and no wall clock. Each scenario advances
+in batched chunks (time_warp.advance) and evaluates FDIR, constraint risk
+and autonomy over every step; independent scenarios run in parallel worker
+processes. Telemetry (sampled every sample_sec), alerts and autonomy
+decisions are written column-wise to .npz or CSV.
+
+    python -m backend.simulate --tle iss.tle --days 30
+    python -m backend.simulate --scenarios scenarios.json --workers 8 --format csv
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import numpy as np
+
+from backend.core.autonomy_manager import AutonomyManager
+from backend.core.constraint_engine import constraint_risk_batch
+from backend.core.ephemeris import invalidate_ephemeris
+from backend.core.fdir_engine import FDIREngine
+from backend.core.ground_stations import STATION_PRESETS, StationRegistry, get_station_network
+from backend.core.mission_state import MissionState
+from backend.core.time_services import isoformat_array
+from backend.core.time_warp import advance
+from backend.core.tle_manager import TLEManager
+from backend.models.config import get_config, load_config, set_config
+
+
+# Per-step telemetry columns written for each sample (time_warp.advance names)
+TELEMETRY_COLUMNS = (
+    "latitude", "longitude", "altitude_km",
+    "battery_pct", "battery_wh", "bus_voltage", "solar_panel_current_a", "in_eclipse",
+    "component_temp", "battery_temp", "heater_active",
+    "link_status", "snr", "data_rate", "in_contact", "contact_elevation_deg",
+    "pointing_error", "angular_rate", "storage_pct",
+)
+ALERT_COLUMNS = ("timestamp", "rule_id", "severity", "parameter", "value", "threshold")
+DECISION_COLUMNS = ("time", "from", "to", "mode", "risk", "decision")
+
+
+def scenario_defaults() -> dict:
+    """Scenario fields and their defaults ("simulation" config section for the step sizes)."""
+    sim_cfg = get_config().get("simulation", {})
+    return {
+        "name": "scenario",
+        "tle": None,              # [line1, line2], [name, line1, line2] or a TLE file path
+        "start": None,            # ISO 8601 UTC; default: now
+        "duration_sec": 86400.0,
+        "step_sec": sim_cfg.get("step_sec", 1.0),
+        "chunk_sec": sim_cfg.get("chunk_sec", 3600.0),
+        "sample_sec": sim_cfg.get("sample_sec", 60.0),
+        "stations": None,         # preset name or list of station dicts; default: active set
+        "seed": None,
+        "config": None,           # config dict or JSON path replacing the loaded config
+        "initial": {},            # MissionState attribute overrides, e.g. {"current_battery_wh": 250}
+    }
+
+
+# ====================================================
+# SINGLE SCENARIO
+# ====================================================
+
+def run_scenario(scenario: dict) -> dict:
+    """
+    Simulate one scenario. Returns {"telemetry", "alerts", "decisions"}
+    (each a dict of equal-length column arrays) and a "summary" dict.
+    """
+    spec = {**scenario_defaults(), **scenario}
+    previous_config = get_config()
+    if spec["config"] is not None:
+        set_config(_read_json(spec["config"]) if isinstance(spec["config"], str) else spec["config"])
+    try:
+        return _simulate(spec)
+    finally:
+        set_config(previous_config)
+
+
+def _simulate(spec: dict) -> dict:
+    # Fresh ephemeris/eclipse caches: the simulated orbit is keyed by object
+    # identity, which a later scenario in the same process may reuse.
+    invalidate_ephemeris()
+
+    start = datetime.fromisoformat(spec["start"]) if spec["start"] else datetime.now(timezone.utc)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+
+    ms = MissionState(seed=spec["seed"])
+    ms.current_time = ms.start_time = start
+    if spec["tle"]:
+        tle = TLEManager()
+        tle.load_lines(*_tle_lines(spec["tle"]))
+        ms.tle_manager = tle
+        pos, vel = tle.propagate_at(start)
+        ms.position, ms.velocity = np.array(pos), np.array(vel)
+    for name, value in spec["initial"].items():
+        setattr(ms, name, value)
+
+    network = _scenario_network(spec["stations"])
+    fdir = FDIREngine()
+    autonomy = AutonomyManager()
+
+    step_sec = float(spec["step_sec"])
+    total = int(round(float(spec["duration_sec"]) / step_sec))
+    stride = max(1, int(round(float(spec["sample_sec"]) / step_sec)))
+    chunk = max(stride, int(round(float(spec["chunk_sec"]) / step_sec)) // stride * stride)
+
+    samples = {name: [] for name in ("time", "risk_score") + TELEMETRY_COLUMNS}
+    alerts, decisions = [], []
+    min_battery, eclipse_steps, contact_steps = 100.0, 0, 0
+
+    t0 = time.perf_counter()
+    done = 0
+    while done < total:
+        n = min(chunk, total - done)
+        batch = advance(ms, n, step_sec, network)
+        columns, times = batch["columns"], batch["time"]
+
+        fdir.evaluate_batch(columns, times)
+        alerts.extend(fdir.last_raised)
+        risk, _ = constraint_risk_batch(columns, n)
+        autonomy.evaluate_batch(columns, risk, times)
+        decisions.extend(autonomy.last_decisions)
+
+        # Chunks are whole multiples of the stride, so samples stay on the global grid
+        keep = slice(stride - 1, n, stride)
+        samples["time"].append(times[keep])
+        samples["risk_score"].append(risk[keep])
+        for name in TELEMETRY_COLUMNS:
+            samples[name].append(columns[name][keep])
+
+        min_battery = min(min_battery, float(columns["battery_pct"].min()))
+        eclipse_steps += int(columns["in_eclipse"].sum())
+        contact_steps += int(columns["in_contact"].sum())
+        done += n
+    wall_sec = time.perf_counter() - t0
+
+    telemetry = {name: np.concatenate(parts) if parts else np.empty(0) for name, parts in samples.items()}
+    telemetry["link_status"] = telemetry["link_status"].astype(str)
+
+    alerts_by_rule = {}
+    for alert in alerts:
+        alerts_by_rule[alert["rule_id"]] = alerts_by_rule.get(alert["rule_id"], 0) + 1
+    sim_sec = total * step_sec
+    summary = {
+        "name": spec["name"],
+        "seed": ms.noise.seed,
+        "start": start.isoformat(),
+        "end": ms.current_time.isoformat(),
+        "steps": total,
+        "step_sec": step_sec,
+        "samples": len(telemetry["time"]),
+        "wall_sec": round(wall_sec, 3),
+        "speedup": round(sim_sec / wall_sec, 1) if wall_sec > 0 else None,
+        "alerts": len(alerts),
+        "alerts_by_rule": alerts_by_rule,
+        "decisions": len(decisions),
+        "min_battery_pct": round(min_battery, 2),
+        "eclipse_fraction": round(eclipse_steps / total, 4) if total else 0.0,
+        "contact_fraction": round(contact_steps / total, 4) if total else 0.0,
+        "final_mode": autonomy.mode,
+    }
+    return {
+        "telemetry": telemetry,
+        "alerts": _records_to_columns(alerts, ALERT_COLUMNS),
+        "decisions": _records_to_columns(decisions, DECISION_COLUMNS),
+        "summary": summary,
+    }
+
+
+def _tle_lines(tle) -> tuple:
+    """(name, line1, line2) from a 2/3-line list or a TLE file path."""
+    if isinstance(tle, str):
+        with open(tle) as f:
+            tle = [line.rstrip() for line in f if line.strip()]
+    tle = list(tle)
+    if len(tle) == 2:
+        return ("SIM-SAT", tle[0], tle[1])
+    if len(tle) == 3:
+        return (tle[0].strip(), tle[1], tle[2])
+    raise ValueError("TLE must have 2 or 3 lines")
+
+
+def _scenario_network(stations):
+    if stations is None:
+        return get_station_network()
+    if isinstance(stations, str):
+        if stations not in STATION_PRESETS:
+            raise ValueError(f"Unknown station network: {stations}")
+        return StationRegistry(STATION_PRESETS[stations], stations).network()
+    return StationRegistry(stations, "CUSTOM").network()
+
+
+def _records_to_columns(records: list, names: tuple) -> dict:
+    return {name: np.array([r[name] for r in records]) if records else np.empty(0, dtype=str)
+            for name in names}
+
+
+def _read_json(path: str):
+    with open(path) as f:
+        return json.load(f)
+
+
+# ====================================================
+# OUTPUT
+# ====================================================
+
+def write_result(result: dict, path: str, fmt: str = "npz") -> list:
+    """
+    Write a run_scenario() result. "npz": one compressed archive with
+    telemetry/<column>, alerts/<column>, decisions/<column> arrays and the
+    summary as JSON. "csv": <path>.telemetry.csv, .alerts.csv,
+    .decisions.csv and .summary.json. Returns the files written.
+    """
+    if fmt == "npz":
+        arrays = {f"{table}/{name}": values
+                  for table in ("telemetry", "alerts", "decisions")
+                  for name, values in result[table].items()}
+        arrays["summary"] = np.array(json.dumps(result["summary"]))
+        np.savez_compressed(path + ".npz", **arrays)
+        return [path + ".npz"]
+    if fmt != "csv":
+        raise ValueError(f"Unknown output format: {fmt}")
+
+    telemetry = dict(result["telemetry"])
+    telemetry["time"] = isoformat_array(telemetry["time"])
+    written = []
+    for table, columns in (("telemetry", telemetry), ("alerts", result["alerts"]),
+                           ("decisions", result["decisions"])):
+        file_path = f"{path}.{table}.csv"
+        with open(file_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns.keys())
+            writer.writerows(zip(*columns.values()))
+        written.append(file_path)
+    with open(path + ".summary.json", "w") as f:
+        json.dump(result["summary"], f, indent=2)
+    written.append(path + ".summary.json")
+    return written
+
+
+# ====================================================
+# PARALLEL SCENARIOS
+# ====================================================
+
+def _run_to_files(scenario: dict, output_dir: str, fmt: str) -> dict:
+    result = run_scenario(scenario)
+    summary = result["summary"]
+    summary["files"] = write_result(result, os.path.join(output_dir, summary["name"]), fmt)
+    return summary
+
+
+def run_scenarios(scenarios: list, output_dir: str, fmt: str = "npz", workers: int = None) -> list:
+    """
+    Run independent scenarios, one per worker process (spawned with the
+    parent's config), writing each to output_dir/<name>. workers=0 runs them
+    in this process. Returns the summaries in scenario order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    names = [s.get("name", "scenario") for s in scenarios]
+    if len(set(names)) != len(names):
+        raise ValueError("Scenario names must be unique (they name the output files)")
+
+    if workers is None:
+        workers = get_config().get("simulation", {}).get("workers")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(int(workers), len(scenarios))
+    if workers <= 1:
+        return [_run_to_files(s, output_dir, fmt) for s in scenarios]
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=set_config, initargs=(get_config(),)) as executor:
+        futures = [executor.submit(_run_to_files, s, output_dir, fmt) for s in scenarios]
+        return [f.result() for f in futures]
+
+
+# ====================================================
+# CLI
+# ====================================================
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.simulate",
+                                     description="Run DISHA mission simulations offline at full speed.")
+    parser.add_argument("--scenarios", help="JSON file with a list of scenario objects")
+    parser.add_argument("--config", help="satellite config JSON (default: built-in config)")
+    parser.add_argument("--tle", help="TLE file (2 or 3 lines); default: configured initial orbit")
+    parser.add_argument("--start", help="simulation start, ISO 8601 UTC (default: now)")
+    duration = parser.add_mutually_exclusive_group()
+    duration.add_argument("--days", type=float)
+    duration.add_argument("--hours", type=float)
+    parser.add_argument("--step-sec", type=float)
+    parser.add_argument("--sample-sec", type=float)
+    parser.add_argument("--chunk-sec", type=float)
+    parser.add_argument("--stations", help="station preset (ISRO, NASA, ESA, KSAT, GLOBAL, NONE)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=1,
+                        help="independent runs with seeds seed, seed+1, ... (ignored with --scenarios)")
+    parser.add_argument("--name", default="run")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count; 0 = in-process)")
+    parser.add_argument("--format", choices=("npz", "csv"), default="npz")
+    parser.add_argument("--output-dir", default="simulation_runs")
+    return parser.parse_args(argv)
+
+
+def _cli_scenarios(args) -> list:
+    base = {}
+    if args.tle:
+        base["tle"] = args.tle
+    if args.start:
+        base["start"] = args.start
+    if args.days is not None:
+        base["duration_sec"] = args.days * 86400.0
+    elif args.hours is not None:
+        base["duration_sec"] = args.hours * 3600.0
+    for key in ("step_sec", "sample_sec", "chunk_sec", "stations"):
+        if getattr(args, key) is not None:
+            base[key] = getattr(args, key)
+
+    if args.scenarios:
+        return [{**base, **s} for s in _read_json(args.scenarios)]
+    if args.runs == 1:
+        return [{**base, "name": args.name, "seed": args.seed}]
+    return [{**base, "name": f"{args.name}-{k:03d}", "seed": args.seed + k} for k in range(args.runs)]
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    load_config(args.config)
+    t0 = time.perf_counter()
+    summaries = run_scenarios(_cli_scenarios(args), args.output_dir, args.format, args.workers)
+    for summary in summaries:
+        print(json.dumps(summary))
+    print(f"[SIMULATE] {len(summaries)} scenario(s) in {time.perf_counter() - t0:.1f} s → {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Sunlit factor of compute_feasibility against a cached, no longer fresh eclipse timeline."""
+
+import numpy as np
+
+from backend.core.eclipse import EclipseService, get_eclipse_timeline
+from backend.core.mission_planner import compute_feasibility
+from backend.core.mission_state import MissionState
+from backend.core.time_services import epoch_seconds
+
+
+def test_sunlit_factor_uses_timeline_epoch():
+    state = MissionState(seed=1)
+    timeline = get_eclipse_timeline(state)
+    for _ in range(2400):
+        state.tick(1.0)
+    # Still served from the cache, now 40 min old
+    assert get_eclipse_timeline(state) is timeline
+    assert timeline.offset(state.current_time) >= 2400.0
+
+    fresh = EclipseService().get(state, 7200.0)
+    now = epoch_seconds(state.current_time)
+    for lead_sec in np.arange(0.0, 7200.0, 85.0):
+        task = {"task_id": "TASK-REQ-1", "start_time": now + lead_sec, "end_time": now + lead_sec + 60.0}
+        sunlit = compute_feasibility(task, state)["factors"]["sunlit"]
+        assert sunlit == (not fresh.in_eclipse(lead_sec)), lead_sec
@@ -0,0 +1,31 @@
+"""Single-flight coalescing in ResultCache."""
+
+import asyncio
+
+import pytest
+
+from backend.core.result_cache import ResultCache
+
+
+def test_cancelled_caller_does_not_cancel_coalesced_waiters():
+    async def scenario():
+        cache = ResultCache()
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return 42
+
+        first = asyncio.ensure_future(cache.get_or_compute("k", compute))
+        second = asyncio.ensure_future(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == 42
+        assert await cache.get_or_compute("k", compute) == 42   # cached for later callers
+        assert cache.misses == 1 and cache.coalesced == 1 and cache.hits == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,13 @@
+"""isoformat_array must format exactly as the per-value isoformat() it replaced."""
+
+import numpy as np
+
+from backend.core.time_services import isoformat, isoformat_array
+
+
+def test_isoformat_array_matches_isoformat():
+    rng = np.random.default_rng(0)
+    t = np.concatenate((np.round(rng.uniform(1.7e9, 1.9e9, 1000)),   # whole seconds: no microseconds
+                        rng.uniform(1.7e9, 1.9e9, 10000),
+                        [-1.5, 0.0, 1e9 + 0.5, 1e9 + 0.9999999]))
+    assert isoformat_array(t) == [isoformat(x) for x in t]